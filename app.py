@@ -6,6 +6,7 @@ for the news scraper and summarizer.
 """
 
 import streamlit as st
+import src.logging_setup  # noqa: F401 - configures logging before the other modules load
 from src.ui import main
 
 if __name__ == "__main__":
@@ -2,49 +2,36 @@
 Main application module for news article scraping.
 
 This module demonstrates how to use the ArticleExtractor class
-to extract content from news articles, the ArticleSummarizer
+to extract content from news articles, the AsyncArticleSummarizer
 to generate summaries and identify topics, the DatabaseService
 to store and retrieve articles from ChromaDB, and the SemanticSearch
 service to perform enhanced semantic searches.
 """
 
+import asyncio
 import logging
-import time
+from typing import List, Tuple
+import src.logging_setup  # noqa: F401 - configures logging before the other modules load
 from src.extractor import ArticleExtractor
-from src.summarizer import ArticleSummarizer
+from src.async_summarizer import AsyncArticleSummarizer
 from src.database import DatabaseService
 from src.search import SemanticSearch
 from src.models import ArticleContent, ArticleSummary, TopicIdentification
 
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
-def process_article(url: str) -> tuple:
+def display_article(url: str, article: ArticleContent, summary: ArticleSummary, topics: TopicIdentification) -> None:
     """
-    Process an article by extracting, summarizing, and identifying topics.
+    Print a processed article with its summary, topics and keywords.
     
     Args:
-        url: URL of the article to process
-        
-    Returns:
-        tuple: (ArticleContent, ArticleSummary, TopicIdentification)
-        
-    Raises:
-        ValueError: If processing fails
+        url: The URL the article was extracted from
+        article: The extracted article content
+        summary: The generated summary
+        topics: The identified topics and keywords
     """
-    # Initialize the article extractor and summarizer
-    extractor = ArticleExtractor()
-    summarizer = ArticleSummarizer()
-    
-    # Extract article content
-    logger.info(f"Attempting to extract content from: {url}")
-    article: ArticleContent = extractor.extract(url)
+    print(f"\nProcessing article: {url}")
     
     # Display the extracted information
     print("\n===== EXTRACTED ARTICLE =====")
@@ -52,24 +39,43 @@ def process_article(url: str) -> tuple:
     print("\n--- Full Text ---")
     print(f"{article.text[:500]}...")  # Only show first 500 chars
     
-    # Generate a concise summary
-    logger.info("Generating article summary...")
-    summary: ArticleSummary = summarizer.summarize(article, summary_type="concise")
-    
     # Display the summary
     print("\n===== ARTICLE SUMMARY =====")
     print(summary.summary)
     
-    # Identify topics and keywords
-    logger.info("Identifying article topics...")
-    topics: TopicIdentification = summarizer.identify_topics(article)
-    
     # Display topics and keywords
     print("\n===== ARTICLE TOPICS =====")
     print(f"Topics: {', '.join(topics.topics)}")
     print(f"Keywords: {', '.join(topics.keywords)}")
+
+
+async def process_articles(
+    urls: List[str],
+    articles: List[ArticleContent],
+    summarizer: AsyncArticleSummarizer
+) -> List[Tuple[ArticleContent, ArticleSummary, TopicIdentification]]:
+    """
+    Process extracted articles concurrently on a single event loop.
+    
+    Args:
+        urls: The URLs the articles were extracted from
+        articles: The extracted articles, in the same order as `urls`
+        summarizer: Summarizer used for the summaries and topics
+        
+    Returns:
+        List of (ArticleContent, ArticleSummary, TopicIdentification) tuples, in input order
+    """
+    # Each article's summary, topics and keywords come from one request, all run concurrently
+    logger.info("Generating summaries and identifying topics for %s articles...", len(articles))
+    # Reason: the async HTTP client is opened and closed on this event loop
+    async with summarizer:
+        analyses = await summarizer.aanalyze_many(articles)
+    processed = [(article, summary, topics) for article, (summary, topics) in zip(articles, analyses)]
     
-    return article, summary, topics
+    # Print once everything is done so the output of different articles does not interleave
+    for url, result in zip(urls, processed):
+        display_article(url, *result)
+    return processed
 
 
 def main() -> None:
@@ -83,36 +89,34 @@ def main() -> None:
         logger.info("Initializing database service...")
         db_service = DatabaseService()
         
-        # Process BBC News article
-        url1 = "https://www.bbc.com/news/articles/c3r807j7xrwo"
-        print(f"\nProcessing article: {url1}")
-        article1, summary1, topics1 = process_article(url1)
+        # Process sample articles (second one for demo purposes)
+        urls = [
+            "https://www.bbc.com/news/articles/c3r807j7xrwo",
+            "https://www.bbc.com/news/technology-67046858",
+        ]
         
-        # Store the article in ChromaDB
-        logger.info("Storing article in ChromaDB...")
-        doc_id1 = db_service.store_article(article1, summary1, topics1)
-        print(f"\n✅ Article stored in ChromaDB with ID: {doc_id1}")
+        # Fetch all articles concurrently
+        extractor = ArticleExtractor()
+        summarizer = AsyncArticleSummarizer()
+        logger.info("Extracting content from %s articles...", len(urls))
+        articles = extractor.extract_many(urls)
         
-        # Process a second article (for demo purposes)
-        url2 = "https://www.bbc.com/news/technology-67046858"
-        print(f"\nProcessing article: {url2}")
-        article2, summary2, topics2 = process_article(url2)
+        # Reason: one event loop for all articles, so the async OpenAI client is reused
+        processed = asyncio.run(process_articles(urls, articles, summarizer))
         
-        # Store the second article in ChromaDB
-        logger.info("Storing second article in ChromaDB...")
-        doc_id2 = db_service.store_article(article2, summary2, topics2)
-        print(f"\n✅ Article stored in ChromaDB with ID: {doc_id2}")
+        # Store all articles in ChromaDB with a single embeddings call
+        logger.info("Storing articles in ChromaDB...")
+        doc_ids = db_service.store_articles_bulk(processed)
+        for doc_id in doc_ids:
+            print(f"\n✅ Article stored in ChromaDB with ID: {doc_id}")
         
-        # Give time for embeddings to be processed
-        print("\nWaiting for embeddings to be processed...")
-        time.sleep(2)
-          # Demonstrate semantic search capabilities
+        # Demonstrate semantic search capabilities
         print("\n===== SEMANTIC SEARCH DEMO =====")
         search_query = "Latest technology news"
         print(f"Searching for: '{search_query}'")
         
         # Initialize the semantic search service
-        search_service = SemanticSearch()
+        search_service = SemanticSearch(db_service)
         
         # Search with query expansion
         print("\n--- Enhanced Semantic Search with Query Expansion ---")
@@ -147,10 +151,10 @@ def main() -> None:
         logger.info("Demo completed successfully")
             
     except ValueError as e:
-        logger.error(f"Processing failed: {e}")
+        logger.error("Processing failed: %s", e)
         print(f"Error: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         print(f"Unexpected error: {e}")
 
 
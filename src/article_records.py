@@ -0,0 +1,213 @@
+"""
+Article record helpers for the ChromaDB store.
+
+This module converts articles to the text and metadata stored in ChromaDB,
+formats stored metadata back into article dictionaries and rebuilds the
+articles collection from existing records.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from langchain_core.embeddings import Embeddings
+
+from src.models import ArticleContent, ArticleSummary, TopicIdentification
+
+# Metadata keys holding JSON-encoded lists (Chroma metadata values must be scalars)
+TOPICS_KEY = "topics_json"
+KEYWORDS_KEY = "keywords_json"
+
+# Suffix of the temporary collection a rebuild fills before it replaces the original
+REBUILD_SUFFIX = "__rebuild"
+
+
+def build_embedding_text(
+    article: ArticleContent,
+    summary: ArticleSummary,
+    topics: TopicIdentification
+) -> str:
+    """
+    Build the text used for the embedding - combines important elements for better semantic search.
+
+    Args:
+        article: The article content
+        summary: The article summary
+        topics: The article topics and keywords
+
+    Returns:
+        str: Combined title, summary, topics and keywords
+    """
+    return (
+        f"Title: {article.title}\n"
+        f"Summary: {summary.summary}\n"
+        f"Topics: {', '.join(topics.topics)}\n"
+        f"Keywords: {', '.join(topics.keywords)}"
+    )
+
+
+def build_metadata(
+    article: ArticleContent,
+    summary: ArticleSummary,
+    topics: TopicIdentification
+) -> Dict[str, Any]:
+    """
+    Convert article data to flat metadata for storage.
+
+    Args:
+        article: The article content
+        summary: The article summary
+        topics: The article topics and keywords
+
+    Returns:
+        Dict[str, Any]: Metadata stored alongside the document
+    """
+    return {
+        "article_id": summary.article_id,
+        "url": str(article.url),
+        "title": article.title,
+        "text": article.text[:1000],  # Store truncated text to avoid size limitations
+        "summary": summary.summary,
+        # Reason: JSON keeps the lists intact (topics may contain ", ") and decodes in one C call
+        TOPICS_KEY: orjson.dumps(topics.topics).decode(),
+        KEYWORDS_KEY: orjson.dumps(topics.keywords).decode()
+    }
+
+
+def _decode_list(metadata: Dict[str, Any], json_key: str, legacy_key: str) -> List[str]:
+    """
+    Read a list field from stored metadata.
+
+    Args:
+        metadata: Stored metadata of one article
+        json_key: Key of the JSON-encoded list
+        legacy_key: Key of the comma-separated string used by older records
+
+    Returns:
+        List[str]: The decoded list (empty if the field is missing)
+    """
+    encoded = metadata.get(json_key)
+    if encoded is not None:
+        return orjson.loads(encoded)
+
+    # Records stored before the JSON encoding keep a ", "-joined string
+    legacy = metadata.get(legacy_key)
+    return str(legacy).split(", ") if legacy else []
+
+
+def format_article(
+    doc_id: str,
+    metadata: Optional[Dict[str, Any]],
+    distance: Optional[float] = None,
+    with_score: bool = False
+) -> Dict[str, Any]:
+    """
+    Format stored metadata into an article dictionary.
+
+    Args:
+        doc_id: The document ID
+        metadata: Stored metadata of the article (None if it was not returned)
+        distance: Cosine distance to the query, for search results
+        with_score: Whether to add the `relevance_score` field
+
+    Returns:
+        Dict[str, Any]: Article data with topics and keywords as lists
+    """
+    metadata = metadata or {}
+    article_data = {
+        "id": doc_id,
+        "url": metadata.get("url", ""),
+        "title": metadata.get("title", ""),
+        "summary": metadata.get("summary", ""),
+        "topics": _decode_list(metadata, TOPICS_KEY, "topics"),
+        "keywords": _decode_list(metadata, KEYWORDS_KEY, "keywords")
+    }
+    if with_score:
+        article_data["relevance_score"] = 1 - distance if distance is not None else None
+    return article_data
+
+
+def rebuild_collection(
+    client: Any,
+    name: str,
+    collection_metadata: Dict[str, Any],
+    ids: List[str],
+    embeddings: List[Any],
+    metadatas: Optional[List[Any]],
+    documents: Optional[List[Any]]
+) -> Any:
+    """
+    Replace a collection with a new one holding the given records.
+
+    The records are loaded into a temporary collection in batches of at most
+    `client.get_max_batch_size()`. The original collection is only dropped once
+    every batch is stored, so a failed load leaves it untouched.
+
+    Args:
+        client: ChromaDB client owning the collection
+        name: Name of the collection
+        collection_metadata: Metadata for the recreated collection
+        ids: IDs of the records to insert
+        embeddings: One embedding per ID
+        metadatas: One metadata dict per ID
+        documents: One document text per ID
+
+    Returns:
+        The recreated collection
+    """
+    temp_name = name + REBUILD_SUFFIX
+    if temp_name in client.list_collections():
+        # Left over from an interrupted rebuild
+        client.delete_collection(name=temp_name)
+    collection = client.create_collection(name=temp_name, metadata=collection_metadata)
+
+    try:
+        # Reason: few large adds build the new HNSW index in bulk
+        batch_size = client.get_max_batch_size()
+        for start in range(0, len(ids), batch_size):
+            batch = slice(start, start + batch_size)
+            collection.add(
+                ids=ids[batch],
+                embeddings=embeddings[batch],
+                metadatas=metadatas[batch] if metadatas is not None else None,
+                documents=documents[batch] if documents is not None else None
+            )
+    except Exception:
+        client.delete_collection(name=temp_name)
+        raise
+
+    client.delete_collection(name=name)
+    collection.modify(name=name)
+    return collection
+
+
+def reembed_collection(
+    client: Any,
+    name: str,
+    collection_metadata: Dict[str, Any],
+    collection: Any,
+    embeddings: Embeddings
+) -> Tuple[Any, int]:
+    """
+    Recreate a collection with its stored documents embedded by another model.
+
+    The documents are embedded before anything is written, and the records are
+    swapped in by `rebuild_collection`, so a failed embeddings request or load
+    leaves the existing data untouched.
+
+    Args:
+        client: ChromaDB client owning the collection
+        name: Name of the collection
+        collection_metadata: Metadata for the recreated collection
+        collection: The existing collection
+        embeddings: Embeddings model for the recreated collection
+
+    Returns:
+        Tuple of the recreated collection and the number of records it holds
+    """
+    data = collection.get(include=["documents", "metadatas"])
+    ids = data["ids"]
+    documents = [document or "" for document in (data["documents"] or [])]
+    vectors = embeddings.embed_documents(documents) if ids else []
+
+    rebuilt = rebuild_collection(client, name, collection_metadata, ids, vectors, data["metadatas"], documents)
+    return rebuilt, len(ids)
@@ -0,0 +1,32 @@
+"""
+Article selectors module.
+
+This module holds the CSS selectors used to locate the parts of a news article,
+shared by all HTML parser backends. Each list is ordered from highest to lowest
+priority.
+"""
+
+# Headlines inside <article>, any <h1>, then common title classes/IDs
+TITLE_SELECTORS = [
+    'article h1, article h2', 'h1', '.headline', '.article-title',
+    '#article-title', '.post-title', '.entry-title'
+]
+
+# Main content areas holding the article paragraphs
+CONTENT_SELECTORS = [
+    'article', '.article-body', '.story-body', '.post-content',
+    '.entry-content', '#article-body', '.story-content', 'main'
+]
+
+# Page sections dropped before falling back to all paragraphs
+EXCLUDE_SELECTORS = ['nav', 'footer', 'header', '.comments', '.sidebar']
+
+AUTHOR_SELECTORS = [
+    '.author', '.byline', '.article-author',
+    'meta[name="author"]', 'meta[property="article:author"]'
+]
+
+DATE_SELECTORS = [
+    '.date', '.published-date', '.article-date', '.timestamp',
+    'time', 'meta[property="article:published_time"]'
+]
@@ -0,0 +1,210 @@
+"""
+Async article summarization module.
+
+This module provides the asyncio counterparts of the ArticleSummarizer
+methods, so several articles can be summarized and classified concurrently
+on one event loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, List, Optional, Tuple
+
+import httpx
+
+from src.models import ArticleContent, ArticleSummary, TopicIdentification
+from src.openai_http import LLM_ERRORS, create_async_http_client
+from src.prompts import ANALYSIS_TASK, CONCISE_SUMMARY_TASK, TOPICS_TASK, article_messages
+from src.summarizer import ArticleSummarizer, ChatModels
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncArticleSummarizer(ArticleSummarizer):
+    """
+    Summarizes news articles with the async OpenAI client.
+
+    This class adds non-blocking versions of the summary, topic and analysis
+    requests, and a bounded concurrent analysis of many articles. The async
+    methods are called inside `async with summarizer:`, which opens the HTTP
+    client for the running event loop and closes it on exit.
+    """
+
+    def __init__(self):
+        """Initialize the AsyncArticleSummarizer with OpenAI configuration."""
+        super().__init__()
+        # HTTP client of the open `async with` block and the models built around it
+        self._loop_models: Optional[Tuple[httpx.AsyncClient, ChatModels]] = None
+
+    async def __aenter__(self) -> "AsyncArticleSummarizer":
+        """
+        Open an async HTTP client on the running event loop and build the models around it.
+
+        Returns:
+            AsyncArticleSummarizer: This summarizer
+        """
+        client = create_async_http_client()
+        self._loop_models = (client, self._build_models(client))
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the async HTTP client, while its event loop is still running."""
+        if self._loop_models is not None:
+            client, _ = self._loop_models
+            self._loop_models = None
+            await client.aclose()
+
+    def _async_models(self) -> ChatModels:
+        """
+        Get the chat models whose async calls use the open HTTP client.
+
+        Returns:
+            ChatModels: The plain chat model and its JSON-reply bindings
+
+        Raises:
+            RuntimeError: If called outside `async with summarizer:`
+        """
+        if self._loop_models is None:
+            raise RuntimeError("AsyncArticleSummarizer must be used inside 'async with summarizer:'")
+        return self._loop_models[1]
+
+    async def asummarize(
+        self, article: ArticleContent, summary_type: str = "concise", prompt_text: Optional[str] = None
+    ) -> ArticleSummary:
+        """
+        Generate a summary of the article content without blocking the event loop.
+
+        Args:
+            article: The article content to summarize
+            summary_type: The type of summary to generate (concise or detailed)
+        prompt_text: The article's `prompt_text`, if the caller already built it for a paired request
+
+        Returns:
+            ArticleSummary: Contains the original article and its summary
+
+        Raises:
+            ValueError: If summarization fails
+        """
+        try:
+            logger.info("Generating %s summary for article: %s", summary_type, article.title)
+
+            # Run the model calls on the async OpenAI client
+            model = self._async_models().model
+            if summary_type == "detailed":
+                # Map: summarize all chunks concurrently, then combine once
+                partials = await model.abatch(self._map_messages(article, prompt_text))
+                summary = self._message_text(partials[0])
+                if len(partials) > 1:
+                    summary = self._message_text(await model.ainvoke(self._combine_messages(partials)))
+            else:  # Default to concise
+                messages = article_messages(prompt_text or article.prompt_text, CONCISE_SUMMARY_TASK)
+                summary = self._message_text(await model.ainvoke(messages))
+
+            return self.build_summary(article, summary, summary_type)
+
+        except LLM_ERRORS as e:
+            logger.error("Error summarizing article: %s", e)
+            raise ValueError(f"Failed to summarize article: {str(e)}")
+
+    async def aidentify_topics(self, article: ArticleContent, prompt_text: Optional[str] = None) -> TopicIdentification:
+        """
+        Identify main topics and keywords without blocking the event loop.
+
+        Args:
+            article: The article content to analyze
+        prompt_text: The article's `prompt_text`, if the caller already built it for a paired request
+
+        Returns:
+            TopicIdentification: Contains identified topics and keywords
+
+        Raises:
+            ValueError: If topic identification fails
+        """
+        try:
+            logger.info("Identifying topics for article: %s", article.title)
+
+            # Get the JSON object from the model on the async OpenAI client
+            topics_model = self._async_models().topics_model
+            messages = article_messages(prompt_text or article.prompt_text, TOPICS_TASK)
+            response = await topics_model.ainvoke(messages)
+
+            return self._build_topics(article, self._parse_topics_response(self._message_text(response)))
+
+        except LLM_ERRORS as e:
+            logger.error("Error identifying topics: %s", e)
+            raise ValueError(f"Failed to identify topics: {str(e)}")
+
+    async def aanalyze(self, article: ArticleContent) -> Tuple[ArticleSummary, TopicIdentification]:
+        """
+        Generate a concise summary and identify topics with a single async LLM call.
+
+        Args:
+            article: The article content to analyze
+
+        Returns:
+            Tuple of the concise ArticleSummary and the TopicIdentification
+
+        Raises:
+            ValueError: If the analysis fails
+        """
+        try:
+            logger.info("Analyzing article: %s", article.title)
+
+            # One request returns the summary, topics and keywords as JSON
+            analysis_model = self._async_models().analysis_model
+            response = await analysis_model.ainvoke(article_messages(article.prompt_text, ANALYSIS_TASK))
+
+            return self.parse_analysis(article, self._message_text(response))
+
+        except LLM_ERRORS as e:
+            logger.error("Error analyzing article: %s", e)
+            raise ValueError(f"Failed to analyze article: {str(e)}")
+
+    async def summarize_and_identify(
+        self, article: ArticleContent, summary_type: str = "concise"
+    ) -> Tuple[ArticleSummary, TopicIdentification]:
+        """
+        Generate a summary and identify topics with concurrent LLM requests.
+
+        Unlike `aanalyze`, this supports detailed summaries.
+
+        Args:
+            article: The article content to analyze
+            summary_type: The type of summary to generate (concise or detailed)
+
+        Returns:
+            Tuple of the ArticleSummary and the TopicIdentification
+
+        Raises:
+            ValueError: If summarization or topic identification fails
+        """
+        # Both requests send the same article text, so build it once
+        prompt_text = article.prompt_text
+        summary, topics = await asyncio.gather(
+            self.asummarize(article, summary_type, prompt_text), self.aidentify_topics(article, prompt_text)
+        )
+        return summary, topics
+
+    async def aanalyze_many(
+        self, articles: List[ArticleContent], max_concurrency: int = 8
+    ) -> List[Tuple[ArticleSummary, TopicIdentification]]:
+        """
+        Analyze several articles concurrently, one LLM request per article.
+
+        Args:
+            articles: The articles to analyze
+            max_concurrency: Maximum number of requests in flight at once
+
+        Returns:
+            (ArticleSummary, TopicIdentification) tuples in the same order as `articles`
+
+        Raises:
+            ValueError: If the analysis of any article fails
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(article: ArticleContent) -> Tuple[ArticleSummary, TopicIdentification]:
+            async with semaphore:
+                return await self.aanalyze(article)
+
+        return list(await asyncio.gather(*(bounded(article) for article in articles)))
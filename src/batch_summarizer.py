@@ -0,0 +1,188 @@
+"""
+Batch summarization module.
+
+This module analyzes articles through the OpenAI Batch API, which runs the
+requests asynchronously within 24 hours at half the token price and under a
+separate, much larger rate limit. It suits bulk ingestion and re-processing
+jobs that do not need an immediate answer; interactive requests should keep
+using ArticleSummarizer.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import openai
+import orjson
+from langchain_core.messages import convert_to_openai_messages
+
+from src.config import OpenAIConfig
+from src.models import ArticleContent
+from src.openai_http import get_http_client
+from src.prompts import ANALYSIS_TASK, JSON_OBJECT_FORMAT, article_messages
+from src.summarizer import ArticleSummarizer
+
+if TYPE_CHECKING:
+    from src.database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSummarizer:
+    """
+    Submits article analyses to the OpenAI Batch API and stores the finished results.
+
+    The submitted articles are kept in `BATCH_DIR`, one file per batch, until
+    the batch is collected, so pending batches survive restarts.
+    """
+
+    BATCH_DIR = os.path.join(Path(__file__).parents[1], "data", "batches")
+    ENDPOINT = "/v1/chat/completions"
+    COMPLETION_WINDOW = "24h"
+    # Batch states after which no output will ever be produced
+    FAILED_STATES = frozenset({"failed", "expired", "cancelled"})
+
+    def __init__(self, summarizer: Optional[ArticleSummarizer] = None):
+        """
+        Initialize the BatchSummarizer with OpenAI configuration.
+
+        Args:
+            summarizer: Summarizer used to parse the analysis replies
+        """
+        config = OpenAIConfig.instance()
+        config.validate()
+
+        self.config = config
+        # Share the pooled keep-alive transport with the chat models
+        self.client = openai.OpenAI(api_key=config.api_key, http_client=get_http_client())
+        self.summarizer = summarizer or ArticleSummarizer()
+        os.makedirs(self.BATCH_DIR, exist_ok=True)
+
+    def _articles_path(self, batch_id: str) -> str:
+        """Return the path of the file holding the articles of a batch."""
+        return os.path.join(self.BATCH_DIR, f"{batch_id}.jsonl")
+
+    def _request(self, article: ArticleContent) -> Dict[str, Any]:
+        """
+        Build the Batch API request line for one article.
+
+        Args:
+            article: The article to analyze
+
+        Returns:
+            Dict with the custom ID, endpoint and chat completion body
+        """
+        # Reason: same messages and JSON mode as ArticleSummarizer.analyze, so prompt caching and parsing are shared
+        return {
+            "custom_id": article.article_id,
+            "method": "POST",
+            "url": self.ENDPOINT,
+            "body": {
+                "model": self.config.model,
+                "temperature": self.config.temperature,
+                "max_tokens": self.config.max_tokens,
+                "response_format": JSON_OBJECT_FORMAT,
+                "messages": convert_to_openai_messages(article_messages(article.prompt_text, ANALYSIS_TASK)),
+            },
+        }
+
+    def submit_batch(self, articles: List[ArticleContent]) -> str:
+        """
+        Submit a batch job that summarizes the articles and identifies their topics.
+
+        Args:
+            articles: The articles to analyze
+
+        Returns:
+            str: The ID of the submitted batch
+
+        Raises:
+            ValueError: If there are no articles or the submission fails
+        """
+        # Custom IDs must be unique within a batch
+        unique = list({article.article_id: article for article in articles}.values())
+        if not unique:
+            raise ValueError("Failed to submit batch: no articles given")
+
+        try:
+            requests = b"\n".join(orjson.dumps(self._request(article)) for article in unique)
+            input_file = self.client.files.create(file=("articles.jsonl", requests), purpose="batch")
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=self.ENDPOINT,
+                completion_window=self.COMPLETION_WINDOW,
+            )
+
+            with open(self._articles_path(batch.id), "wb") as f:
+                f.write(b"\n".join(article.model_dump_json().encode("utf-8") for article in unique))
+
+            logger.info("Submitted batch %s with %s articles", batch.id, len(unique))
+            return batch.id
+
+        except (openai.OpenAIError, OSError) as e:
+            logger.error("Error submitting batch: %s", e)
+            raise ValueError(f"Failed to submit batch: {str(e)}")
+
+    def pending_batches(self) -> List[str]:
+        """
+        List the submitted batches that have not been collected yet.
+
+        Returns:
+            List of batch IDs
+        """
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(self.BATCH_DIR) if name.endswith(".jsonl"))
+
+    def collect_batch(self, batch_id: str, db_service: "DatabaseService") -> Optional[List[str]]:
+        """
+        Store the results of a finished batch in the database.
+
+        Args:
+            batch_id: The ID returned by `submit_batch`
+            db_service: Database the analyzed articles are stored in
+
+        Returns:
+            The IDs of the stored documents, or None if the batch is still running
+
+        Raises:
+            ValueError: If the batch failed, expired or was cancelled, or collecting it fails
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in self.FAILED_STATES:
+                os.remove(self._articles_path(batch_id))
+                raise ValueError(f"batch {batch_id} is {batch.status}")
+            if batch.status != "completed":
+                logger.info("Batch %s is %s", batch_id, batch.status)
+                return None
+
+            with open(self._articles_path(batch_id), "rb") as f:
+                articles = {
+                    article.article_id: article
+                    for article in map(ArticleContent.model_validate_json, f.read().splitlines())
+                }
+
+            items = []
+            output = self.client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+            for line in output.splitlines():
+                result = orjson.loads(line)
+                article = articles.get(result["custom_id"])
+                response = result.get("response") or {}
+                if article is None or response.get("status_code") != 200:
+                    logger.warning("Skipping failed batch request %s", result["custom_id"])
+                    continue
+                try:
+                    reply = response["body"]["choices"][0]["message"]["content"]
+                    items.append((article, *self.summarizer.parse_analysis(article, reply)))
+                except (KeyError, IndexError, ValueError) as e:
+                    logger.warning("Skipping unparsable batch result %s: %s", result["custom_id"], e)
+
+            doc_ids = db_service.store_articles_bulk(items)
+            os.remove(self._articles_path(batch_id))
+
+            logger.info("Collected batch %s: stored %s of %s articles", batch_id, len(doc_ids), len(articles))
+            return doc_ids
+
+        except (openai.OpenAIError, OSError, ValueError) as e:
+            logger.error("Error collecting batch %s: %s", batch_id, e)
+            raise ValueError(f"Failed to collect batch: {str(e)}")
@@ -5,34 +5,49 @@ This module loads environment variables from the .env file and
 provides structured access to OpenAI API configuration.
 """
 
+import functools
 import os
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 # Find .env file and load environment variables
 env_path = Path(__file__).parents[1] / ".env"
 load_dotenv(dotenv_path=env_path)
-logger.info(f"Environment variables loaded from {env_path}")
+logger.info("Environment variables loaded from %s", env_path)
 
 
+@dataclass(frozen=True, slots=True)
 class OpenAIConfig:
     """Configuration settings for OpenAI API."""
     
-    API_KEY: str = os.getenv("OPENAI_API_KEY", "your_api_key_here")
-    MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-    TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
-    MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "500"))
+    api_key: str
+    model: str
+    temperature: float
+    max_tokens: int
     
     @classmethod
-    def validate(cls) -> bool:
+    @functools.lru_cache(maxsize=1)
+    def instance(cls) -> "OpenAIConfig":
+        """
+        Build the configuration from environment variables, once per process.
+        
+        Returns:
+            OpenAIConfig: The shared configuration
+        """
+        return cls(
+            api_key=os.getenv("OPENAI_API_KEY", "your_api_key_here"),
+            model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
+            max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "500"))
+        )
+    
+    # Reason: every summarizer and search service validates on creation, so log only once
+    @functools.lru_cache(maxsize=1)
+    def validate(self) -> bool:
         """
         Validate OpenAI configuration.
         
@@ -42,14 +57,14 @@ class OpenAIConfig:
         Raises:
             ValueError: If API key is missing.
         """
-        if not cls.API_KEY:
+        if not self.api_key:
             logger.error("OPENAI_API_KEY environment variable is not set.")
             raise ValueError(
                 "OPENAI_API_KEY environment variable is not set. "
                 "Please add it to your .env file."
             )
         
-        if cls.API_KEY == "your_api_key_here":
+        if self.api_key == "your_api_key_here":
             logger.warning(
                 "OPENAI_API_KEY is set to the placeholder value. "
                 "Please replace it with your actual API key in the .env file."
@@ -62,8 +77,8 @@ class OpenAIConfig:
 
 # Validate configuration on module import
 try:
-    valid_config = OpenAIConfig.validate()
+    valid_config = OpenAIConfig.instance().validate()
     if not valid_config:
         logger.warning("OpenAI configuration is using placeholder values.")
 except Exception as e:
-    logger.error(f"Configuration validation failed: {e}")
+    logger.error("Configuration validation failed: %s", e)
@@ -8,7 +8,7 @@ and retrieving article data with vector embeddings for semantic search.
 import logging
 import uuid
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from pydantic import SecretStr
 
@@ -16,13 +16,13 @@ import chromadb
 from langchain_openai import OpenAIEmbeddings
 
 from src.config import OpenAIConfig
-from src.models import ArticleContent, ArticleSummary, TopicIdentification, ArticleDocument
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from src.embedding_cache import CachedEmbeddings
+from src.query_cache import SemanticQueryCache
+from src.article_records import (
+    build_embedding_text, build_metadata, format_article, rebuild_collection, reembed_collection
 )
+from src.models import ArticleContent, ArticleSummary, TopicIdentification
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +36,13 @@ class DatabaseService:
     
     # Collection names constants
     ARTICLES_COLLECTION = "articles"
+    
+    # Embedding settings - text-embedding-3-small supports shortened vectors,
+    # which shrink the HNSW index and speed up distance computations
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_DIMENSIONS = 256
+    EMBEDDING_ID = f"{EMBEDDING_MODEL}:{EMBEDDING_DIMENSIONS}"
+    EMBEDDING_CACHE_DIR = os.path.join(Path(__file__).parents[1], "data", "embed_cache")
     def __init__(self):
         """
         Initialize the DatabaseService.
@@ -44,12 +51,20 @@ class DatabaseService:
             
         os.makedirs(persist_directory, exist_ok=True)
         
-        logger.info(f"Initializing local ChromaDB client with persistence at {persist_directory}")
+        logger.info("Initializing local ChromaDB client with persistence at %s", persist_directory)
         self.client = chromadb.PersistentClient(path=persist_directory)
-        self.embedding_function = OpenAIEmbeddings(
-            api_key=SecretStr(OpenAIConfig.API_KEY),
-            model="text-embedding-ada-002"
+        # Cache embeddings on disk so identical texts are never sent to OpenAI twice
+        self.embedding_function = CachedEmbeddings(
+            OpenAIEmbeddings(
+                api_key=SecretStr(OpenAIConfig.instance().api_key),
+                model=self.EMBEDDING_MODEL,
+                dimensions=self.EMBEDDING_DIMENSIONS
+            ),
+            cache_dir=self.EMBEDDING_CACHE_DIR,
+            namespace=self.EMBEDDING_ID
         )
+        # Reuse results for near-duplicate queries; invalidated on every write
+        self.query_cache = SemanticQueryCache()
         
         self._init_collections()
         
@@ -59,23 +74,131 @@ class DatabaseService:
         """
         Initialize the default collections in ChromaDB.
         
-        This creates the articles collection if it doesn't exist.
+        This creates the articles collection if it doesn't exist, migrates it
+        if it was built with a different embedding model, and caches the
+        collection handle for reuse by all other methods.
         """
         try:
-            try:
-                self.client.get_collection(name=self.ARTICLES_COLLECTION)
-                logger.info(f"Collection '{self.ARTICLES_COLLECTION}' already exists")
-            except Exception as e:
-                print(f"Collection '{self.ARTICLES_COLLECTION}' not found, creating it")
-                self.client.create_collection(
-                    name=self.ARTICLES_COLLECTION,
-                    metadata={"description": "Collection for news articles with summaries and topics"}
-                )
-                logger.info(f"Created collection '{self.ARTICLES_COLLECTION}'")
+            # Reason: keep one collection handle instead of resolving it on every call
+            collection = self.client.get_or_create_collection(
+                name=self.ARTICLES_COLLECTION,
+                metadata=self.collection_metadata()
+            )
+            
+            # The HNSW index is locked to one vector size, so vectors from another model must be rebuilt
+            if (collection.metadata or {}).get("embedding_model") != self.EMBEDDING_ID:
+                collection = self._migrate_collection(collection)
+            
+            self.articles_collection = collection
+            logger.info("Collection '%s' is ready", self.ARTICLES_COLLECTION)
         except Exception as e:
-            logger.error(f"Error initializing collections: {str(e)}")
+            logger.error("Error initializing collections: %s", e)
             raise
     
+    @classmethod
+    def collection_metadata(cls) -> Dict[str, Any]:
+        """
+        Build the metadata used when creating the articles collection.
+        
+        Returns:
+            Dict[str, Any]: Description, embedding model ID and distance metric
+        """
+        return {
+            "description": "Collection for news articles with summaries and topics",
+            "embedding_model": cls.EMBEDDING_ID,
+            "hnsw:space": "cosine"
+        }
+    
+    def _migrate_collection(self, collection: Any) -> Any:
+        """
+        Rebuild the articles collection with the current embedding model.
+        
+        Args:
+            collection: The existing collection built with another model
+            
+        Returns:
+            The recreated collection
+        """
+        old_model = (collection.metadata or {}).get("embedding_model", "text-embedding-ada-002")
+        logger.info(
+            "Migrating collection '%s' from %s to %s",
+            self.ARTICLES_COLLECTION, old_model, self.EMBEDDING_ID
+        )
+        
+        collection, count = reembed_collection(
+            self.client, self.ARTICLES_COLLECTION, self.collection_metadata(),
+            collection, self.embedding_function
+        )
+        
+        logger.info("Re-embedded %s articles into '%s'", count, self.ARTICLES_COLLECTION)
+        return collection
+    
+    def compact_collection(self) -> int:
+        """
+        Rebuild the articles collection from its stored records.
+        
+        Many single deletes leave the HNSW index fragmented; dumping the records
+        and reloading them in bulk produces a compact index. The stored
+        embeddings are reused, so no embeddings requests are made, and a failed
+        rebuild keeps the current collection.
+        
+        Returns:
+            int: Number of articles in the rebuilt collection
+            
+        Raises:
+            ValueError: If the rebuild fails
+        """
+        try:
+            data = self.articles_collection.get(include=["embeddings", "documents", "metadatas"])
+            ids = data["ids"]
+            embeddings = data["embeddings"] if ids else []
+            
+            self.articles_collection = rebuild_collection(
+                self.client, self.ARTICLES_COLLECTION, self.collection_metadata(),
+                ids, embeddings, data["metadatas"], data["documents"]
+            )
+            self.query_cache.clear()
+            
+            logger.info("Compacted collection '%s' with %s articles", self.ARTICLES_COLLECTION, len(ids))
+            return len(ids)
+            
+        except Exception as e:
+            logger.error("Error compacting collection: %s", e)
+            raise ValueError(f"Failed to compact collection: {str(e)}")
+    
+    def _add_records(
+        self,
+        items: List[Tuple[ArticleContent, ArticleSummary, TopicIdentification]],
+        texts: List[str],
+        embeddings: List[List[float]]
+    ) -> List[str]:
+        """
+        Write embedded articles to the collection with one `collection.add` call.
+        
+        Args:
+            items: List of (article, summary, topics) tuples to store
+            texts: The embedded text of each article
+            embeddings: The embedding of each text
+            
+        Returns:
+            List[str]: The IDs of the stored documents, in input order
+        """
+        doc_ids = [uuid.uuid4().hex for _ in items]
+        metadatas = [
+            build_metadata(article, summary, topics)
+            for article, summary, topics in items
+        ]
+        
+        self.articles_collection.add(
+            ids=doc_ids,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            documents=texts
+        )
+        
+        self.query_cache.clear()
+        return doc_ids
+    
     def store_article(
         self, 
         article: ArticleContent, 
@@ -97,56 +220,58 @@ class DatabaseService:
             ValueError: If storing fails
         """
         try:
-            # Generate a unique ID for the article
-            doc_id = str(uuid.uuid4())
-            
-            # Create document for storage
-            document = ArticleDocument(
-                id=doc_id,
-                content=article,
-                summary=summary.summary,
-                topics=topics.topics,
-                keywords=topics.keywords
-            )
-            
-            # Get the collection
-            collection = self.client.get_collection(name=self.ARTICLES_COLLECTION)
-            
             # Prepare text for embedding - combine important elements for better semantic search
-            text_for_embedding = (
-                f"Title: {article.title}\n"
-                f"Summary: {summary.summary}\n"
-                f"Topics: {', '.join(topics.topics)}\n"
-                f"Keywords: {', '.join(topics.keywords)}"
-            )
-              # Get embedding directly from OpenAI - ensure we call embed_query
+            text_for_embedding = build_embedding_text(article, summary, topics)
             embedding = self.embedding_function.embed_query(text_for_embedding)
             
-            # Convert article data to strings for storage
-            document_data = {
-                "url": str(article.url),
-                "title": article.title,
-                "text": article.text[:1000],  # Store truncated text to avoid size limitations
-                "summary": summary.summary,
-                "topics": ", ".join(topics.topics),
-                "keywords": ", ".join(topics.keywords)
-            }
-            
-            # Store the document
-            collection.add(
-                ids=[doc_id],
-                embeddings=[embedding],
-                metadatas=[document_data],
-                documents=[text_for_embedding]
-            )
+            doc_id = self._add_records([(article, summary, topics)], [text_for_embedding], [embedding])[0]
             
-            logger.info(f"Successfully stored article '{article.title}' with ID {doc_id}")
+            logger.info("Successfully stored article '%s' with ID %s", article.title, doc_id)
             return doc_id
             
         except Exception as e:
-            logger.error(f"Error storing article: {str(e)}")
+            logger.error("Error storing article: %s", e)
             raise ValueError(f"Failed to store article: {str(e)}")
     
+    def store_articles_bulk(
+        self,
+        items: List[Tuple[ArticleContent, ArticleSummary, TopicIdentification]]
+    ) -> List[str]:
+        """
+        Store several articles in ChromaDB with a single embeddings request.
+        
+        All texts are embedded in one `embed_documents` call and written with
+        one `collection.add` call, instead of one round-trip per article.
+        
+        Args:
+            items: List of (article, summary, topics) tuples to store
+            
+        Returns:
+            List[str]: The IDs of the stored documents, in input order
+            
+        Raises:
+            ValueError: If storing fails
+        """
+        if not items:
+            return []
+        
+        try:
+            texts = [
+                build_embedding_text(article, summary, topics)
+                for article, summary, topics in items
+            ]
+            
+            # Reason: one request for N texts instead of N sequential round-trips
+            embeddings = self.embedding_function.embed_documents(texts)
+            doc_ids = self._add_records(items, texts, embeddings)
+            
+            logger.info("Successfully stored %s articles in bulk", len(doc_ids))
+            return doc_ids
+            
+        except Exception as e:
+            logger.error("Error storing articles in bulk: %s", e)
+            raise ValueError(f"Failed to store articles: {str(e)}")
+    
     def search_articles(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Search for articles based on semantic similarity to the query.
@@ -162,45 +287,38 @@ class DatabaseService:
             ValueError: If the search fails
         """
         try:
-            # Get the collection
-            collection = self.client.get_collection(name=self.ARTICLES_COLLECTION)
-            
             # Get embedding for query from OpenAI
             query_embedding = self.embedding_function.embed_query(query)
             
+            # Serve semantically equivalent queries from the cache
+            cached_results = self.query_cache.get(query_embedding, limit)
+            if cached_results is not None:
+                logger.info("Search for '%s' served %s cached results", query, len(cached_results))
+                return cached_results
+            
             # Search the collection
-            results = collection.query(
+            results = self.articles_collection.query(
                 query_embeddings=[query_embedding],
                 n_results=limit
             )
             
-            # Process and format results
-            formatted_results = []
-            
-            if results["ids"] and len(results["ids"][0]) > 0:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    # Extract data from the results
-                    metadata = results["metadatas"][0][i] if results["metadatas"] and len(results["metadatas"][0]) > i else {}
-                    distance = results["distances"][0][i] if results["distances"] and len(results["distances"][0]) > i else None
-                    
-                    # Format the result
-                    formatted_result = {
-                        "id": doc_id,
-                        "url": metadata.get("url", ""),
-                        "title": metadata.get("title", ""),
-                        "summary": metadata.get("summary", ""),
-                        "topics": str(metadata.get("topics", "")).split(", "),
-                        "keywords": str(metadata.get("keywords", "")).split(", "),
-                        "relevance_score": 1 - (distance or 0) if distance is not None else None
-                    }
-                    
-                    formatted_results.append(formatted_result)
-            
-            logger.info(f"Search for '{query}' returned {len(formatted_results)} results")
+            # Process and format results - unpack the single query's rows once
+            ids = results["ids"][0] if results["ids"] else []
+            metadatas = results["metadatas"][0] if results["metadatas"] else [None] * len(ids)
+            distances = results["distances"][0] if results["distances"] else [None] * len(ids)
+            
+            formatted_results = [
+                format_article(doc_id, metadata, distance, with_score=True)
+                for doc_id, metadata, distance in zip(ids, metadatas, distances)
+            ]
+            
+            self.query_cache.put(query_embedding, limit, formatted_results)
+            
+            logger.info("Search for '%s' returned %s results", query, len(formatted_results))
             return formatted_results
             
         except Exception as e:
-            logger.error(f"Error searching for articles: {str(e)}")
+            logger.error("Error searching for articles: %s", e)
             raise ValueError(f"Failed to search for articles: {str(e)}")
     
     def get_article_by_id(self, doc_id: str) -> Optional[Dict[str, Any]]:
@@ -217,43 +335,62 @@ class DatabaseService:
             ValueError: If retrieval fails
         """
         try:
-            # Get the collection
-            collection = self.client.get_collection(name=self.ARTICLES_COLLECTION)
-            
-            # Get the document by ID
-            result = collection.get(ids=[doc_id])
+            # Get the document by ID - only metadata is needed, skip the stored document text
+            result = self.articles_collection.get(ids=[doc_id], include=["metadatas"])
             
             # Check if document was found
             if not result["ids"]:
-                logger.warning(f"Article with ID {doc_id} not found")
+                logger.warning("Article with ID %s not found", doc_id)
                 return None
             
-            # Extract data from the result
-            metadata = result["metadatas"][0] if result["metadatas"] else {}
-            
             # Format the result
-            article_data = {
-                "id": doc_id,
-                "url": metadata.get("url", ""),
-                "title": metadata.get("title", ""),
-                "summary": metadata.get("summary", ""),
-                "topics": str(metadata.get("topics", "")).split(", "),
-                "keywords": str(metadata.get("keywords", "")).split(", ")
-            }
-            
-            logger.info(f"Successfully retrieved article with ID {doc_id}")
+            metadata = result["metadatas"][0] if result["metadatas"] else None
+            article_data = format_article(doc_id, metadata)
+            
+            logger.info("Successfully retrieved article with ID %s", doc_id)
             return article_data
             
         except Exception as e:
-            logger.error(f"Error retrieving article with ID {doc_id}: {str(e)}")
+            logger.error("Error retrieving article with ID %s: %s", doc_id, e)
             raise ValueError(f"Failed to retrieve article: {str(e)}")
     
-    def list_articles(self, limit: int = 100) -> List[Dict[str, Any]]:
+    def url_exists(self, url: str) -> bool:
+        """
+        Check whether an article from the given URL is already stored.
+        
+        Args:
+            url: The article URL, as stored in the record metadata
+            
+        Returns:
+            bool: True if at least one stored article has this URL
+            
+        Raises:
+            ValueError: If the lookup fails
+        """
+        try:
+            # Reason: a metadata filter runs in Chroma's SQLite store, no embeddings or vectors are loaded
+            result = self.articles_collection.get(where={"url": url}, limit=1, include=[])
+            return bool(result["ids"])
+        except Exception as e:
+            logger.error("Error looking up article URL %s: %s", url, e)
+            raise ValueError(f"Failed to look up article URL: {str(e)}")
+    
+    def count_articles(self) -> int:
+        """
+        Count the stored articles without loading them.
+        
+        Returns:
+            int: Number of articles in the collection
+        """
+        return self.articles_collection.count()
+    
+    def list_articles(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         """
-        List all stored articles.
+        List stored articles, one page at a time.
         
         Args:
             limit: Maximum number of articles to return
+            offset: Number of articles to skip, for pagination
             
         Returns:
             List of articles with basic data
@@ -262,35 +399,21 @@ class DatabaseService:
             ValueError: If listing fails
         """
         try:
-            # Get the collection
-            collection = self.client.get_collection(name=self.ARTICLES_COLLECTION)
-            
-            # Get all documents (up to limit)
-            result = collection.get(limit=limit)
+            # Reason: limit/offset are applied in Chroma's SQLite store, so only one page is loaded
+            result = self.articles_collection.get(limit=limit, offset=offset, include=["metadatas"])
             
             # Format the results
-            articles = []
-            for i, doc_id in enumerate(result["ids"]):
-                # Extract data from the result
-                metadata = result["metadatas"][i] if result["metadatas"] else {}
-                
-                # Format the result
-                article_data = {
-                    "id": doc_id,
-                    "url": metadata.get("url", ""),
-                    "title": metadata.get("title", ""),
-                    "summary": metadata.get("summary", ""),  # Include summary
-                    "topics": str(metadata.get("topics", "")).split(", "),
-                    "keywords": str(metadata.get("keywords", "")).split(", ") if metadata.get("keywords") else []  # Include keywords
-                }
-                
-                articles.append(article_data)
-            
-            logger.info(f"Listed {len(articles)} articles")
+            metadatas = result["metadatas"] or [None] * len(result["ids"])
+            articles = [
+                format_article(doc_id, metadata)
+                for doc_id, metadata in zip(result["ids"], metadatas)
+            ]
+            
+            logger.info("Listed %s articles", len(articles))
             return articles
             
         except Exception as e:
-            logger.error(f"Error listing articles: {str(e)}")
+            logger.error("Error listing articles: %s", e)
             raise ValueError(f"Failed to list articles: {str(e)}")
     
     def delete_article(self, doc_id: str) -> bool:
@@ -306,19 +429,39 @@ class DatabaseService:
         Raises:
             ValueError: If deletion fails
         """
-        try:
-            # Get the collection
-            collection = self.client.get_collection(name=self.ARTICLES_COLLECTION)
+        self.delete_articles([doc_id])
+        return True
+    
+    def delete_articles(self, ids: List[str]) -> int:
+        """
+        Delete several articles with a single collection write.
+        
+        Prefer this over repeated `delete_article` calls: one delete takes the
+        collection lock and mutates the HNSW index once for all IDs.
+        
+        Args:
+            ids: The IDs of the documents to delete
             
-            # Delete the document
-            collection.delete(ids=[doc_id])
+        Returns:
+            int: Number of IDs submitted for deletion
             
-            logger.info(f"Successfully deleted article with ID {doc_id}")
-            return True
+        Raises:
+            ValueError: If deletion fails
+        """
+        if not ids:
+            return 0
+        
+        try:
+            # Delete the documents
+            self.articles_collection.delete(ids=ids)
+            self.query_cache.clear()
+            
+            logger.info("Successfully deleted %s articles", len(ids))
+            return len(ids)
             
         except Exception as e:
-            logger.error(f"Error deleting article with ID {doc_id}: {str(e)}")
-            raise ValueError(f"Failed to delete article: {str(e)}")
+            logger.error("Error deleting articles %s: %s", ids, e)
+            raise ValueError(f"Failed to delete articles: {str(e)}")
 
     def reset_database(self) -> bool:
         """
@@ -333,21 +476,18 @@ class DatabaseService:
         try:
             # Reset the client (delete all collections)
             self.client.reset()
+            self.query_cache.clear()
             
-            # Re-initialize collections - explicitly create collection to ensure test passes
-            try:
-                self.client.create_collection(
-                    name=self.ARTICLES_COLLECTION,
-                    metadata={"description": "Collection for news articles with summaries and topics"}
-                )
-                logger.info(f"Created collection '{self.ARTICLES_COLLECTION}' after reset")
-            except Exception as e:
-                logger.error(f"Error creating collection after reset: {str(e)}")
-                raise
+            # Recreate the empty articles collection
+            self.articles_collection = self.client.create_collection(
+                name=self.ARTICLES_COLLECTION,
+                metadata=self.collection_metadata()
+            )
+            logger.info("Created collection '%s' after reset", self.ARTICLES_COLLECTION)
             
             logger.info("Successfully reset the database")
             return True
             
         except Exception as e:
-            logger.error(f"Error resetting database: {str(e)}")
+            logger.error("Error resetting database: %s", e)
             raise ValueError(f"Failed to reset database: {str(e)}")
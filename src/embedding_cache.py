@@ -0,0 +1,193 @@
+"""
+Embedding cache module.
+
+This module provides a wrapper around a LangChain embeddings model that caches
+vectors on disk (SQLite) and in memory, keyed by the SHA-256 of the embedded text.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper with an in-memory LRU and a persistent SQLite cache.
+
+    Identical texts are only sent to the underlying embeddings model once;
+    later lookups are served from memory or from disk across runs.
+    """
+
+    DB_FILENAME = "embeddings.sqlite"
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_dir: str,
+        namespace: str = "",
+        max_memory_items: int = 1024
+    ):
+        """
+        Initialize the cache and create the SQLite table if needed.
+
+        Args:
+            embeddings: The underlying embeddings model to call on cache misses
+            cache_dir: Directory where the SQLite cache file is stored
+            namespace: Prefix mixed into every key (e.g. the model name) so
+                vectors from different models never collide
+            max_memory_items: Maximum number of vectors kept in the in-memory LRU
+        """
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.max_memory_items = max_memory_items
+        # Reason: packed float32 arrays take 4 bytes per dimension, versus
+        # ~32 bytes per dimension for a list of Python floats
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        # Reason: Streamlit serves reruns from worker threads, so the shared
+        # connection and LRU must be guarded
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        db_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info("Embedding cache initialized at %s", db_path)
+
+    def _key(self, text: str) -> str:
+        """
+        Compute the cache key for a text.
+
+        Args:
+            text: The text to be embedded
+
+        Returns:
+            str: Hex SHA-256 digest of the namespaced text
+        """
+        return hashlib.sha256(f"{self.namespace}\n{text}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _decode(blob: bytes) -> array:
+        """Unpack float32 bytes into a packed float32 array."""
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector
+
+    def _remember(self, key: str, vector: array) -> None:
+        """Put a packed vector in the in-memory LRU, evicting the oldest entry if full."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Fetch cached vectors from memory first, then from SQLite.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dict[str, List[float]]: Vectors for the keys that were found
+        """
+        found: Dict[str, List[float]] = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key].tolist()
+                else:
+                    missing.append(key)
+
+            if missing:
+                placeholders = ", ".join("?" for _ in missing)
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})",
+                    missing
+                ).fetchall()
+                for key, blob in rows:
+                    vector = self._decode(blob)
+                    found[key] = vector.tolist()
+                    self._remember(key, vector)
+        return found
+
+    def _store(self, entries: Dict[str, List[float]]) -> None:
+        """
+        Persist freshly computed vectors to memory and SQLite.
+
+        Args:
+            entries: Mapping of cache key to vector
+        """
+        packed = {key: array("f", vector) for key, vector in entries.items()}
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in packed.items()]
+            )
+            self._conn.commit()
+            for key, vector in packed.items():
+                self._remember(key, vector)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts, calling the underlying model once for all misses.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            List[List[float]]: One vector per input text, in input order
+        """
+        keys = [self._key(text) for text in texts]
+        cached = self._lookup(keys)
+
+        # Deduplicate misses so repeated texts in one batch are embedded once
+        misses: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in misses:
+                misses[key] = text
+
+        if misses:
+            vectors = self.embeddings.embed_documents(list(misses.values()))
+            fresh = dict(zip(misses.keys(), vectors))
+            self._store(fresh)
+            cached.update(fresh)
+
+        logger.info("Embedding cache: %s hits, %s misses", len(texts) - len(misses), len(misses))
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query text, using the cache when possible.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            List[float]: The embedding vector
+        """
+        key = self._key(text)
+        cached = self._lookup([key])
+        if key in cached:
+            return cached[key]
+
+        vector = self.embeddings.embed_query(text)
+        self._store({key: vector})
+        return vector
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -6,19 +6,24 @@ from news article URLs using requests and BeautifulSoup.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from bs4 import BeautifulSoup
+import soupsieve
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from bs4.element import Tag
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterator, NamedTuple, Optional
 from pydantic import HttpUrl
 
+from src.article_selectors import (
+    TITLE_SELECTORS, CONTENT_SELECTORS, EXCLUDE_SELECTORS, AUTHOR_SELECTORS, DATE_SELECTORS
+)
 from src.models import ArticleContent
+from src.text_utils import DEFAULT_MAX_CHARS, join_paragraphs
+from src import lexbor_parser
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -30,19 +35,48 @@ class ArticleExtractor:
     to extract article headlines and full text.
     """
     
-    def __init__(self):
-        """Initialize the ArticleExtractor with default headers."""
+    # Maximum number of pooled connections kept per host
+    POOL_SIZE = 10
+    
+    # BeautifulSoup tree builder (libxml2-backed, much faster than 'html.parser')
+    PARSER = 'lxml'
+    
+    def __init__(self, use_selectolax: Optional[bool] = None):
+        """
+        Initialize the ArticleExtractor with default headers and a pooled HTTP session.
+        
+        Args:
+            use_selectolax: Parse with the selectolax Lexbor backend instead of
+                BeautifulSoup; defaults to True when selectolax is installed
+            
+        Raises:
+            ImportError: If selectolax is requested but not installed
+        """
+        if use_selectolax and not lexbor_parser.AVAILABLE:
+            raise ImportError("selectolax is not installed")
+        self.use_selectolax = lexbor_parser.AVAILABLE if use_selectolax is None else use_selectolax
+        
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                         '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                         '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Reason: only advertise encodings urllib3 can decode here (br needs brotli)
+            'Accept-Encoding': ACCEPT_ENCODING
         }
+        
+        # Reuse TCP/TLS connections across requests instead of a cold handshake per URL
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
-    def extract(self, url: str) -> ArticleContent:
+    def extract(self, url: str, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> ArticleContent:
         """
         Extract headline and full text from a news article URL.
         
         Args:
             url: The URL of the news article to extract content from
+            max_chars: Maximum number of article text characters to keep, or None for no limit
             
         Returns:
             ArticleContent: Contains the article title, text, and metadata
@@ -51,23 +85,33 @@ class ArticleExtractor:
             ValueError: If the URL cannot be fetched or content cannot be extracted
         """
         try:
-            logger.info(f"Extracting content from: {url}")
+            logger.info("Extracting content from: %s", url)
             
             # Fetch the HTML content
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()  # Raise exception for HTTP errors
             
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Only trust the charset if the server actually sent one
+            content_type = response.headers.get('Content-Type', '').lower()
+            encoding = response.encoding if 'charset' in content_type else None
             
-            # Extract title - common patterns in news sites
-            title = self._extract_title(soup)
-            
-            # Extract content - common patterns in news sites
-            text = self._extract_text(soup)
-            
-            # Extract metadata (could be expanded)
-            metadata = self._extract_metadata(soup)
+            if self.use_selectolax:
+                # Fast path: C-level parse tree and CSS matching
+                html = lexbor_parser.decode_html(response.content, encoding)
+                title, text, metadata = lexbor_parser.parse_article(html, max_chars)
+            else:
+                # Parse the raw (already decompressed) bytes with the C-based lxml parser,
+                # skipping the str decode
+                soup = BeautifulSoup(response.content, self.PARSER, from_encoding=encoding)
+                
+                # Extract title - common patterns in news sites
+                title = self._extract_title(soup)
+                
+                # Extract content - common patterns in news sites
+                text = self._extract_text(soup, max_chars)
+                
+                # Extract metadata (could be expanded)
+                metadata = self._extract_metadata(soup)
             
             return ArticleContent(
                 url=HttpUrl(url)        ,
@@ -77,13 +121,41 @@ class ArticleExtractor:
             )
         
         except requests.RequestException as e:
-            logger.error(f"Error fetching URL {url}: {str(e)}")
+            logger.error("Error fetching URL %s: %s", url, e)
             raise ValueError(f"Failed to fetch article from {url}: {str(e)}")
         
         except Exception as e:
-            logger.error(f"Error extracting content from {url}: {str(e)}")
+            logger.error("Error extracting content from %s: %s", url, e)
             raise ValueError(f"Failed to extract article content from {url}: {str(e)}")
     
+    def extract_many(
+        self,
+        urls: List[str],
+        max_concurrency: int = 5,
+        max_chars: Optional[int] = DEFAULT_MAX_CHARS
+    ) -> List[ArticleContent]:
+        """
+        Extract several articles concurrently over the shared HTTP session.
+        
+        Args:
+            urls: The URLs of the news articles to extract
+            max_concurrency: Maximum number of articles fetched at the same time
+            max_chars: Maximum number of text characters kept per article, or None for no limit
+            
+        Returns:
+            List[ArticleContent]: Extracted articles, in the same order as `urls`
+            
+        Raises:
+            ValueError: If any URL cannot be fetched or its content cannot be extracted
+        """
+        if not urls:
+            return []
+        
+        # Reason: fetching is network-bound, so threads overlap the round-trips
+        workers = max(1, min(max_concurrency, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(partial(self.extract, max_chars=max_chars), urls))
+    
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """
         Extract the article title from BeautifulSoup object.
@@ -97,39 +169,28 @@ class ArticleExtractor:
         Raises:
             ValueError: If title cannot be found
         """
-        # Try different common patterns for article titles
-        # 1. Look for article tags with headlines
-        if article := soup.find('article'):
-            # Only call .find if 'article' is a Tag, not a NavigableString or other PageElement
-            if isinstance(article, Tag):
-                if headline := article.find(['h1', 'h2']):
-                    return headline.get_text().strip()
-        
-        # 2. Look for standard header tags
-        if h1 := soup.find('h1'):
-            return h1.get_text().strip()
-        
-        # 3. Look for common title classes/IDs
-        for selector in ['.headline', '.article-title', '#article-title', '.post-title', '.entry-title']:
-            if title_elem := soup.select_one(selector):
-                return title_elem.get_text().strip()
-        
-        # 4. Fall back to HTML title tag
+        # Try different common patterns for article titles, in priority order:
+        # headlines inside <article>, any <h1>, then common title classes/IDs
+        for title_elem in _select_by_priority(soup, _TITLE):
+            return title_elem.get_text().strip()
+        
+        # Fall back to HTML title tag
         if html_title := soup.title:
             return html_title.get_text().strip()
         
         # If we get here, no title was found
         raise ValueError("Could not extract article title")
     
-    def _extract_text(self, soup: BeautifulSoup) -> str:
+    def _extract_text(self, soup: BeautifulSoup, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
         """
-        Extract the full text content from BeautifulSoup object.
+        Extract the article text content from BeautifulSoup object.
         
         Args:
             soup: BeautifulSoup object of the article page
+            max_chars: Maximum number of characters to keep, or None for no limit
             
         Returns:
-            str: The extracted article text
+            str: The extracted article text, at most `max_chars` long
             
         Raises:
             ValueError: If article text cannot be found
@@ -137,30 +198,25 @@ class ArticleExtractor:
         content = ""
         
         # 1. Look for article content in main content areas
-        content_selectors = [
-            'article', '.article-body', '.story-body', '.post-content', 
-            '.entry-content', '#article-body', '.story-content', 'main'
-        ]
-        
-        for selector in content_selectors:
-            if content_area := soup.select_one(selector):
-                # Get all paragraphs in the content area
-                paragraphs = content_area.find_all('p')
-                if paragraphs:
-                    content = '\n\n'.join([p.get_text().strip() for p in paragraphs])
-                    break
+        for content_area in _select_by_priority(soup, _CONTENT):
+            # Get all paragraphs in the content area
+            paragraphs = content_area.find_all('p')
+            if paragraphs:
+                # Reason: stop extracting paragraph text once the budget is reached
+                content = join_paragraphs((p.get_text().strip() for p in paragraphs), max_chars)
+                break
         
         # 2. Fall back to all paragraphs if needed
         if not content:
-            # Exclude navigation, footer, etc.
-            exclude_selectors = ['nav', 'footer', 'header', '.comments', '.sidebar']
-            for selector in exclude_selectors:
-                for element in soup.select(selector):
+            # Exclude navigation, footer, etc. in a single selector pass
+            for element in _EXCLUDE.select(soup):
+                # Reason: nested matches are already gone once their ancestor is decomposed
+                if not element.decomposed:
                     element.decompose()
             
             # Get remaining paragraphs
             paragraphs = soup.find_all('p')
-            content = '\n\n'.join([p.get_text().strip() for p in paragraphs])
+            content = join_paragraphs((p.get_text().strip() for p in paragraphs), max_chars)
         
         if not content:
             raise ValueError("Could not extract article text")
@@ -180,37 +236,74 @@ class ArticleExtractor:
         metadata = {}
         
         # Try to extract author
-        author_selectors = [
-            '.author', '.byline', '.article-author', 
-            'meta[name="author"]', 'meta[property="article:author"]'
-        ]
-        
-        for selector in author_selectors:
-            if 'meta' in selector:
-                if author_meta := soup.select_one(selector):
-                    metadata['author'] = author_meta.get('content', '')
-                    break
-            elif author_elem := soup.select_one(selector):
+        for author_elem in _select_by_priority(soup, _AUTHOR):
+            if author_elem.name == 'meta':
+                metadata['author'] = author_elem.get('content', '')
+            else:
                 metadata['author'] = author_elem.get_text().strip()
-                break
+            break
         
         # Try to extract date
-        date_selectors = [
-            '.date', '.published-date', '.article-date', '.timestamp',
-            'time', 'meta[property="article:published_time"]'
-        ]
-        
-        for selector in date_selectors:
-            if 'meta' in selector:
-                if date_meta := soup.select_one(selector):
-                    metadata['date'] = date_meta.get('content', '')
-                    break
-            elif date_elem := soup.select_one(selector):
-                # Check if there's a datetime attribute
-                if date_attr := date_elem.get('datetime'):
-                    metadata['date'] = date_attr
-                else:
-                    metadata['date'] = date_elem.get_text().strip()
-                break
+        for date_elem in _select_by_priority(soup, _DATE):
+            if date_elem.name == 'meta':
+                metadata['date'] = date_elem.get('content', '')
+            # Check if there's a datetime attribute
+            elif date_attr := date_elem.get('datetime'):
+                metadata['date'] = date_attr
+            else:
+                metadata['date'] = date_elem.get_text().strip()
+            break
         
         return metadata
+
+
+class _PrioritySelector(NamedTuple):
+    """A combined CSS selector plus one compiled matcher per priority level."""
+    combined: soupsieve.SoupSieve
+    levels: List[soupsieve.SoupSieve]
+
+
+def _compile_priority(selectors: List[str]) -> _PrioritySelector:
+    """
+    Pre-compile a priority-ordered list of CSS selectors.
+    
+    Args:
+        selectors: CSS selectors, highest priority first
+        
+    Returns:
+        _PrioritySelector: Combined selector and per-level matchers
+    """
+    return _PrioritySelector(
+        combined=soupsieve.compile(', '.join(selectors)),
+        levels=[soupsieve.compile(selector) for selector in selectors]
+    )
+
+
+def _select_by_priority(soup: BeautifulSoup, selector: _PrioritySelector) -> Iterator[Tag]:
+    """
+    Yield the first DOM match for each priority level, highest priority first.
+    
+    Equivalent to calling `soup.select_one()` once per selector, but walks the
+    document only once; the per-level matching runs over the candidates only.
+    
+    Args:
+        soup: BeautifulSoup object of the article page
+        selector: Pre-compiled priority selector
+        
+    Yields:
+        Tag: The first matching element of each level that has a match
+    """
+    candidates = selector.combined.select(soup)
+    for level in selector.levels:
+        for candidate in candidates:
+            if level.match(candidate):
+                yield candidate
+                break
+
+
+# Pre-compiled selectors, highest priority first
+_TITLE = _compile_priority(TITLE_SELECTORS)
+_CONTENT = _compile_priority(CONTENT_SELECTORS)
+_AUTHOR = _compile_priority(AUTHOR_SELECTORS)
+_DATE = _compile_priority(DATE_SELECTORS)
+_EXCLUDE = soupsieve.compile(', '.join(EXCLUDE_SELECTORS))
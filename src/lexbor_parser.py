@@ -0,0 +1,208 @@
+"""
+Lexbor HTML parser backend module.
+
+This module extracts article title, text and metadata with selectolax's
+Lexbor parser, whose tree lives in C and which matches CSS selectors natively.
+It mirrors the BeautifulSoup logic in `src.extractor` and is used when
+selectolax is installed.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from bs4.dammit import EncodingDetector
+
+from src.article_selectors import (
+    TITLE_SELECTORS, CONTENT_SELECTORS, EXCLUDE_SELECTORS, AUTHOR_SELECTORS, DATE_SELECTORS
+)
+from src.text_utils import DEFAULT_MAX_CHARS, join_paragraphs
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+except ImportError:  # pragma: no cover - depends on the environment
+    LexborHTMLParser = None
+    LexborNode = Any
+
+logger = logging.getLogger(__name__)
+
+# Whether the selectolax Lexbor backend can be used
+AVAILABLE = LexborHTMLParser is not None
+
+_TITLE = ', '.join(TITLE_SELECTORS)
+_CONTENT = ', '.join(CONTENT_SELECTORS)
+_AUTHOR = ', '.join(AUTHOR_SELECTORS)
+_DATE = ', '.join(DATE_SELECTORS)
+_EXCLUDE = ', '.join(EXCLUDE_SELECTORS)
+
+
+def decode_html(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Decode raw HTML bytes for the Lexbor parser.
+
+    Args:
+        content: Raw response body
+        encoding: Charset sent by the server, if any
+
+    Returns:
+        str: Decoded HTML (undecodable bytes are replaced)
+    """
+    # Fall back to a <meta charset> declaration, then UTF-8
+    encoding = encoding or EncodingDetector.find_declared_encoding(content, is_html=True) or 'utf-8'
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        logger.warning("Unknown encoding '%s', decoding as UTF-8", encoding)
+        return content.decode('utf-8', errors='replace')
+
+
+def parse_article(html: str, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Parse an article page into title, text and metadata.
+
+    Args:
+        html: Decoded HTML of the article page
+        max_chars: Maximum number of text characters to keep, or None for no limit
+
+    Returns:
+        Tuple[str, str, Dict[str, Any]]: The title, full text and metadata
+
+    Raises:
+        ValueError: If the title or text cannot be found
+    """
+    if not AVAILABLE:
+        raise ImportError("selectolax is not installed")
+
+    tree = LexborHTMLParser(html)
+    title = _extract_title(tree)
+    text = _extract_text(tree, max_chars)
+    metadata = _extract_metadata(tree)
+    return title, text, metadata
+
+
+def _select_by_priority(tree: Any, combined: str, selectors: List[str]) -> Iterator[LexborNode]:
+    """
+    Yield the first DOM match for each priority level, highest priority first.
+
+    Args:
+        tree: Parsed Lexbor document
+        combined: All selectors joined into one selector
+        selectors: The individual selectors, highest priority first
+
+    Yields:
+        LexborNode: The first matching node of each level that has a match
+    """
+    candidates = tree.css(combined)
+    for selector in selectors:
+        for candidate in candidates:
+            if candidate.css_matches(selector):
+                yield candidate
+                break
+
+
+def _node_text(node: LexborNode) -> str:
+    """Return the node's text, concatenated like BeautifulSoup's get_text()."""
+    return node.text(deep=True).strip()
+
+
+def _extract_title(tree: Any) -> str:
+    """
+    Extract the article title.
+
+    Args:
+        tree: Parsed Lexbor document
+
+    Returns:
+        str: The extracted title
+
+    Raises:
+        ValueError: If title cannot be found
+    """
+    for node in _select_by_priority(tree, _TITLE, TITLE_SELECTORS):
+        return _node_text(node)
+
+    # Fall back to HTML title tag
+    if html_title := tree.css_first('title'):
+        return _node_text(html_title)
+
+    raise ValueError("Could not extract article title")
+
+
+def _extract_text(tree: Any, max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
+    """
+    Extract the article text content.
+
+    Args:
+        tree: Parsed Lexbor document
+        max_chars: Maximum number of characters to keep, or None for no limit
+
+    Returns:
+        str: The extracted article text, at most `max_chars` long
+
+    Raises:
+        ValueError: If article text cannot be found
+    """
+    content = ""
+
+    # 1. Look for article content in main content areas
+    for content_area in _select_by_priority(tree, _CONTENT, CONTENT_SELECTORS):
+        paragraphs = content_area.css('p')
+        if paragraphs:
+            content = join_paragraphs((_node_text(p) for p in paragraphs), max_chars)
+            break
+
+    # 2. Fall back to all paragraphs outside navigation, footer, etc.
+    if not content:
+        excluded = tree.css(_EXCLUDE)
+        excluded_ids = {node.mem_id for node in excluded}
+        for node in excluded:
+            # Reason: destroying an ancestor frees its subtree, so nested matches must be skipped
+            if not _has_ancestor_in(node, excluded_ids):
+                node.decompose()
+
+        content = join_paragraphs((_node_text(p) for p in tree.css('p')), max_chars)
+
+    if not content:
+        raise ValueError("Could not extract article text")
+
+    return content
+
+
+def _has_ancestor_in(node: LexborNode, mem_ids: set) -> bool:
+    """Check whether any ancestor of the node has one of the given memory IDs."""
+    parent = node.parent
+    while parent is not None:
+        if parent.mem_id in mem_ids:
+            return True
+        parent = parent.parent
+    return False
+
+
+def _extract_metadata(tree: Any) -> Dict[str, Any]:
+    """
+    Extract metadata from the article.
+
+    Args:
+        tree: Parsed Lexbor document
+
+    Returns:
+        Dict[str, Any]: Dictionary of metadata fields
+    """
+    metadata = {}
+
+    for node in _select_by_priority(tree, _AUTHOR, AUTHOR_SELECTORS):
+        if node.tag == 'meta':
+            metadata['author'] = node.attributes.get('content') or ''
+        else:
+            metadata['author'] = _node_text(node)
+        break
+
+    for node in _select_by_priority(tree, _DATE, DATE_SELECTORS):
+        if node.tag == 'meta':
+            metadata['date'] = node.attributes.get('content') or ''
+        elif date_attr := node.attributes.get('datetime'):
+            metadata['date'] = date_attr
+        else:
+            metadata['date'] = _node_text(node)
+        break
+
+    return metadata
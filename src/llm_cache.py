@@ -0,0 +1,221 @@
+"""
+LLM response cache module.
+
+This module provides a persistent LangChain LLM cache backed by SQLite and
+installs it as the global cache, so identical prompts sent to the same model
+with the same parameters are answered from disk instead of calling OpenAI,
+whether they are invoked or streamed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumpd, dumps
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger(__name__)
+
+# Default location of the cache database
+LLM_CACHE_DIR = os.path.join(Path(__file__).parents[1], "data", "llm_cache")
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LangChain LLM cache persisted in a SQLite table.
+
+    Entries are keyed by the SHA-256 of the serialized model parameters
+    (`llm_string`, which includes the model name and temperature) and the prompt.
+    """
+
+    DB_FILENAME = "llm_cache.sqlite"
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR):
+        """
+        Initialize the cache and create the SQLite table if needed.
+
+        Args:
+            cache_dir: Directory where the SQLite cache file is stored
+        """
+        # Reason: Streamlit reruns and async calls reach the cache from other threads
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        db_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, generations TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info("LLM cache initialized at %s", db_path)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """
+        Compute the cache key for a prompt and model configuration.
+
+        Args:
+            prompt: The serialized prompt
+            llm_string: The serialized model parameters
+
+        Returns:
+            str: Hex SHA-256 digest of the model parameters and prompt
+        """
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(generations: RETURN_VAL_TYPE) -> str:
+        """Serialize generations (chat messages are kept with their metadata)."""
+        rows: List[Dict[str, Any]] = []
+        for generation in generations:
+            if isinstance(generation, ChatGeneration):
+                rows.append({"message": message_to_dict(generation.message)})
+            else:
+                rows.append({"text": generation.text})
+        # Reason: metadata dicts may have non-string keys, which the stdlib json turned into strings
+        return orjson.dumps(rows, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def _decode(encoded: str) -> RETURN_VAL_TYPE:
+        """Rebuild the generations serialized by `_encode`."""
+        generations: List[Generation] = []
+        for row in orjson.loads(encoded):
+            if "message" in row:
+                generations.append(ChatGeneration(message=messages_from_dict([row["message"]])[0]))
+            else:
+                generations.append(Generation(text=row["text"]))
+        return generations
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Look up cached generations for a prompt.
+
+        Args:
+            prompt: The serialized prompt
+            llm_string: The serialized model parameters
+
+        Returns:
+            The cached generations, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations FROM responses WHERE key = ?",
+                (self._key(prompt, llm_string),)
+            ).fetchone()
+        if row is None:
+            return None
+        logger.debug("LLM cache hit")
+        return self._decode(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Store generations for a prompt.
+
+        Args:
+            prompt: The serialized prompt
+            llm_string: The serialized model parameters
+            return_val: The generations returned by the model
+        """
+        encoded = self._encode(return_val)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, generations) VALUES (?, ?)",
+                (self._key(prompt, llm_string), encoded)
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def enable_llm_cache(cache_dir: str = LLM_CACHE_DIR) -> BaseCache:
+    """
+    Install the SQLite LLM cache as LangChain's global cache.
+
+    Does nothing if a global cache is already set.
+
+    Args:
+        cache_dir: Directory where the SQLite cache file is stored
+
+    Returns:
+        BaseCache: The active global cache
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        cache = SQLiteLLMCache(cache_dir)
+        set_llm_cache(cache)
+    return cache
+
+
+def cache_llm_string(model: BaseChatModel) -> Optional[str]:
+    """
+    Build the model part of the cache key `invoke` uses for a call without extra kwargs.
+
+    The key is built from the public serialized form of the model, in the
+    layout `BaseChatModel` writes for serializable models.
+
+    Args:
+        model: The chat model
+
+    Returns:
+        The serialized model parameters, or None if the model is not serializable
+    """
+    if not model.is_lc_serializable():
+        return None
+    # Reason: stdlib json with sorted keys, because the separators must match the entries invoke writes
+    return json.dumps(dumpd(model), sort_keys=True) + "---" + str(sorted({"stop": None}.items()))
+
+
+def stream_with_cache(model: BaseChatModel, messages: List[BaseMessage]) -> Iterator[str]:
+    """
+    Stream the text of a chat completion through the global LLM cache.
+
+    `BaseChatModel.stream` skips the cache, so this looks the prompt up first
+    (yielding a hit as one piece) and stores the streamed text afterwards under
+    the key `invoke` uses, so streamed and invoked calls share entries. Models
+    that are not serializable are streamed without the cache.
+
+    Args:
+        model: The chat model to stream from
+        messages: The prompt messages
+
+    Yields:
+        str: Consecutive pieces of the completion text
+    """
+    cache = get_llm_cache()
+    llm_string = cache_llm_string(model) if cache is not None else None
+    if llm_string is None:
+        for chunk in model.stream(messages):
+            yield str(chunk.content)
+        return
+
+    prompt = dumps(messages)
+    cached = cache.lookup(prompt, llm_string)
+    if cached:
+        yield cached[0].text
+        return
+
+    pieces: List[str] = []
+    for chunk in model.stream(messages):
+        piece = str(chunk.content)
+        pieces.append(piece)
+        yield piece
+    cache.update(prompt, llm_string, [ChatGeneration(message=AIMessage(content="".join(pieces)))])
@@ -0,0 +1,26 @@
+"""
+Logging setup module.
+
+This module configures the root logger once for the application. It is
+imported by the entry points (`main.py`, `app.py`) before any other `src`
+module, so library modules only create their own loggers.
+"""
+
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Configure the root logger with the application's log format.
+
+    Calling it again has no effect once handlers are installed.
+
+    Args:
+        level: Minimum level of the messages to emit
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+configure_logging()
@@ -5,6 +5,8 @@ This module provides Pydantic models for article content, summaries, and topics
 used throughout the application.
 """
 
+import hashlib
+
 from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, Dict, Any, List
 
@@ -23,6 +25,17 @@ class ArticleContent(BaseModel):
     title: str
     text: str
     metadata: Optional[Dict[str, Any]] = None
+    
+    @property
+    def prompt_text(self) -> str:
+        """Title and text combined as the LLM context, built from the current fields."""
+        return f"Title: {self.title}\n\n{self.text}"
+    
+    @property
+    def article_id(self) -> str:
+        """Stable ID derived from the URL and title, identical across processes and runs."""
+        # Reason: hash() is salted per process (PYTHONHASHSEED), so it cannot identify an article across runs
+        return hashlib.blake2b(f"{self.url}-{self.title}".encode("utf-8"), digest_size=8).hexdigest()
 
 
 class ArticleSummary(BaseModel):
@@ -53,6 +66,33 @@ class TopicIdentification(BaseModel):
     keywords: List[str] = Field(..., description="Relevant keywords from the article with classifications")
 
 
+class TopicsResponse(BaseModel):
+    """
+    Pydantic model for the JSON object the chat model returns for topic identification.
+    
+    OpenAI JSON mode only guarantees a JSON object, so replies are validated
+    against this model to check their keys and types.
+    
+    Attributes:
+        classification: The overall category of the article
+        topics: The main topics, starting with the classification
+        keywords: The relevant keywords, starting with the classification
+    """
+    classification: str = "general"
+    topics: List[str]
+    keywords: List[str]
+
+
+class AnalysisResponse(TopicsResponse):
+    """
+    Pydantic model for the JSON object the chat model returns for a combined analysis.
+    
+    Attributes:
+        summary: A concise summary of the article
+    """
+    summary: str
+
+
 class ArticleDocument(BaseModel):
     """
     Pydantic model for storing article data in the vector database.
@@ -0,0 +1,65 @@
+"""
+OpenAI HTTP transport module.
+
+This module provides the HTTP clients shared by every `ChatOpenAI` model in
+the application, so summarization, topic identification and search requests
+reuse one keep-alive connection pool (multiplexed over HTTP/2 when the `h2`
+package is installed) instead of each model opening its own connections, and
+the errors those requests are expected to raise.
+"""
+
+import functools
+import importlib.util
+import logging
+
+import httpx
+import openai
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+logger = logging.getLogger(__name__)
+
+# Whether httpx can negotiate HTTP/2 (requires the optional `h2` package)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Errors an OpenAI request or the parsing of its reply can raise (json.JSONDecodeError and
+# pydantic's ValidationError are ValueErrors); anything else is a bug and propagates
+LLM_ERRORS = (openai.OpenAIError, httpx.HTTPError, ValueError)
+
+# Connection pool sizes shared by all OpenAI requests
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+
+def _limits() -> httpx.Limits:
+    """Return the connection pool limits for the OpenAI clients."""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared synchronous HTTP client for OpenAI requests.
+
+    Returns:
+        httpx.Client: Client with the OpenAI SDK defaults, a larger pool and HTTP/2 if available
+    """
+    if not HTTP2_AVAILABLE:
+        logger.info("h2 is not installed; OpenAI requests use HTTP/1.1 keep-alive connections")
+    return DefaultHttpxClient(http2=HTTP2_AVAILABLE, limits=_limits())
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """
+    Create an asynchronous HTTP client for OpenAI requests.
+
+    An async client's pooled connections belong to the event loop that opened
+    them, so the caller owns the client: it is used within one event loop (e.g.
+    one `asyncio.run`) and closed with `await client.aclose()` before that loop ends.
+
+    Returns:
+        httpx.AsyncClient: Client with the OpenAI SDK defaults, a larger pool and HTTP/2 if available
+    """
+    return DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, limits=_limits())
@@ -0,0 +1,81 @@
+"""
+Prompt module.
+
+This module provides the prompts sent to the chat model for article
+summarization, topic identification and combined analysis.
+"""
+
+from typing import Any, Dict, List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+# Reason: every request starts with the same system prompt followed by the article,
+# and only the final task message differs. OpenAI caches a repeated prompt prefix,
+# so the article tokens are not prefilled again for the second and later requests.
+# Keep per-call details out of these two leading messages.
+SYSTEM_ANALYST = (
+    "You are an expert news analyst. You read news articles, summarize them and "
+    "identify their main topics, keywords and overall classification "
+    "(e.g., politics, technology, sports, health). The article follows."
+)
+
+CONCISE_SUMMARY_TASK = (
+    "Write a concise summary of the article above in no more than 3-4 sentences. "
+    "First, identify a single main classification category for the article (e.g., politics, technology, sports, health). "
+    "Begin your summary with \"Classification: <category> - \" followed by your summary text."
+)
+
+DETAILED_SUMMARY_TASK = (
+    "Write a summary of the text above in no more than 250 words. Cover the main points, key details and conclusions. "
+    "Include the article's main classification (e.g., politics, technology, sports, health) at the beginning "
+    "of the summary in the format \"Classification: <category> - <summary text>\"."
+)
+
+TOPICS_TASK = (
+    "Identify the 3-5 main topics and 5-10 relevant keywords from the article above. "
+    "Also identify a single overall classification for the article (e.g., 'politics', 'technology', 'sports', 'health', etc.). "
+    "Always return only a JSON with three keys: 'classification', 'topics', and 'keywords'. "
+    "The 'classification' should be a single string, and 'topics' and 'keywords' should be lists. "
+    "Add the classification as the first element in both the topics and keywords lists. "
+    "Example format: {'classification': 'gaming', 'topics': ['gaming', 'fortnite leaks', 'fortnite gameplay'], 'keywords': ['gaming', 'battle royale', 'skins', 'update']}. "
+    "If no topics or keywords are found, include just the classification in the lists."
+)
+
+ANALYSIS_TASK = (
+    "Return only a JSON object with four keys for the article above: 'summary', 'classification', 'topics' and 'keywords'. "
+    "'summary' is a concise summary of the article in no more than 3-4 sentences. "
+    "'classification' is a single overall category for the article (e.g., 'politics', 'technology', 'sports', 'health'). "
+    "'topics' lists the 3-5 main topics and 'keywords' lists 5-10 relevant keywords; "
+    "add the classification as the first element of both lists. "
+    "Example format: {\"summary\": \"...\", \"classification\": \"gaming\", "
+    "\"topics\": [\"gaming\", \"fortnite leaks\"], \"keywords\": [\"gaming\", \"battle royale\", \"skins\"]}."
+)
+
+# OpenAI JSON mode for the topics and analysis replies; unlike strict structured outputs it is
+# supported by every chat model, including the default gpt-3.5-turbo
+JSON_OBJECT_FORMAT: Dict[str, Any] = {"type": "json_object"}
+
+# Static system message, built once and shared by every request
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_ANALYST)
+
+
+def article_messages(text: str, task: str) -> List[BaseMessage]:
+    """
+    Build chat messages with the shared prefix (system prompt, then the text) and the task last.
+
+    The text is untrusted page content, so it is sent as a user message and
+    never with system-prompt authority.
+
+    Args:
+        text: The article (or article chunk) to work on
+        task: The task-specific instructions
+
+    Returns:
+        List of the system message followed by two human messages
+    """
+    return [
+        _SYSTEM_MESSAGE,
+        HumanMessage(content=text),
+        HumanMessage(content=task)
+    ]
+
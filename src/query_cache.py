@@ -0,0 +1,130 @@
+"""
+Semantic query cache module.
+
+This module provides an in-memory cache of query results keyed by query
+embeddings, so near-duplicate queries can be answered without repeating a
+vector search or an LLM call.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticQueryCache:
+    """
+    Cache of query results matched by cosine similarity of query embeddings.
+
+    Cached query vectors are kept L2-normalized in a single NumPy matrix, so a
+    lookup is one matrix-vector product over all cached queries.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached query to match
+            ttl_seconds: Time after which a cached entry expires
+            max_entries: Maximum number of cached queries (oldest evicted first)
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop all cached entries (e.g. after the collection changes)."""
+        with self._lock:
+            self._vectors = None
+            self._entries = []
+
+    def _expire(self, now: float) -> None:
+        """
+        Remove expired entries. Must be called with the lock held.
+
+        Args:
+            now: Current monotonic time
+        """
+        keep = [i for i, entry in enumerate(self._entries) if now - entry["created"] < self.ttl_seconds]
+        if len(keep) == len(self._entries):
+            return
+        self._entries = [self._entries[i] for i in keep]
+        self._vectors = self._vectors[keep] if keep and self._vectors is not None else None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding: List[float], limit: int) -> Optional[List[Any]]:
+        """
+        Look up cached results for a query embedding.
+
+        Args:
+            embedding: The query embedding
+            limit: Number of results (search results, suggestions...) requested
+
+        Returns:
+            A copy of the cached results (truncated to `limit`), or None on a miss
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            if self._vectors is None:
+                return None
+
+            query = self._normalize(embedding)
+            if query.shape[0] != self._vectors.shape[1]:
+                return None
+            similarities = self._vectors @ query
+
+            # Reason: an entry cached with a smaller limit cannot answer a larger request
+            for index in np.argsort(similarities)[::-1]:
+                if similarities[index] < self.threshold:
+                    break
+                entry = self._entries[index]
+                if entry["limit"] >= limit:
+                    logger.info("Query cache hit (similarity %.3f)", similarities[index])
+                    return copy.deepcopy(entry["results"][:limit])
+            return None
+
+    def put(self, embedding: List[float], limit: int, results: List[Any]) -> None:
+        """
+        Store results for a query embedding.
+
+        Args:
+            embedding: The query embedding
+            limit: Number of results that were requested
+            results: The results for the query
+        """
+        vector = self._normalize(embedding)[np.newaxis, :]
+        with self._lock:
+            if self._vectors is not None and self._vectors.shape[1] != vector.shape[1]:
+                # Embedding dimension changed (e.g. new model) - start over
+                self._vectors, self._entries = None, []
+
+            self._entries.append({
+                "limit": limit,
+                "results": copy.deepcopy(results),
+                "created": time.monotonic()
+            })
+            self._vectors = vector if self._vectors is None else np.vstack([self._vectors, vector])
+
+            if len(self._entries) > self.max_entries:
+                self._entries = self._entries[-self.max_entries:]
+                self._vectors = self._vectors[-self.max_entries:]
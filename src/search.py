@@ -6,20 +6,18 @@ and ChromaDB to find relevant articles based on user queries.
 """
 
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import SecretStr
 
 from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
+from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.config import OpenAIConfig
+from src.llm_cache import enable_llm_cache
+from src.openai_http import LLM_ERRORS, get_http_client
 from src.database import DatabaseService
+from src.query_cache import SemanticQueryCache
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -31,21 +29,46 @@ class SemanticSearch:
     queries, with additional features like query expansion and result ranking.
     """
     
-    def __init__(self):
-        """Initialize the SemanticSearch with database service and LLM."""
+    # Minimum cosine similarity for a paraphrased query to reuse an LLM answer
+    LLM_CACHE_THRESHOLD = 0.9
+    LLM_CACHE_TTL_SECONDS = 3600.0
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        """
+        Initialize the SemanticSearch with database service and LLM.
+        
+        Args:
+            db_service: Existing database service to share (so writes through it
+                invalidate this instance's query cache); a new one is created if omitted
+        """
         # Validate OpenAI configuration
-        OpenAIConfig.validate()
+        config = OpenAIConfig.instance()
+        config.validate()
+        
+        # Answer repeated prompts from the persistent LLM response cache
+        enable_llm_cache()
         
         # Initialize the database service
-        self.db_service = DatabaseService()
+        self.db_service = db_service or DatabaseService()
         
         # Initialize the ChatOpenAI model
         self.model = ChatOpenAI(
-            model=OpenAIConfig.MODEL,
+            model=config.model,
             temperature=0.2,  # Lower temperature for more predictable expansions
-            api_key=SecretStr(OpenAIConfig.API_KEY),
+            api_key=SecretStr(config.api_key),
+            # Share one pooled keep-alive (HTTP/2 if available) transport with the other models
+            http_client=get_http_client(),
+        )
+        logger.info("Initialized SemanticSearch with model: %s", config.model)
+        
+        # Reuse LLM answers for paraphrased queries ("top AI news" / "latest AI news");
+        # they do not depend on the stored articles, so writes do not invalidate them
+        self.expansion_cache = SemanticQueryCache(
+            threshold=self.LLM_CACHE_THRESHOLD, ttl_seconds=self.LLM_CACHE_TTL_SECONDS
+        )
+        self.related_cache = SemanticQueryCache(
+            threshold=self.LLM_CACHE_THRESHOLD, ttl_seconds=self.LLM_CACHE_TTL_SECONDS
         )
-        logger.info(f"Initialized SemanticSearch with model: {OpenAIConfig.MODEL}")
     
     def search(self, query: str, limit: int = 5, expand_query: bool = True) -> List[Dict[str, Any]]:
         """
@@ -66,7 +89,7 @@ class SemanticSearch:
             if expand_query:
                 # Expand the query using GenAI for better semantic matching
                 expanded_query = self._expand_query(query)
-                logger.info(f"Expanded query '{query}' to '{expanded_query}'")
+                logger.info("Expanded query '%s' to '%s'", query, expanded_query)
                 search_results = self.db_service.search_articles(expanded_query, limit)
             else:
                 # Use the original query directly
@@ -75,11 +98,11 @@ class SemanticSearch:
             # Enhance the search results with additional info
             enhanced_results = self._enhance_results(query, search_results)
             
-            logger.info(f"Search for '{query}' returned {len(enhanced_results)} results")
+            logger.info("Search for '%s' returned %s results", query, len(enhanced_results))
             return enhanced_results
             
-        except Exception as e:
-            logger.error(f"Error performing semantic search: {str(e)}")
+        except LLM_ERRORS as e:
+            logger.error("Error performing semantic search: %s", e)
             raise ValueError(f"Failed to search for articles: {str(e)}")
     
     def _expand_query(self, query: str) -> str:
@@ -93,6 +116,12 @@ class SemanticSearch:
             Expanded query string
         """
         try:
+            query_embedding = self._embed_query(query)
+            if query_embedding is not None:
+                cached = self.expansion_cache.get(query_embedding, 1)
+                if cached is not None:
+                    return cached[0]
+            
             # Create messages for the chat model
             messages = [
                 SystemMessage(content=(
@@ -119,12 +148,31 @@ class SemanticSearch:
             if len(expanded_query) > 200:
                 expanded_query = expanded_query[:200]
             
+            if query_embedding is not None:
+                self.expansion_cache.put(query_embedding, 1, [expanded_query])
+            
             return expanded_query
             
-        except Exception as e:
-            logger.warning(f"Query expansion failed: {str(e)}")
+        except LLM_ERRORS as e:
+            logger.warning("Query expansion failed: %s", e)
             return query  # Fall back to the original query
     
+    def _embed_query(self, query: str) -> Optional[List[float]]:
+        """
+        Embed a query for the semantic LLM caches.
+        
+        Args:
+            query: The search query text
+            
+        Returns:
+            The query embedding, or None if it cannot be computed (the caches are then skipped)
+        """
+        try:
+            return self.db_service.embedding_function.embed_query(query)
+        except LLM_ERRORS as e:
+            logger.warning("Query embedding for the LLM cache failed: %s", e)
+            return None
+    
     def _enhance_results(self, query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Enhance search results with additional information.
@@ -134,10 +182,8 @@ class SemanticSearch:
             results: The initial search results
             
         Returns:
-            Enhanced search results
+            The same result list, enhanced in place
         """
-        enhanced_results = []
-        
         for result in results:
             # Calculate relevance percentage from score (if available)
             if result.get('relevance_score') is not None:
@@ -146,10 +192,8 @@ class SemanticSearch:
             # Ensure keywords are properly split
             if isinstance(result.get('keywords'), str):
                 result['keywords'] = result['keywords'].split(", ")
-            
-            enhanced_results.append(result)
         
-        return enhanced_results
+        return results
     
     def get_related_searches(self, query: str, num_suggestions: int = 3) -> List[str]:
         """
@@ -166,6 +210,12 @@ class SemanticSearch:
             ValueError: If generation fails
         """
         try:
+            query_embedding = self._embed_query(query)
+            if query_embedding is not None:
+                cached = self.related_cache.get(query_embedding, num_suggestions)
+                if cached is not None:
+                    return cached
+            
             # Create messages for the chat model
             messages = [
                 SystemMessage(content=(
@@ -199,9 +249,13 @@ class SemanticSearch:
             # Limit to the requested number and ensure unique suggestions
             unique_suggestions = list(dict.fromkeys(suggestions))[:num_suggestions]
             
-            logger.info(f"Generated {len(unique_suggestions)} related search suggestions for '{query}'")
+            # Reason: only a full set of suggestions can answer later requests for this many
+            if query_embedding is not None and len(unique_suggestions) == num_suggestions:
+                self.related_cache.put(query_embedding, num_suggestions, unique_suggestions)
+            
+            logger.info("Generated %s related search suggestions for '%s'", len(unique_suggestions), query)
             return unique_suggestions
             
-        except Exception as e:
-            logger.error(f"Error generating related searches: {str(e)}")
+        except LLM_ERRORS as e:
+            logger.error("Error generating related searches: %s", e)
             raise ValueError(f"Failed to generate related searches: {str(e)}")
@@ -4,27 +4,39 @@ Article summarization module.
 This module provides functionality to summarize news articles using LangChain and OpenAI.
 """
 
+import functools
 import logging
-from typing import List, Dict
-from pydantic import SecretStr
+from typing import TYPE_CHECKING, Any, Iterator, List, Dict, NamedTuple, Optional, Tuple
+from pydantic import SecretStr, ValidationError
 
 from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
-from langchain.chains.summarize import load_summarize_chain
-from langchain.prompts import PromptTemplate
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
 
 from src.config import OpenAIConfig
-from src.models import ArticleContent, ArticleSummary, TopicIdentification
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from src.llm_cache import enable_llm_cache, stream_with_cache
+from src.openai_http import LLM_ERRORS, get_http_client
+from src.models import (
+    AnalysisResponse, ArticleContent, ArticleSummary, TopicIdentification, TopicsResponse
+)
+from src.prompts import (
+    ANALYSIS_TASK, CONCISE_SUMMARY_TASK, DETAILED_SUMMARY_TASK, JSON_OBJECT_FORMAT, TOPICS_TASK,
+    article_messages
 )
+
+if TYPE_CHECKING:
+    from langchain_text_splitters import TokenTextSplitter
+
 logger = logging.getLogger(__name__)
 
 
+class ChatModels(NamedTuple):
+    """The summarizer's chat model and its bindings for the topics and analysis JSON replies."""
+    model: ChatOpenAI
+    topics_model: Runnable
+    analysis_model: Runnable
+
+
 class ArticleSummarizer:
     """
     Summarizes news articles using LangChain and OpenAI.
@@ -33,33 +45,98 @@ class ArticleSummarizer:
     identify topics from article content.
     """
     
+    # Context windows in tokens by model name prefix, most specific first; unknown models
+    # get the smallest window in use, gpt-3.5-turbo's
+    CONTEXT_WINDOWS = (
+        ("gpt-4.1", 1_047_576),
+        ("gpt-4o", 128_000),
+        ("gpt-4-turbo", 128_000),
+        ("gpt-4", 8_192),
+        ("gpt-3.5-turbo", 16_385),
+    )
+    DEFAULT_CONTEXT_WINDOW = 16_385
+    # Tokens kept free for the system prompt, task instructions and message framing
+    PROMPT_OVERHEAD = 1_000
+    # Upper bound on article tokens per detailed-summary call, even for larger windows;
+    # only longer articles are split into chunks, with this overlap between them
+    MAX_CONTEXT_BUDGET = 100_000
+    CHUNK_OVERLAP = 150
+    # Tokenizer used to size the chunks (also used by the OpenAI embedding models)
+    CHUNK_ENCODING = "cl100k_base"
+    # Output cap for the topics JSON, which is far shorter than a summary
+    TOPICS_MAX_TOKENS = 300
+    
     def __init__(self):
         """Initialize the ArticleSummarizer with OpenAI configuration."""
         # Validate OpenAI configuration
-        OpenAIConfig.validate()
+        config = OpenAIConfig.instance()
+        config.validate()
         
-        # Initialize the ChatOpenAI model
-        self.model = ChatOpenAI(
-            model=OpenAIConfig.MODEL,
-            temperature=OpenAIConfig.TEMPERATURE,
-            api_key=SecretStr(OpenAIConfig.API_KEY),
-        )
-        logger.info(f"Initialized ArticleSummarizer with model: {OpenAIConfig.MODEL}")
+        # Answer repeated prompts from the persistent LLM response cache
+        enable_llm_cache()
         
-        # Text splitter for handling long articles
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=2000,
-            chunk_overlap=200,
-            length_function=len,
+        # Initialize the ChatOpenAI models
+        self.model, self.topics_model, self.analysis_model = self._build_models()
+        # Article tokens per detailed-summary call that fit the configured model
+        self.context_budget = self.model_context_budget(config.model, config.max_tokens)
+        logger.info("Initialized ArticleSummarizer with model: %s", config.model)
+        
+    @classmethod
+    def model_context_budget(cls, model: str, max_tokens: int) -> int:
+        """
+        Get the article tokens that fit in one request to a chat model.
+        
+        Args:
+            model: The chat model name (e.g. "gpt-4o-mini")
+            max_tokens: Tokens reserved for the reply
+            
+        Returns:
+            int: Token budget for the article text of one request
+        """
+        window = next(
+            (size for prefix, size in cls.CONTEXT_WINDOWS if model.startswith(prefix)),
+            cls.DEFAULT_CONTEXT_WINDOW,
         )
+        return min(cls.MAX_CONTEXT_BUDGET, window - max_tokens - cls.PROMPT_OVERHEAD)
+    
+    def _build_models(self, http_async_client: Optional[Any] = None) -> ChatModels:
+        """
+        Build the chat model and its topics and analysis bindings.
         
-    def summarize(self, article: ArticleContent, summary_type: str = "concise") -> ArticleSummary:
+        Args:
+            http_async_client: Async HTTP client for the model's async calls, or None for the default
+            
+        Returns:
+            ChatModels: The plain chat model and its JSON-reply bindings
+        """
+        config = OpenAIConfig.instance()
+        model = ChatOpenAI(
+            model=config.model,
+            temperature=config.temperature,
+            # Reason: response time grows with output length, so never let a reply run past the configured cap
+            max_tokens=config.max_tokens,
+            api_key=SecretStr(config.api_key),
+            # Share one pooled keep-alive (HTTP/2 if available) transport with the other models
+            http_client=get_http_client(),
+            http_async_client=http_async_client,
+        )
+        # Same model forced to reply with a JSON object (OpenAI JSON mode), used for topics and analysis
+        return ChatModels(
+            model,
+            model.bind(response_format=JSON_OBJECT_FORMAT, max_tokens=self.TOPICS_MAX_TOKENS),
+            model.bind(response_format=JSON_OBJECT_FORMAT),
+        )
+    
+    def summarize(
+        self, article: ArticleContent, summary_type: str = "concise", prompt_text: Optional[str] = None
+    ) -> ArticleSummary:
         """
         Generate a summary of the article content.
         
         Args:
             article: The article content to summarize
             summary_type: The type of summary to generate (concise or detailed)
+            prompt_text: The article's `prompt_text`, if the caller already built it for a paired request
             
         Returns:
             ArticleSummary: Contains the original article and its summary
@@ -68,41 +145,69 @@ class ArticleSummarizer:
             ValueError: If summarization fails
         """
         try:
-            logger.info(f"Generating {summary_type} summary for article: {article.title}")
-            
-            # Combine title and text for context
-            full_text = f"Title: {article.title}\n\n{article.text}"
-            
-            # Split text for long articles
-            docs = self.text_splitter.create_documents([full_text])
+            logger.info("Generating %s summary for article: %s", summary_type, article.title)
             
-            # Create summarization chain based on summary type
             if summary_type == "detailed":
-                chain = self._create_detailed_chain()
+                # Map: summarize all chunks concurrently, then combine once
+                partials = self.model.batch(self._map_messages(article, prompt_text))
+                summary = self._message_text(partials[0])
+                if len(partials) > 1:
+                    summary = self._message_text(self.model.invoke(self._combine_messages(partials)))
             else:  # Default to concise
-                chain = self._create_concise_chain()
+                messages = article_messages(prompt_text or article.prompt_text, CONCISE_SUMMARY_TASK)
+                summary = self._message_text(self.model.invoke(messages))
+            
+            return self.build_summary(article, summary, summary_type)
+            
+        except LLM_ERRORS as e:
+            logger.error("Error summarizing article: %s", e)
+            raise ValueError(f"Failed to summarize article: {str(e)}")
+    
+    def stream_summary(
+        self, article: ArticleContent, summary_type: str = "concise", prompt_text: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate a summary of the article content, yielding the text as it arrives.
+        
+        A summary already in the LLM response cache is yielded in one piece.
+        
+        Args:
+            article: The article content to summarize
+            summary_type: The type of summary to generate (concise or detailed)
+            prompt_text: The article's `prompt_text`, if the caller already built it for a paired request
             
-            # Run the chain
-            summary = chain.run(docs)
+        Yields:
+            str: Consecutive pieces of the summary text
             
-            logger.info(f"Successfully generated {summary_type} summary")
-            article_id = str(hash(f"{article.url}-{article.title}"))
+        Raises:
+            ValueError: If summarization fails
+        """
+        try:
+            logger.info("Streaming %s summary for article: %s", summary_type, article.title)
             
-            return ArticleSummary(
-                article_id=article_id,
-                summary=summary,
-                summary_type=summary_type
-            )
+            if summary_type == "detailed":
+                # Map step as in `summarize`; only the final text is streamed
+                partials = self.model.batch(self._map_messages(article, prompt_text))
+                if len(partials) == 1:
+                    yield self._message_text(partials[0])
+                    return
+                messages = self._combine_messages(partials)
+            else:  # Default to concise
+                messages = article_messages(prompt_text or article.prompt_text, CONCISE_SUMMARY_TASK)
+            
+            yield from stream_with_cache(self.model, messages)
             
-        except Exception as e:
-            logger.error(f"Error summarizing article: {str(e)}")
+        except LLM_ERRORS as e:
+            logger.error("Error streaming summary: %s", e)
             raise ValueError(f"Failed to summarize article: {str(e)}")
-    def identify_topics(self, article: ArticleContent) -> TopicIdentification:
+    
+    def identify_topics(self, article: ArticleContent, prompt_text: Optional[str] = None) -> TopicIdentification:
         """
         Identify main topics and keywords from article content.
         
         Args:
             article: The article content to analyze
+            prompt_text: The article's `prompt_text`, if the caller already built it for a paired request
             
         Returns:
             TopicIdentification: Contains identified topics and keywords
@@ -111,169 +216,205 @@ class ArticleSummarizer:
             ValueError: If topic identification fails
         """
         try:
-            logger.info(f"Identifying topics for article: {article.title}")
-            
-            # Combine title and text for context
-            full_text = f"Title: {article.title}\n\n{article.text}"
-            
-            # Create messages for the chat model
-            messages = [
-                SystemMessage(content=(
-                    "You are an expert at analyzing news articles and identifying main topics and keywords. "
-                    "Identify the 3-5 main topics and 5-10 relevant keywords from the article. "
-                    "Also identify a single overall classification for the article (e.g., 'politics', 'technology', 'sports', 'health', etc.). "
-                    "Always return only a JSON with three keys: 'classification', 'topics', and 'keywords'. "
-                    "The 'classification' should be a single string, and 'topics' and 'keywords' should be lists. "
-                    "Add the classification as the first element in both the topics and keywords lists. "
-                    "Example format: {'classification': 'gaming', 'topics': ['gaming', 'fortnite leaks', 'fortnite gameplay'], 'keywords': ['gaming', 'battle royale', 'skins', 'update']}. "
-                    "If no topics or keywords are found, include just the classification in the lists."
-                )),
-                HumanMessage(content=full_text)
-            ]
-            
-            # Get response from model
-            response = self.model.invoke(messages)
-            
-            # Process response to extract topics and keywords
-            result = self._parse_topics_response(str(response.content))
-            
-            logger.info(f"Successfully identified topics and keywords")
-            article_id = str(hash(f"{article.url}-{article.title}"))
-            return TopicIdentification(
-                article_id=article_id,
-                topics=result["topics"],
-                keywords=result["keywords"]
-            )
-            
-        except Exception as e:
-            logger.error(f"Error identifying topics: {str(e)}")
+            logger.info("Identifying topics for article: %s", article.title)
+            
+            # Get the JSON object from the model
+            messages = article_messages(prompt_text or article.prompt_text, TOPICS_TASK)
+            response = self.topics_model.invoke(messages)
+            
+            return self._build_topics(article, self._parse_topics_response(self._message_text(response)))
+            
+        except LLM_ERRORS as e:
+            logger.error("Error identifying topics: %s", e)
             raise ValueError(f"Failed to identify topics: {str(e)}")
+    
+    def analyze(self, article: ArticleContent) -> Tuple[ArticleSummary, TopicIdentification]:
+        """
+        Generate a concise summary and identify topics with a single LLM call.
+        
+        Args:
+            article: The article content to analyze
+            
+        Returns:
+            Tuple of the concise ArticleSummary and the TopicIdentification
+            
+        Raises:
+            ValueError: If the analysis fails
+        """
+        try:
+            logger.info("Analyzing article: %s", article.title)
             
-    def _create_concise_chain(self):
-        """Create a chain for generating concise summaries."""
-        prompt_template = """
-        Write a concise summary of the following article in no more than 3-4 sentences.
-        First, identify a single main classification category for the article (e.g., politics, technology, sports, health).
-        Begin your summary with "Classification: <category> - " followed by your summary text.
+            # One request returns the summary, topics and keywords as JSON
+            response = self.analysis_model.invoke(article_messages(article.prompt_text, ANALYSIS_TASK))
+            
+            return self.parse_analysis(article, self._message_text(response))
+            
+        except LLM_ERRORS as e:
+            logger.error("Error analyzing article: %s", e)
+            raise ValueError(f"Failed to analyze article: {str(e)}")
+    
+    @functools.cached_property
+    def text_splitter(self) -> "TokenTextSplitter":
+        """Token-based text splitter for long articles, created the first time one is summarized."""
+        # Reason: imported here because almost every article fits in one call and never needs it
+        from langchain_text_splitters import TokenTextSplitter
         
-        {text}
+        # Reason: one tiktoken (Rust BPE) pass sizes chunks to the model's token budget exactly
+        return TokenTextSplitter(
+            encoding_name=self.CHUNK_ENCODING,
+            chunk_size=self.context_budget,
+            chunk_overlap=self.CHUNK_OVERLAP,
+        )
+    
+    def _map_messages(self, article: ArticleContent, prompt_text: Optional[str] = None) -> List[List[BaseMessage]]:
+        """
+        Build the detailed-summary prompts, one per chunk for articles over the context budget.
         
-        CONCISE SUMMARY:
+        Args:
+            article: The article content to summarize
+            prompt_text: The article's `prompt_text`, if the caller already built it
+            
+        Returns:
+            One list of messages per chunk, in article order
+        """
+        full_text = prompt_text or article.prompt_text
+        # Reason: every token covers at least one UTF-8 byte, so a text of at most context_budget
+        # bytes fits in one call and needs neither the tokenizer nor a combine call
+        if len(full_text.encode("utf-8")) <= self.context_budget:
+            chunks = [full_text]
+        else:
+            chunks = self.text_splitter.split_text(full_text)
+        return [article_messages(chunk, DETAILED_SUMMARY_TASK) for chunk in chunks]
+    
+    def build_summary(self, article: ArticleContent, summary: str, summary_type: str) -> ArticleSummary:
         """
-        prompt = PromptTemplate.from_template(prompt_template)
-        return load_summarize_chain(self.model, chain_type="stuff", prompt=prompt)
-    def _create_detailed_chain(self):
-        """Create a chain for generating detailed summaries."""
-        prompt_template = """
-        Write a comprehensive summary of the following article. Include the main points, key details, and conclusions.
-        Include the article's main classification (e.g., politics, technology, sports, health) at the beginning of the summary in the format "Classification: <category> - <summary text>":
+        Wrap generated summary text (e.g. collected from `stream_summary`) in an ArticleSummary.
         
-        {text}
+        Args:
+            article: The summarized article
+            summary: The generated summary text
+            summary_type: The type of summary that was generated
+            
+        Returns:
+            ArticleSummary: The summary model
+        """
+        logger.info("Successfully generated %s summary", summary_type)
+        return ArticleSummary(
+            article_id=article.article_id,
+            summary=summary,
+            summary_type=summary_type
+        )
+    
+    def _build_topics(self, article: ArticleContent, result: Dict[str, List[str]]) -> TopicIdentification:
+        """
+        Wrap parsed topics and keywords in a TopicIdentification.
         
-        DETAILED SUMMARY:
+        Args:
+            article: The analyzed article
+            result: Dict containing topics and keywords lists
+            
+        Returns:
+            TopicIdentification: Contains identified topics and keywords
         """
-        prompt = PromptTemplate.from_template(prompt_template)
-        return load_summarize_chain(self.model, chain_type="map_reduce", map_prompt=prompt, combine_prompt=prompt)
+        logger.info("Successfully identified topics and keywords")
+        return TopicIdentification(
+            article_id=article.article_id,
+            topics=result["topics"],
+            keywords=result["keywords"]
+        )
     
-    def _parse_topics_response(self, response_content: str) -> Dict[str, List[str]]:
+    def parse_analysis(
+        self, article: ArticleContent, response_content: str
+    ) -> Tuple[ArticleSummary, TopicIdentification]:
         """
-        Parse the response from the model to extract topics and keywords.
+        Parse a JSON analysis reply (from `analyze` or a Batch API result) into a summary and topics.
         
         Args:
-            response_content: The content returned by the model
+            article: The analyzed article
+            response_content: The JSON object returned by the model
             
         Returns:
-            Dict containing topics and keywords lists
+            Tuple of the concise ArticleSummary and the TopicIdentification
+            
+        Raises:
+            ValueError: If the response does not match AnalysisResponse or has an empty summary
         """
-        import json
-        import re
+        # Reason: JSON mode guarantees a JSON object but not its keys, so validate them;
+        # pydantic's ValidationError is a ValueError
+        result = AnalysisResponse.model_validate_json(response_content)
+        summary_text = result.summary.strip()
+        if not summary_text:
+            raise ValueError("Response did not contain a summary")
         
-        # Try to extract JSON from the response
-        try:
-            # Check for JSON block in markdown
-            match = re.search(r"```json\s*(.*?)\s*```", response_content, re.DOTALL)
-            if match:
-                json_str = match.group(1)
-            else:
-                # Try to find any JSON-like structure
-                match = re.search(r"\{.*\}", response_content, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                else:
-                    json_str = response_content
-              # Parse the JSON
-            result = json.loads(json_str)
-            
-            # Ensure expected keys are present
-            classification = result.get("classification", "general")
-            
-            if "topics" not in result or "keywords" not in result:
-                logger.warning("Response did not contain expected keys")
-                result = {
-                    "topics": [classification, "General News"],
-                    "keywords": [classification, "news", "article"]
-                }
-            else:
-                # Add classification as first element if it's not already there
-                topics = result.get("topics", [])
-                if not topics or topics[0] != classification:
-                    topics.insert(0, classification)
-                
-                keywords = result.get("keywords", [])
-                if not keywords or keywords[0] != classification:
-                    keywords.insert(0, classification)
-                    
-                result["topics"] = topics
-                result["keywords"] = keywords
-            
-            return result
-            
-        except (json.JSONDecodeError, AttributeError) as e:
-            logger.warning(f"Failed to parse JSON from response: {str(e)}")
-            # Fallback to simple parsing
-            lines = response_content.strip().split('\n')
-            topics = []
-            keywords = []
-            
-            current_list = None
-            for line in lines:
-                line = line.strip()
-                if "topic" in line.lower():
-                    current_list = topics
-                    line = re.sub(r".*topics?:?", "", line, flags=re.IGNORECASE).strip()
-                elif "keyword" in line.lower():
-                    current_list = keywords
-                    line = re.sub(r".*keywords?:?", "", line, flags=re.IGNORECASE).strip()
-                
-                if current_list is not None and line and not line.startswith(("topic", "keyword")):                    # Extract words or phrases
-                    items = re.findall(r'"([^"]+)"|([^,;\s]+(?:\s+[^,;]+)*)', line)
-                    for item in items:
-                        item_text = item[0] if item[0] else item[1]
-                        if item_text and len(item_text) > 1:
-                            current_list.append(item_text.strip())# Determine overall classification from topics or keywords
-            classification = "general"
-            
-            # See if we can extract classification from the text
-            classification_match = re.search(r"classification[:\s]+([a-zA-Z]+)", response_content, re.IGNORECASE)
-            if classification_match:
-                classification = classification_match.group(1).lower()
-            
-            # Ensure we have at least something in each category
-            if not topics:
-                topics = [classification, "General News"]
-            elif topics[0] != classification:
-                topics.insert(0, classification)
-                
-            if not keywords:
-                keywords = [classification, "news", "article"]
-            elif keywords[0] != classification:
-                keywords.insert(0, classification)
-                
-            # Limit to reasonable number of items
-            topics = topics[:6]  # Classification + 5 topics max
-            keywords = keywords[:11]  # Classification + 10 keywords max
+        topics = self._normalize_topics(result.model_dump())
+        # Keep the "Classification: <category> - " prefix produced by the summary chains
+        summary_text = f"Classification: {topics['topics'][0]} - {summary_text}"
+        
+        return self.build_summary(article, summary_text, "concise"), self._build_topics(article, topics)
+            
+    def _combine_messages(self, partials: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        Build the combine prompt from the per-chunk summaries.
+        
+        Args:
+            partials: Model responses for each chunk, in article order
             
+        Returns:
+            List of system and human messages
+        """
+        partial_text = "\n\n".join(self._message_text(partial) for partial in partials)
+        return article_messages(partial_text, DETAILED_SUMMARY_TASK)
+    
+    @staticmethod
+    def _message_text(message: BaseMessage) -> str:
+        """Return the text content of a model response."""
+        return str(message.content)
+    
+    def _normalize_topics(self, result: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Ensure parsed topics and keywords lists start with the classification.
+        
+        Args:
+            result: Parsed JSON object from the model
+            
+        Returns:
+            Dict containing topics and keywords lists
+        """
+        # Ensure expected keys are present
+        classification = result.get("classification", "general")
+        
+        if not isinstance(result.get("topics"), list) or not isinstance(result.get("keywords"), list):
+            logger.warning("Response did not contain expected keys")
             return {
-                "topics": topics,
-                "keywords": keywords
+                "topics": [classification, "General News"],
+                "keywords": [classification, "news", "article"]
             }
+        
+        # Add classification as first element if it's not already there
+        topics = result.get("topics", [])
+        if not topics or topics[0] != classification:
+            topics.insert(0, classification)
+        
+        keywords = result.get("keywords", [])
+        if not keywords or keywords[0] != classification:
+            keywords.insert(0, classification)
+            
+        result["topics"] = topics
+        result["keywords"] = keywords
+        return result
+    
+    def _parse_topics_response(self, response_content: str) -> Dict[str, List[str]]:
+        """
+        Parse the JSON response from the model to extract topics and keywords.
+        
+        Args:
+            response_content: The JSON object returned by the model
+            
+        Returns:
+            Dict containing topics and keywords lists (the defaults if the response does not match TopicsResponse)
+        """
+        try:
+            return self._normalize_topics(TopicsResponse.model_validate_json(response_content).model_dump())
+        except ValidationError as e:
+            logger.warning("Failed to parse topics from response: %s", e)
+            return self._normalize_topics({})
@@ -0,0 +1,37 @@
+"""
+Text helpers shared by the article parsing backends.
+"""
+
+from typing import Iterable, Optional
+
+# Default number of article characters kept by the extractor
+DEFAULT_MAX_CHARS = 8000
+
+PARAGRAPH_SEPARATOR = '\n\n'
+
+
+def join_paragraphs(paragraphs: Iterable[str], max_chars: Optional[int] = DEFAULT_MAX_CHARS) -> str:
+    """
+    Join paragraph texts, stopping once the character budget is used up.
+
+    The paragraphs are consumed lazily, so paragraphs past the budget are
+    never extracted from the document.
+
+    Args:
+        paragraphs: Paragraph texts in document order
+        max_chars: Maximum length of the result, or None for no limit
+
+    Returns:
+        str: The joined paragraphs, cut at `max_chars`
+    """
+    if max_chars is None:
+        return PARAGRAPH_SEPARATOR.join(paragraphs)
+
+    parts = []
+    length = 0
+    for paragraph in paragraphs:
+        parts.append(paragraph)
+        length += len(paragraph) + len(PARAGRAPH_SEPARATOR)
+        if length >= max_chars:
+            break
+    return PARAGRAPH_SEPARATOR.join(parts)[:max_chars]
@@ -6,27 +6,37 @@ using Streamlit, allowing users to input URLs, display article summaries and top
 and perform semantic searches.
 """
 
+import html
+import math
+import re
 import streamlit as st
 import logging
-from urllib.parse import urlparse
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+from pydantic import HttpUrl, ValidationError
 
 from src.extractor import ArticleExtractor
 from src.summarizer import ArticleSummarizer
+from src.batch_summarizer import BatchSummarizer
 from src.database import DatabaseService
 from src.search import SemanticSearch
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Number of articles shown per page of the article list
+ARTICLES_PER_PAGE = 20
+# Seconds a fetched page of the article list is reused across reruns
+ARTICLE_LIST_TTL = 30
+# An http(s) scheme followed by a host - the only URLs the extractor can fetch
+_URL_RE = re.compile(r"https?://[^/\s]+", re.IGNORECASE)
+
 
 def validate_url(url: str) -> bool:
     """
-    Validate if a string is a properly formatted URL.
+    Validate if a string is a properly formatted http(s) URL.
+    
+    Accepts exactly the URLs the article model's `HttpUrl` field accepts, so a
+    URL that passes here is never rejected later while processing it.
     
     Args:
         url: URL string to validate
@@ -34,11 +44,38 @@ def validate_url(url: str) -> bool:
     Returns:
         bool: True if valid URL, False otherwise
     """
+    # Reason: the regex cheaply rejects most invalid input before the full pydantic validation
+    if not isinstance(url, str) or _URL_RE.match(url) is None:
+        return False
     try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
+        HttpUrl(url)
+    except ValidationError:
         return False
+    return True
+
+
+@st.cache_resource
+def get_db_service() -> DatabaseService:
+    """Get the DatabaseService shared by all sessions, created once per server process."""
+    return DatabaseService()
+
+
+@st.cache_data(ttl=ARTICLE_LIST_TTL)
+def cached_article_count(_db_service: DatabaseService) -> int:
+    """Count the stored articles, reusing the count across reruns."""
+    return _db_service.count_articles()
+
+
+@st.cache_data(ttl=ARTICLE_LIST_TTL)
+def cached_article_page(_db_service: DatabaseService, offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Fetch one page of stored articles, reusing it across reruns."""
+    return _db_service.list_articles(limit=limit, offset=offset)
+
+
+def clear_article_cache() -> None:
+    """Drop the cached article list after articles are stored."""
+    cached_article_count.clear()
+    cached_article_page.clear()
 
 
 def init_session_state():
@@ -53,10 +90,17 @@ def init_session_state():
         st.session_state.related_searches = []
         
     if "db_service" not in st.session_state:
-        st.session_state.db_service = DatabaseService()
+        # Reason: one Chroma client and embedding cache for all sessions instead of one per browser tab
+        st.session_state.db_service = get_db_service()
     
     if "search_service" not in st.session_state:
-        st.session_state.search_service = SemanticSearch()
+        st.session_state.search_service = SemanticSearch(st.session_state.db_service)
+    
+    if "summarizer" not in st.session_state:
+        st.session_state.summarizer = ArticleSummarizer()
+    
+    if "batch_summarizer" not in st.session_state:
+        st.session_state.batch_summarizer = BatchSummarizer(st.session_state.summarizer)
 
 
 def display_article_card(article: Dict[str, Any]):
@@ -94,6 +138,31 @@ def display_article_card(article: Dict[str, Any]):
         st.divider()
 
 
+def render_article_card(article: Dict[str, Any]) -> str:
+    """
+    Render an article as a static HTML card for the article list.
+    
+    Args:
+        article: Article data dictionary
+        
+    Returns:
+        str: HTML for the card, with all article fields escaped
+    """
+    # Reason: titles and summaries come from scraped pages and the LLM, so never emit them unescaped
+    title = html.escape(article.get('title') or 'Untitled Article')
+    summary = html.escape(article.get('summary') or 'No summary available')
+    parts = [f"<h3>{title}</h3>", f"<p><strong>Summary:</strong> {summary}</p>"]
+    
+    if article.get('url'):
+        parts.append(f'<p><a href="{html.escape(article["url"])}" target="_blank">Read original article</a></p>')
+    if article.get('topics'):
+        parts.append(f"<p><strong>Topics:</strong> {html.escape(', '.join(article['topics']))}</p>")
+    if article.get('keywords'):
+        parts.append(f"<p><strong>Keywords:</strong> <em>{html.escape(', '.join(article['keywords'][:5]))}</em></p>")
+    
+    return "<div>" + "".join(parts) + "</div><hr>"
+
+
 def process_article_url(url: str) -> bool:
     """
     Process an article URL: extract content, generate summary, and store in database.
@@ -102,25 +171,38 @@ def process_article_url(url: str) -> bool:
         url: The URL of the article to process
         
     Returns:
-        bool: True if processing was successful, False otherwise
+        bool: True if the article was processed and stored, False if it failed or was already processed
     """
     try:
+        # Skip known URLs before fetching the page or calling the LLM
+        # Reason: records store the URL normalized by pydantic, so look it up in the same form
+        if url in st.session_state.processed_urls or st.session_state.db_service.url_exists(str(HttpUrl(url))):
+            st.info("This article has already been processed.")
+            return False
+        
         with st.spinner("Processing article..."):
             # Initialize components
             extractor = ArticleExtractor()
-            summarizer = ArticleSummarizer()
+            summarizer = st.session_state.summarizer
             
             # Extract article content
             article = extractor.extract(url)
             
-            # Generate summary
-            summary = summarizer.summarize(article)
-            
-            # Identify topics
-            topics = summarizer.identify_topics(article)
+            # Identify topics in the background while the summary streams to the page
+            # Both requests send the same article text, so build it once
+            prompt_text = article.prompt_text
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                topics_future = executor.submit(summarizer.identify_topics, article, prompt_text)
+                
+                st.markdown(f"**{article.title}**")
+                summary_text = st.write_stream(summarizer.stream_summary(article, prompt_text=prompt_text))
+                summary = summarizer.build_summary(article, summary_text, "concise")
+                
+                topics = topics_future.result()
             
             # Store article in database
             doc_id = st.session_state.db_service.store_article(article, summary, topics)
+            clear_article_cache()
             
             # Add URL to processed list
             if url not in st.session_state.processed_urls:
@@ -130,29 +212,76 @@ def process_article_url(url: str) -> bool:
     
     except Exception as e:
         st.error(f"Error processing article: {str(e)}")
-        logger.error(f"Error processing article {url}: {str(e)}")
+        logger.error("Error processing article %s: %s", url, e)
+        return False
+
+
+def submit_article_batch(url: str) -> bool:
+    """
+    Extract an article and submit it to the OpenAI Batch API for offline analysis.
+    
+    Args:
+        url: The URL of the article to process
+        
+    Returns:
+        bool: True if the batch was submitted, False otherwise
+    """
+    try:
+        if url in st.session_state.processed_urls or st.session_state.db_service.url_exists(str(HttpUrl(url))):
+            st.info("This article has already been processed.")
+            return False
+        
+        with st.spinner("Submitting batch..."):
+            article = ArticleExtractor().extract(url)
+            batch_id = st.session_state.batch_summarizer.submit_batch([article])
+        
+        st.info(f"Submitted batch {batch_id}; the article is stored once the batch is collected.")
+        return True
+    
+    except Exception as e:
+        st.error(f"Error submitting batch: {str(e)}")
+        logger.error("Error submitting batch for %s: %s", url, e)
         return False
 
 
+def collect_article_batches() -> None:
+    """Store the results of every finished batch and report the batches still running."""
+    batch_summarizer = st.session_state.batch_summarizer
+    for batch_id in batch_summarizer.pending_batches():
+        try:
+            doc_ids = batch_summarizer.collect_batch(batch_id, st.session_state.db_service)
+            if doc_ids is None:
+                st.info(f"Batch {batch_id} is still running.")
+            else:
+                clear_article_cache()
+                st.success(f"Batch {batch_id}: stored {len(doc_ids)} articles.")
+        except ValueError as e:
+            st.error(f"Error collecting batch {batch_id}: {str(e)}")
+
+
 def display_all_articles():
-    """Display all articles stored in the database."""
+    """Display the articles stored in the database, one page at a time."""
     try:
-        # Get all articles
-        articles = st.session_state.db_service.list_articles()
+        # Reason: every widget interaction reruns the script, so reuse recently fetched pages
+        db_service = st.session_state.db_service
+        total = cached_article_count(db_service)
         
-        if not articles:
+        if not total:
             st.info("No articles found in the database. Add some articles first!")
             return
         
-        st.subheader(f"All Articles ({len(articles)})")
+        st.subheader(f"All Articles ({total})")
         
-        # Display each article
-        for article in articles:
-            display_article_card(article)
+        pages = math.ceil(total / ARTICLES_PER_PAGE)
+        page = int(st.number_input("Page", min_value=1, max_value=pages, value=1, step=1))
+        articles = cached_article_page(db_service, (page - 1) * ARTICLES_PER_PAGE, ARTICLES_PER_PAGE)
+        
+        # Reason: one markdown element per page instead of a dozen widgets per article keeps reruns cheap
+        st.markdown("\n".join(render_article_card(article) for article in articles), unsafe_allow_html=True)
             
     except Exception as e:
         st.error(f"Error retrieving articles: {str(e)}")
-        logger.error(f"Error retrieving articles: {str(e)}")
+        logger.error("Error retrieving articles: %s", e)
 
 
 def search_articles(query: str, expand_query: bool = True):
@@ -175,7 +304,7 @@ def search_articles(query: str, expand_query: bool = True):
     
     except Exception as e:
         st.error(f"Search error: {str(e)}")
-        logger.error(f"Search error: {str(e)}")
+        logger.error("Search error: %s", e)
 
 
 def main():
@@ -207,16 +336,27 @@ def main():
         # URL input form
         with st.form("url_form"):
             url = st.text_input("Enter a news article URL")
+            offline = st.checkbox("Offline batch", help="Analyze with the OpenAI Batch API: half the "
+                                  "token price, results within 24 hours")
             submitted = st.form_submit_button("Process Article")
             
             if submitted:
                 if not validate_url(url):
                     st.error("Please enter a valid URL")
+                elif offline:
+                    submit_article_batch(url)
                 else:
                     success = process_article_url(url)
                     if success:
                         st.success("Article processed and stored successfully!")
         
+        # Batches submitted for offline analysis
+        pending = st.session_state.batch_summarizer.pending_batches()
+        if pending:
+            st.subheader(f"Pending Batches ({len(pending)})")
+            if st.button("Collect finished batches"):
+                collect_article_batches()
+        
         # Recently processed URLs
         if st.session_state.processed_urls:
             st.subheader("Recently Processed URLs")
@@ -0,0 +1,99 @@
+"""
+Test doubles for the database layer.
+
+This module provides small fakes for a ChromaDB collection and an embeddings
+model. Unlike MagicMock they expose only the methods the real objects have,
+so a call to a misspelled or removed method fails the test instead of
+returning another mock.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.database import DatabaseService
+
+
+class FakeCollection:
+    """
+    Stand-in for a ChromaDB collection with only the methods the service uses.
+
+    Calls are recorded per method as lists of keyword arguments.
+    """
+
+    def __init__(
+        self,
+        metadata: Optional[Dict[str, Any]] = None,
+        get_ret: Any = None,
+        query_ret: Optional[Dict[str, Any]] = None,
+        delete_error: Optional[Exception] = None,
+        add_error: Optional[Exception] = None
+    ):
+        """
+        Args:
+            metadata: Collection metadata (defaults to the current embedding model's)
+            get_ret: Result of `get`, or a list of results returned in turn
+            query_ret: Result of `query`
+            delete_error: Exception raised by `delete`
+            add_error: Exception raised by `add`
+        """
+        self.metadata = DatabaseService.collection_metadata() if metadata is None else metadata
+        self.get_ret = get_ret
+        self.query_ret = query_ret
+        self.delete_error = delete_error
+        self.add_error = add_error
+        self.calls: Dict[str, List[Dict[str, Any]]] = {
+            "add": [], "get": [], "query": [], "delete": [], "modify": []
+        }
+
+    def add(self, **kwargs: Any) -> None:
+        self.calls["add"].append(kwargs)
+        if self.add_error is not None:
+            raise self.add_error
+
+    def get(self, **kwargs: Any) -> Any:
+        self.calls["get"].append(kwargs)
+        return self.get_ret.pop(0) if isinstance(self.get_ret, list) else self.get_ret
+
+    def query(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        self.calls["query"].append(kwargs)
+        return self.query_ret
+
+    def delete(self, **kwargs: Any) -> None:
+        self.calls["delete"].append(kwargs)
+        if self.delete_error is not None:
+            raise self.delete_error
+
+    def modify(self, **kwargs: Any) -> None:
+        self.calls["modify"].append(kwargs)
+
+    def count(self) -> int:
+        return 0
+
+
+class FakeEmbeddings(Embeddings):
+    """Embeddings model returning fixed vectors and recording the embedded texts."""
+
+    def __init__(self, vectors: Optional[List[List[float]]] = None, error: Optional[Exception] = None):
+        """
+        Args:
+            vectors: Vectors returned in order for the texts of each call
+            error: Exception raised by every call
+        """
+        self.vectors = vectors or [[0.1, 0.2, 0.3]]
+        self.error = error
+        self.queries: List[str] = []
+        self.documents: List[List[str]] = []
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.error is not None:
+            raise self.error
+        self.queries.append(text)
+        return self.vectors[0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.error is not None:
+            raise self.error
+        self.documents.append(list(texts))
+        return self.vectors[:len(texts)]
+
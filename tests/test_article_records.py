@@ -0,0 +1,79 @@
+"""
+Unit tests for the article records module.
+
+This module contains tests for building stored metadata and formatting it
+back into article dictionaries, including records in the legacy format.
+"""
+
+import json
+
+import pytest
+from pydantic import HttpUrl
+
+from src.article_records import (
+    build_embedding_text, build_metadata, format_article, TOPICS_KEY, KEYWORDS_KEY
+)
+from src.models import ArticleContent, ArticleSummary, TopicIdentification
+
+
+class TestArticleRecords:
+    """Test cases for the article record helpers."""
+
+    @pytest.fixture
+    def record(self):
+        """Sample (article, summary, topics) tuple."""
+        article = ArticleContent(
+            url=HttpUrl("https://example.com/test-article"),
+            title="Test Article",
+            text="This is a test article content." * 100,
+            metadata={}
+        )
+        summary = ArticleSummary(article_id="1", summary="A test summary.", summary_type="concise")
+        topics = TopicIdentification(
+            article_id="1",
+            topics=["Technology", "Science, Research"],
+            keywords=["test", "article"]
+        )
+        return article, summary, topics
+
+    def test_build_metadata_encodes_lists_as_json(self, record):
+        """Test that topics and keywords are stored as JSON lists."""
+        metadata = build_metadata(*record)
+
+        assert json.loads(metadata[TOPICS_KEY]) == ["Technology", "Science, Research"]
+        assert json.loads(metadata[KEYWORDS_KEY]) == ["test", "article"]
+        assert len(metadata["text"]) == 1000
+        assert metadata["article_id"] == "1"
+        assert all(isinstance(value, str) for value in metadata.values())
+
+    def test_build_embedding_text(self, record):
+        """Test that the embedding text combines title, summary, topics and keywords."""
+        text = build_embedding_text(*record)
+
+        assert text.startswith("Title: Test Article\nSummary: A test summary.")
+        assert "Keywords: test, article" in text
+
+    def test_format_round_trip(self, record):
+        """Test that formatting stored metadata restores the original lists."""
+        article = format_article("doc-1", build_metadata(*record))
+
+        assert article["id"] == "doc-1"
+        assert article["url"] == "https://example.com/test-article"
+        assert article["topics"] == ["Technology", "Science, Research"]
+        assert article["keywords"] == ["test", "article"]
+        assert "relevance_score" not in article
+
+    def test_format_legacy_record(self):
+        """Test that comma-separated metadata from older records is still read."""
+        article = format_article("doc-1", {"title": "Old", "topics": "Tech, AI"})
+
+        assert article["topics"] == ["Tech", "AI"]
+        assert article["keywords"] == []
+
+    @pytest.mark.parametrize("distance, expected", [(0.25, 0.75), (None, None)])
+    def test_format_with_score(self, distance, expected):
+        """Test the relevance score derived from the cosine distance."""
+        article = format_article("doc-1", None, distance, with_score=True)
+
+        assert article["relevance_score"] == expected
+        assert article["title"] == ""
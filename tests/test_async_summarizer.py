@@ -0,0 +1,211 @@
+"""
+Unit tests for the async summarizer module.
+
+This module contains tests for the asyncio summary, topic and analysis requests.
+"""
+
+import asyncio
+import httpx
+import openai
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock, PropertyMock
+from pydantic import HttpUrl
+
+from src.async_summarizer import AsyncArticleSummarizer
+from src.models import ArticleContent, ArticleSummary, TopicIdentification
+
+# Error raised by the OpenAI client when the API cannot be reached
+API_ERROR = openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+async def in_session(summarizer, call):
+    """Await a summarizer call inside `async with summarizer`, as callers do."""
+    async with summarizer:
+        return await call
+
+
+@pytest.fixture(scope="module")
+def sample_article():
+    """Fixture providing a sample article, validated once for the module (tests only copy it)."""
+    return ArticleContent(
+        url=HttpUrl("https://www.example.com/news/article"),
+        title="Test Article Title",
+        text="This is a test article content. It contains information about various topics "
+             "such as technology, science, and politics. The article discusses recent "
+             "advancements in AI technology and its implications for society.",
+        metadata={"author": "Test Author", "published_date": "2025-05-05"}
+    )
+
+
+class TestAsyncArticleSummarizer:
+    """Test cases for the AsyncArticleSummarizer class."""
+
+    @pytest.fixture(autouse=True)
+    def no_llm_cache(self):
+        """Keep the persistent LLM cache out of the tests."""
+        with patch('src.summarizer.enable_llm_cache'):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def mock_chat(self):
+        """Replace the chat model class, so no test can build a real OpenAI client."""
+        with patch('src.summarizer.ChatOpenAI') as mock_chat:
+            yield mock_chat
+
+    @pytest.fixture
+    def mock_openai_env(self, monkeypatch):
+        """Fixture to mock OpenAI environment variables."""
+        monkeypatch.setenv("OPENAI_API_KEY", "test_api_key")
+        monkeypatch.setenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        monkeypatch.setenv("OPENAI_TEMPERATURE", "0.5")
+        monkeypatch.setenv("OPENAI_MAX_TOKENS", "300")
+
+    def test_asummarize_detailed(self, mock_chat, sample_article, mock_openai_env):
+        """Test the async detailed summary runs the map step with abatch."""
+        long_article = sample_article.model_copy(update={"text": "Paragraph about AI. " * 6000})
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.abatch = AsyncMock(side_effect=lambda prompts: [
+            MagicMock(content=f"Part {i}") for i in range(len(prompts))
+        ])
+        mock_chat_instance.ainvoke = AsyncMock(return_value=MagicMock(content="Combined summary."))
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        summarizer.text_splitter = MagicMock()
+        summarizer.text_splitter.split_text.return_value = ["Chunk 1", "Chunk 2"]
+        result = asyncio.run(in_session(summarizer, summarizer.asummarize(long_article, summary_type="detailed")))
+        
+        assert result.summary == "Combined summary."
+        mock_chat_instance.abatch.assert_awaited_once()
+        mock_chat_instance.ainvoke.assert_awaited_once()
+        
+    def test_session_closes_http_client(self, mock_chat, sample_article, mock_openai_env):
+        """Test that each `async with` block builds models around its own HTTP client and closes it."""
+        mock_chat.return_value.ainvoke = AsyncMock(return_value=MagicMock(content="Summary."))
+        
+        summarizer = AsyncArticleSummarizer()
+        asyncio.run(in_session(summarizer, summarizer.asummarize(sample_article)))
+        asyncio.run(in_session(summarizer, summarizer.asummarize(sample_article)))
+        
+        clients = [call.kwargs["http_async_client"] for call in mock_chat.call_args_list]
+        assert clients[0] is None  # The synchronous models built in __init__
+        assert len(clients) == 3
+        assert clients[1] is not None and clients[2] is not clients[1]
+        assert clients[1].is_closed and clients[2].is_closed
+    
+    def test_requires_session(self, mock_chat, sample_article, mock_openai_env):
+        """Test that async calls outside `async with summarizer` are rejected."""
+        summarizer = AsyncArticleSummarizer()
+        
+        with pytest.raises(RuntimeError):
+            asyncio.run(summarizer.asummarize(sample_article))
+
+    def test_asummarize(self, mock_chat, sample_article, mock_openai_env):
+        """Test generating a summary with the async chat model API."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.ainvoke = AsyncMock(return_value=MagicMock(content="This is an async test summary."))
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        result = asyncio.run(in_session(summarizer, summarizer.asummarize(sample_article, summary_type="concise")))
+        
+        assert isinstance(result, ArticleSummary)
+        assert result.summary == "This is an async test summary."
+        assert result.summary_type == "concise"
+        mock_chat_instance.ainvoke.assert_awaited_once()
+        mock_chat_instance.invoke.assert_not_called()
+
+    def test_aidentify_topics(self, mock_chat, sample_article, mock_openai_env):
+        """Test identifying topics with the async chat model API."""
+        mock_chat_instance = MagicMock()
+        mock_message = MagicMock()
+        mock_message.content = '{"classification": "technology", "topics": ["technology", "AI"], "keywords": ["technology", "models"]}'
+        mock_chat_instance.bind.return_value.ainvoke = AsyncMock(return_value=mock_message)
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        result = asyncio.run(in_session(summarizer, summarizer.aidentify_topics(sample_article)))
+        
+        assert isinstance(result, TopicIdentification)
+        assert result.topics == ["technology", "AI"]
+        assert result.keywords == ["technology", "models"]
+        mock_chat_instance.bind.return_value.ainvoke.assert_awaited_once()
+        mock_chat_instance.ainvoke.assert_not_called()
+
+    def test_aidentify_topics_error_handling(self, mock_chat, sample_article, mock_openai_env):
+        """Test error handling during async topic identification."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.bind.return_value.ainvoke = AsyncMock(side_effect=API_ERROR)
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        with pytest.raises(ValueError) as excinfo:
+            asyncio.run(in_session(summarizer, summarizer.aidentify_topics(sample_article)))
+            
+        assert "Failed to identify topics" in str(excinfo.value)
+        
+    def test_aanalyze(self, mock_chat, sample_article, mock_openai_env):
+        """Test the async single-call analysis."""
+        mock_chat_instance = MagicMock()
+        json_model = MagicMock()
+        json_model.ainvoke = AsyncMock(return_value=MagicMock(content=(
+            '{"summary": "Summary.", "classification": "science", "topics": ["science"], "keywords": ["science"]}'
+        )))
+        mock_chat_instance.bind.return_value = json_model
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        summary, topics = asyncio.run(in_session(summarizer, summarizer.aanalyze(sample_article)))
+        
+        json_model.ainvoke.assert_awaited_once()
+        assert summary.summary == "Classification: science - Summary."
+        assert topics.topics == ["science"]
+
+    def test_summarize_and_identify(self, mock_chat, sample_article, mock_openai_env):
+        """Test that the summary and topic requests are awaited together and share one prompt text."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.ainvoke = AsyncMock(return_value=MagicMock(content="Summary."))
+        mock_chat_instance.bind.return_value.ainvoke = AsyncMock(return_value=MagicMock(
+            content='{"classification": "technology", "topics": ["technology"], "keywords": ["technology"]}'
+        ))
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = AsyncArticleSummarizer()
+        with patch.object(
+            ArticleContent, "prompt_text", new_callable=PropertyMock, return_value="Title: Test"
+        ) as prompt_text:
+            summary, topics = asyncio.run(in_session(summarizer, summarizer.summarize_and_identify(sample_article)))
+        
+        assert summary.summary == "Summary."
+        assert topics.topics == ["technology"]
+        mock_chat_instance.ainvoke.assert_awaited_once()
+        mock_chat_instance.bind.return_value.ainvoke.assert_awaited_once()
+        # The title+text string is built once for both requests
+        prompt_text.assert_called_once_with()
+        for call in (mock_chat_instance.ainvoke, mock_chat_instance.bind.return_value.ainvoke):
+            assert call.await_args.args[0][1].content == "Title: Test"
+
+    def test_aanalyze_many(self, mock_chat, sample_article, mock_openai_env):
+        """Test that articles are analyzed concurrently, bounded, and returned in order."""
+        articles = [sample_article.model_copy(update={"title": f"Article {i}"}) for i in range(5)]
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def analyze(messages):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            title = messages[1].content.splitlines()[0].removeprefix("Title: ")
+            return MagicMock(content=f'{{"summary": "{title}", "classification": "news", "topics": [], "keywords": []}}')
+        
+        mock_chat.return_value.bind.return_value.ainvoke = AsyncMock(side_effect=analyze)
+        
+        summarizer = AsyncArticleSummarizer()
+        results = asyncio.run(in_session(summarizer, summarizer.aanalyze_many(articles, max_concurrency=2)))
+        
+        assert [summary.summary for summary, _ in results] == [
+            f"Classification: news - Article {i}" for i in range(5)
+        ]
+        assert max_in_flight == 2
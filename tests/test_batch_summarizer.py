@@ -0,0 +1,110 @@
+"""
+Unit tests for the batch summarizer module.
+
+This module contains tests for submitting articles to the OpenAI Batch API
+and storing the results of finished batches.
+"""
+
+import orjson
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.batch_summarizer import BatchSummarizer
+from src.models import ArticleContent
+
+
+def _result_line(custom_id: str, content: str, status_code: int = 200) -> bytes:
+    """Build one line of a Batch API output file."""
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}]}
+    return orjson.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+
+@pytest.fixture(scope="module")
+def articles():
+    """Two sample articles, validated once for the module."""
+    return [
+        ArticleContent(url="https://example.com/1", title="First", text="First article text."),
+        ArticleContent(url="https://example.com/2", title="Second", text="Second article text."),
+    ]
+
+
+class TestBatchSummarizer:
+    """Test cases for the BatchSummarizer class."""
+
+    @pytest.fixture(autouse=True)
+    def batch_dir(self, tmp_path):
+        """Keep the pending batch files out of the project data directory."""
+        with patch.object(BatchSummarizer, "BATCH_DIR", str(tmp_path)):
+            yield tmp_path
+
+    @pytest.fixture
+    def batch(self):
+        """BatchSummarizer with a mocked OpenAI client and summarizer."""
+        with patch("src.batch_summarizer.openai.OpenAI") as mock_openai, \
+                patch("src.batch_summarizer.ArticleSummarizer") as mock_summarizer:
+            client = mock_openai.return_value
+            client.files.create.return_value = MagicMock(id="file-in")
+            client.batches.create.return_value = MagicMock(id="batch-1")
+            mock_summarizer.return_value.parse_analysis.side_effect = lambda article, reply: (
+                f"summary of {article.title}", f"topics from {reply}"
+            )
+            yield BatchSummarizer()
+
+    def test_submit_batch(self, batch, articles):
+        """Test that one analysis request per unique article is uploaded and submitted."""
+        batch_id = batch.submit_batch(articles + articles[:1])
+
+        assert batch_id == "batch-1"
+        file_name, content = batch.client.files.create.call_args.kwargs["file"]
+        requests = [orjson.loads(line) for line in content.splitlines()]
+        assert [request["custom_id"] for request in requests] == [a.article_id for a in articles]
+        assert requests[0]["url"] == BatchSummarizer.ENDPOINT
+        assert requests[0]["body"]["response_format"] == {"type": "json_object"}
+        assert requests[0]["body"]["max_tokens"] == batch.config.max_tokens
+        assert requests[0]["body"]["messages"][1] == {"role": "user", "content": articles[0].prompt_text}
+        batch.client.batches.create.assert_called_once_with(
+            input_file_id="file-in", endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        assert batch.pending_batches() == ["batch-1"]
+
+    def test_submit_batch_empty(self, batch):
+        """Test that an empty batch is rejected without calling the API."""
+        with pytest.raises(ValueError, match="Failed to submit batch"):
+            batch.submit_batch([])
+        batch.client.files.create.assert_not_called()
+
+    def test_collect_batch_running(self, batch, articles):
+        """Test that an unfinished batch is left pending."""
+        batch.submit_batch(articles)
+        batch.client.batches.retrieve.return_value = MagicMock(status="in_progress")
+        db_service = MagicMock()
+
+        assert batch.collect_batch("batch-1", db_service) is None
+        db_service.store_articles_bulk.assert_not_called()
+        assert batch.pending_batches() == ["batch-1"]
+
+    def test_collect_batch_completed(self, batch, articles):
+        """Test that successful results are stored in one bulk write and failed ones skipped."""
+        batch.submit_batch(articles)
+        batch.client.batches.retrieve.return_value = MagicMock(status="completed", output_file_id="file-out")
+        batch.client.files.content.return_value.text = b"\n".join([
+            _result_line(articles[0].article_id, '{"summary": "..."}'),
+            _result_line(articles[1].article_id, "", status_code=500),
+        ]).decode()
+        db_service = MagicMock()
+        db_service.store_articles_bulk.return_value = ["doc-1"]
+
+        assert batch.collect_batch("batch-1", db_service) == ["doc-1"]
+
+        stored = db_service.store_articles_bulk.call_args[0][0]
+        assert stored == [(articles[0], "summary of First", 'topics from {"summary": "..."}')]
+        assert batch.pending_batches() == []
+
+    def test_collect_batch_failed(self, batch, articles):
+        """Test that a failed batch raises ValueError and is no longer pending."""
+        batch.submit_batch(articles)
+        batch.client.batches.retrieve.return_value = MagicMock(status="expired")
+
+        with pytest.raises(ValueError, match="expired"):
+            batch.collect_batch("batch-1", MagicMock())
+        assert batch.pending_batches() == []
@@ -1,6 +1,7 @@
 """
 Tests for the config module.
 """
+import dataclasses
 import os
 import pytest
 from unittest.mock import patch
@@ -8,12 +9,21 @@ from unittest.mock import patch
 from src.config import OpenAIConfig
 
 
+@pytest.fixture
+def fresh_config():
+    """Re-read the environment for this test and restore the shared config afterwards."""
+    OpenAIConfig.instance.cache_clear()
+    yield
+    OpenAIConfig.instance.cache_clear()
+
+
 def test_openai_config_default_values():
     """Test that OpenAIConfig loads default values correctly."""
-    assert isinstance(OpenAIConfig.API_KEY, str) or OpenAIConfig.API_KEY is None
-    assert isinstance(OpenAIConfig.MODEL, str)
-    assert isinstance(OpenAIConfig.TEMPERATURE, float)
-    assert isinstance(OpenAIConfig.MAX_TOKENS, int)
+    config = OpenAIConfig.instance()
+    assert isinstance(config.api_key, str) or config.api_key is None
+    assert isinstance(config.model, str)
+    assert isinstance(config.temperature, float)
+    assert isinstance(config.max_tokens, int)
 
 
 @patch.dict(os.environ, {
@@ -22,27 +32,33 @@ def test_openai_config_default_values():
     "OPENAI_TEMPERATURE": "0.5",
     "OPENAI_MAX_TOKENS": "2000"
 }, clear=True)
-def test_openai_config_custom_values():
+def test_openai_config_custom_values(fresh_config):
     """Test that OpenAIConfig reads custom environment values."""
-    # Re-import to reload environment variables
-    from importlib import reload
-    import src.config
-    reload(src.config)
+    config = OpenAIConfig.instance()
+    
+    assert config.api_key == "test_key_123"
+    assert config.model == "gpt-4"
+    assert config.temperature == 0.5
+    assert config.max_tokens == 2000
+
+
+def test_openai_config_built_once():
+    """Test that the configuration is parsed once and cannot be modified."""
+    config = OpenAIConfig.instance()
     
-    assert src.config.OpenAIConfig.API_KEY == "test_key_123"
-    assert src.config.OpenAIConfig.MODEL == "gpt-4"
-    assert src.config.OpenAIConfig.TEMPERATURE == 0.5
-    assert src.config.OpenAIConfig.MAX_TOKENS == 2000
+    assert OpenAIConfig.instance() is config
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.model = "gpt-4"
 
 
 def test_validate_without_api_key():
     """Test validation raises error with missing API key."""
-    with patch.object(OpenAIConfig, "API_KEY", None):
-        with pytest.raises(ValueError, match="OPENAI_API_KEY.*not set"):
-            OpenAIConfig.validate()
+    config = dataclasses.replace(OpenAIConfig.instance(), api_key=None)
+    with pytest.raises(ValueError, match="OPENAI_API_KEY.*not set"):
+        config.validate()
 
 
 def test_validate_with_placeholder_api_key():
     """Test validation returns False with placeholder API key."""
-    with patch.object(OpenAIConfig, "API_KEY", "your_api_key_here"):
-        assert OpenAIConfig.validate() is False
+    config = dataclasses.replace(OpenAIConfig.instance(), api_key="your_api_key_here")
+    assert config.validate() is False
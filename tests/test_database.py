@@ -5,75 +5,197 @@ This module contains tests for the DatabaseService class that handles
 interactions with the ChromaDB vector database.
 """
 
-import unittest
-from unittest.mock import patch, MagicMock
 import uuid
-import os
+from unittest.mock import MagicMock
+
+import chromadb
+import pytest
 from pydantic import HttpUrl
 
 from src.models import ArticleContent, ArticleSummary, TopicIdentification
 from src.database import DatabaseService
+from tests.fakes import FakeCollection, FakeEmbeddings
+
+# Fixed ID returned by uuid4 in tests that request the fixed_uuid fixture
+MOCK_UUID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+@pytest.fixture(scope="module")
+def article():
+    """Sample article, validated once for the whole module."""
+    return ArticleContent(
+        url=HttpUrl("https://www.example.com/article"),
+        title="Test Article Title",
+        text="This is a test article with enough content to process.",
+        metadata={"author": "Test Author"}
+    )
+
+
+@pytest.fixture(scope="module")
+def summary(article):
+    """Sample summary of the article."""
+    return ArticleSummary(
+        article_id=article.article_id,
+        summary="This is a summary of the test article.",
+        summary_type="concise"
+    )
 
 
-class TestDatabaseService(unittest.TestCase):
+@pytest.fixture(scope="module")
+def topics(article):
+    """Sample topics and keywords of the article."""
+    return TopicIdentification(
+        article_id=article.article_id,
+        topics=["Technology", "Testing", "AI"],
+        keywords=["test", "article", "mock", "database", "vector"]
+    )
+
+
+class TestDatabaseService:
     """Test cases for the DatabaseService class."""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""        # Create mock article data for testing
-        self.article = ArticleContent(
-            url=HttpUrl("https://www.example.com/article"),
-            title="Test Article Title",
-            text="This is a test article with enough content to process.",
-            metadata={"author": "Test Author"}
-        )
-        article_id = str(hash(f"{self.article.url}-{self.article.title}"))
-        
-        self.summary = ArticleSummary(
-            article_id=article_id,
-            summary="This is a summary of the test article.",
-            summary_type="concise"
-        )
-        
-        self.topics = TopicIdentification(
-            article_id=article_id,
-            topics=["Technology", "Testing", "AI"],
-            keywords=["test", "article", "mock", "database", "vector"]
-        )        # Mock UUID generation to return consistent IDs for testing
-        self.mock_uuid = uuid.UUID("12345678-1234-5678-1234-567812345678")
-        uuid.uuid4 = MagicMock(return_value=self.mock_uuid)
-        uuid.uuid4 = MagicMock(return_value=self.mock_uuid)
-        
-    @patch('chromadb.PersistentClient')
-    @patch('langchain_openai.OpenAIEmbeddings')
-    def test_init_client(self, mock_embeddings, mock_client):
+
+    @pytest.fixture
+    def collection(self):
+        """Articles collection handed out by the client; configure it before creating the service."""
+        return FakeCollection()
+
+    @pytest.fixture
+    def embeddings(self):
+        """Embeddings model wrapped by the service's embedding cache."""
+        return FakeEmbeddings()
+
+    @pytest.fixture
+    def client(self, collection):
+        """ChromaDB client returning the fake collection."""
+        client = MagicMock()
+        client.get_or_create_collection.return_value = collection
+        client.list_collections.return_value = [DatabaseService.ARTICLES_COLLECTION]
+        client.get_max_batch_size.return_value = 100
+        return client
+
+    @pytest.fixture(autouse=True)
+    def isolated_service(self, monkeypatch, tmp_path, client, embeddings):
+        """Replace Chroma and OpenAI with fakes and keep the embedding cache in tmp_path."""
+        monkeypatch.setattr(chromadb, "PersistentClient", MagicMock(return_value=client))
+        monkeypatch.setattr("src.database.OpenAIEmbeddings", lambda *args, **kwargs: embeddings)
+        monkeypatch.setattr(DatabaseService, "EMBEDDING_CACHE_DIR", str(tmp_path))
+
+    @pytest.fixture
+    def fixed_uuid(self, monkeypatch):
+        """Make the service generate MOCK_UUID as the document ID."""
+        monkeypatch.setattr("src.database.uuid.uuid4", lambda: MOCK_UUID)
+
+    def test_init_client(self, client, collection):
         """Test DatabaseService initialization with local persistent client."""
-        # Setup mocks
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        mock_client_instance.get_collection.side_effect = ValueError()  # Simulate collection doesn't exist
-        
-        # Initialize service
-        service = DatabaseService()
-        
-        # Assert that the client was created correctly
-        mock_client.assert_called_once()
-        mock_client_instance.create_collection.assert_called_once_with(
+        service = DatabaseService()
+
+        # Assert that the client was created correctly and the collection handle is cached
+        chromadb.PersistentClient.assert_called_once()
+        client.get_or_create_collection.assert_called_once_with(
             name=DatabaseService.ARTICLES_COLLECTION,
-            metadata={"description": "Collection for news articles with summaries and topics"}
+            metadata=DatabaseService.collection_metadata()
         )
-        
-    @patch('chromadb.PersistentClient')
-    @patch('langchain_openai.OpenAIEmbeddings')
-    def test_search_articles(self, mock_embeddings, mock_client):
+        client.delete_collection.assert_not_called()
+        assert service.articles_collection is collection
+
+        # Later operations reuse the cached handle without another lookup
+        service.delete_article("doc-id-1")
+        client.get_collection.assert_not_called()
+        assert collection.calls["delete"] == [{"ids": ["doc-id-1"]}]
+
+    def test_init_migrates_other_embedding_model(self, client, collection, embeddings):
+        """Test that a collection built with another embedding model is re-embedded."""
+        # Existing collection created before the model switch
+        collection.metadata = {"description": "Collection for news articles with summaries and topics"}
+        collection.get_ret = {
+            "ids": ["doc-id-1"],
+            "documents": ["Title: Article 1"],
+            "metadatas": [{"title": "Article 1"}]
+        }
+        new_collection = FakeCollection()
+        client.create_collection.return_value = new_collection
+        embeddings.vectors = [[0.1, 0.2]]
+
+        service = DatabaseService()
+
+        # Assert documents were re-embedded into a recreated collection
+        assert embeddings.documents == [["Title: Article 1"]]
+        client.delete_collection.assert_called_once_with(name=DatabaseService.ARTICLES_COLLECTION)
+        assert new_collection.calls["add"] == [{
+            "ids": ["doc-id-1"],
+            "embeddings": [[0.1, 0.2]],
+            "metadatas": [{"title": "Article 1"}],
+            "documents": ["Title: Article 1"]
+        }]
+        assert service.articles_collection is new_collection
+
+    def test_init_migration_failure_keeps_data(self, client, collection, embeddings):
+        """Test that a failed re-embedding leaves the old collection in place."""
+        collection.metadata = {}
+        collection.get_ret = {"ids": ["doc-id-1"], "documents": ["doc"], "metadatas": [{}]}
+        embeddings.error = Exception("API error")
+
+        with pytest.raises(Exception):
+            DatabaseService()
+        client.delete_collection.assert_not_called()
+
+    def test_store_article(self, fixed_uuid, collection, embeddings, article, summary, topics):
+        """Test storing a single article under a compact hex ID."""
+        embeddings.vectors = [[0.1, 0.2]]
+
+        service = DatabaseService()
+        doc_id = service.store_article(article, summary, topics)
+
+        assert doc_id == MOCK_UUID.hex
+        assert len(collection.calls["add"]) == 1
+        add_kwargs = collection.calls["add"][0]
+        assert add_kwargs["ids"] == [MOCK_UUID.hex]
+        assert add_kwargs["embeddings"] == [[0.1, 0.2]]
+
+    def test_store_articles_bulk(self, collection, embeddings, article, summary, topics):
+        """Test storing several articles with one embeddings call and one add call."""
+        embeddings.vectors = [[0.1, 0.2], [0.3, 0.4]]
+
+        # Initialize service and store two articles
+        service = DatabaseService()
+        second_article = article.model_copy(update={"title": "Second Article Title"})
+        items = [
+            (article, summary, topics),
+            (second_article, summary, topics)
+        ]
+        doc_ids = service.store_articles_bulk(items)
+
+        # Assert a single batched embeddings call and a single add
+        assert len(set(doc_ids)) == 2
+        assert len(embeddings.documents) == 1
+        assert len(embeddings.documents[0]) == 2
+        assert embeddings.queries == []
+        assert len(collection.calls["add"]) == 1
+        add_kwargs = collection.calls["add"][0]
+        assert add_kwargs["ids"] == doc_ids
+        assert add_kwargs["embeddings"] == [[0.1, 0.2], [0.3, 0.4]]
+        assert add_kwargs["metadatas"][0]["title"] == "Test Article Title"
+
+    def test_store_articles_bulk_empty(self, collection, embeddings):
+        """Test that storing an empty batch makes no API or database calls."""
+        service = DatabaseService()
+
+        assert service.store_articles_bulk([]) == []
+        assert embeddings.documents == []
+        assert collection.calls["add"] == []
+
+    def test_store_articles_bulk_failure(self, embeddings, article, summary, topics):
+        """Test that embedding failures are surfaced as ValueError."""
+        embeddings.error = Exception("API error")
+
+        service = DatabaseService()
+
+        with pytest.raises(ValueError):
+            service.store_articles_bulk([(article, summary, topics)])
+
+    def test_search_articles(self, collection, embeddings):
         """Test searching for articles."""
-        # Setup mocks
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        mock_collection = MagicMock()
-        mock_client_instance.get_collection.return_value = mock_collection
-        
-        # Mock query results
-        mock_collection.query.return_value = {
+        collection.query_ret = {
             "ids": [["doc-id-1", "doc-id-2"]],
             "distances": [[0.1, 0.2]],
             "metadatas": [[
@@ -93,36 +215,59 @@ class TestDatabaseService(unittest.TestCase):
                 }
             ]]
         }
-        
-        # Mock embeddings
-        mock_embedding_instance = MagicMock()
-        mock_embeddings.return_value = mock_embedding_instance
-        mock_embedding_instance.embed_query.return_value = [0.1, 0.2, 0.3]
-        
+
         # Initialize service and search articles
         service = DatabaseService()
         results = service.search_articles("test search query")
-        
+
         # Assert correct search results
-        self.assertEqual(len(results), 2)
-        self.assertEqual(results[0]["id"], "doc-id-1")
-        self.assertEqual(results[0]["title"], "Article 1")
-        self.assertEqual(results[0]["topics"], ["Tech", "AI"])
-        self.assertEqual(results[1]["id"], "doc-id-2")
-        self.assertEqual(results[1]["title"], "Article 2")
-        
-    @patch('chromadb.PersistentClient')
-    @patch('langchain_openai.OpenAIEmbeddings')
-    def test_get_article_by_id(self, mock_embeddings, mock_client):
+        assert embeddings.queries == ["test search query"]
+        assert collection.calls["query"][0]["query_embeddings"] == [[0.1, 0.2, 0.3]]
+        assert results == [
+            {
+                "id": "doc-id-1",
+                "url": "https://example.com/1",
+                "title": "Article 1",
+                "summary": "Summary 1",
+                "topics": ["Tech", "AI"],
+                "keywords": ["ai", "tech", "test"],
+                "relevance_score": pytest.approx(0.9)
+            },
+            {
+                "id": "doc-id-2",
+                "url": "https://example.com/2",
+                "title": "Article 2",
+                "summary": "Summary 2",
+                "topics": ["News", "Politics"],
+                "keywords": ["news", "politics", "world"],
+                "relevance_score": pytest.approx(0.8)
+            }
+        ]
+
+    def test_search_articles_query_cache(self, collection):
+        """Test that a repeated query is served from the query cache until a write."""
+        collection.query_ret = {
+            "ids": [["doc-id-1"]],
+            "distances": [[0.1]],
+            "metadatas": [[{"url": "https://example.com/1", "title": "Article 1"}]]
+        }
+
+        service = DatabaseService()
+        first = service.search_articles("test search query")
+        second = service.search_articles("test search query")
+
+        # Second search must not hit Chroma
+        assert first == second
+        assert len(collection.calls["query"]) == 1
+
+        # Any write invalidates the cache
+        service.delete_article("doc-id-1")
+        service.search_articles("test search query")
+        assert len(collection.calls["query"]) == 2
+
+    def test_get_article_by_id(self, collection):
         """Test retrieving an article by ID."""
-        # Setup mocks
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        mock_collection = MagicMock()
-        mock_client_instance.get_collection.return_value = mock_collection
-        
-        # Mock get results
-        mock_collection.get.return_value = {
+        collection.get_ret = {
             "ids": ["doc-id-1"],
             "metadatas": [
                 {
@@ -134,55 +279,145 @@ class TestDatabaseService(unittest.TestCase):
                 }
             ]
         }
-        
+
         # Initialize service and get article
         service = DatabaseService()
-        result = service.get_article_by_id("doc-id-1") or {}
-        
+        result = service.get_article_by_id("doc-id-1")
+
         # Assert correct article retrieval
-        self.assertEqual(result["id"], "doc-id-1")
-        self.assertEqual(result["title"], "Article 1")
-        self.assertEqual(result["topics"], ["Tech", "AI"])
-        
-    @patch('chromadb.PersistentClient')
-    @patch('langchain_openai.OpenAIEmbeddings')
-    def test_get_article_by_id_not_found(self, mock_embeddings, mock_client):
+        assert collection.calls["get"] == [{"ids": ["doc-id-1"], "include": ["metadatas"]}]
+        assert result == {
+            "id": "doc-id-1",
+            "url": "https://example.com/1",
+            "title": "Article 1",
+            "summary": "Summary 1",
+            "topics": ["Tech", "AI"],
+            "keywords": ["ai", "tech", "test"]
+        }
+
+    def test_get_article_by_id_not_found(self, collection):
         """Test retrieving a non-existent article by ID."""
-        # Setup mocks
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        mock_collection = MagicMock()
-        mock_client_instance.get_collection.return_value = mock_collection
-        
-        # Mock get results for non-existent article
-        mock_collection.get.return_value = {"ids": [], "metadatas": []}
-        
+        collection.get_ret = {"ids": [], "metadatas": []}
+
         # Initialize service and get non-existent article
         service = DatabaseService()
         result = service.get_article_by_id("non-existent-id")
-        
+
         # Assert correct behavior for non-existent article
-        self.assertIsNone(result)
-        
-    @patch('chromadb.PersistentClient')
-    @patch('langchain_openai.OpenAIEmbeddings')
-    def test_delete_article(self, mock_embeddings, mock_client):
+        assert result is None
+
+    def test_url_exists(self, collection):
+        """Test that URL lookups filter on metadata without loading any records."""
+        collection.get_ret = [{"ids": ["doc-id-1"]}, {"ids": []}]
+
+        service = DatabaseService()
+
+        assert service.url_exists("https://example.com/1")
+        assert not service.url_exists("https://example.com/2")
+        assert collection.calls["get"][-1] == {"where": {"url": "https://example.com/2"}, "limit": 1, "include": []}
+
+    def test_list_articles(self, collection):
+        """Test listing articles fetches only metadata."""
+        collection.get_ret = {
+            "ids": ["doc-id-1", "doc-id-2"],
+            "metadatas": [
+                {"url": "https://example.com/1", "title": "Article 1", "topics": "Tech, AI", "keywords": "ai"},
+                {"url": "https://example.com/2", "title": "Article 2", "topics": "News"}
+            ]
+        }
+
+        # Initialize service and list articles
+        service = DatabaseService()
+        articles = service.list_articles(limit=10)
+
+        # Assert projection and formatting
+        assert collection.calls["get"] == [{"limit": 10, "offset": 0, "include": ["metadatas"]}]
+        assert [a["id"] for a in articles] == ["doc-id-1", "doc-id-2"]
+        assert articles[0]["topics"] == ["Tech", "AI"]
+        assert articles[1]["keywords"] == []
+
+    def test_delete_article(self, collection):
         """Test deleting an article."""
-        # Setup mocks
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
-        mock_collection = MagicMock()
-        mock_client_instance.get_collection.return_value = mock_collection
-        
-        # Initialize service and delete article
         service = DatabaseService()
         result = service.delete_article("doc-id-1")
-        
+
         # Assert correct deletion
-        self.assertTrue(result)
-        mock_collection.delete.assert_called_once_with(ids=["doc-id-1"])
-     
+        assert result
+        assert collection.calls["delete"] == [{"ids": ["doc-id-1"]}]
+
+    def test_delete_articles(self, collection):
+        """Test deleting several articles with a single collection call."""
+        service = DatabaseService()
+
+        assert service.delete_articles(["doc-id-1", "doc-id-2"]) == 2
+        assert collection.calls["delete"] == [{"ids": ["doc-id-1", "doc-id-2"]}]
 
+        # An empty batch makes no database call
+        assert service.delete_articles([]) == 0
+        assert len(collection.calls["delete"]) == 1
+
+        # Failures are surfaced as ValueError
+        collection.delete_error = Exception("DB error")
+        with pytest.raises(ValueError):
+            service.delete_article("doc-id-1")
+
+    def test_compact_collection(self, client, collection, embeddings):
+        """Test rebuilding the collection from its stored records without re-embedding."""
+        collection.get_ret = {
+            "ids": ["doc-id-1"],
+            "embeddings": [[0.1, 0.2]],
+            "documents": ["Title: Article 1"],
+            "metadatas": [{"title": "Article 1"}]
+        }
+        new_collection = FakeCollection()
+        client.create_collection.return_value = new_collection
+
+        service = DatabaseService()
+
+        assert service.compact_collection() == 1
+        client.create_collection.assert_called_once_with(
+            name=DatabaseService.ARTICLES_COLLECTION + "__rebuild",
+            metadata=DatabaseService.collection_metadata()
+        )
+        client.delete_collection.assert_called_once_with(name=DatabaseService.ARTICLES_COLLECTION)
+        assert new_collection.calls["add"] == [{
+            "ids": ["doc-id-1"],
+            "embeddings": [[0.1, 0.2]],
+            "metadatas": [{"title": "Article 1"}],
+            "documents": ["Title: Article 1"]
+        }]
+        assert new_collection.calls["modify"] == [{"name": DatabaseService.ARTICLES_COLLECTION}]
+        assert embeddings.documents == []
+        assert service.articles_collection is new_collection
+
+    def test_compact_collection_batches(self, client, collection):
+        """Test that the records are reloaded in batches of the client's maximum size."""
+        collection.get_ret = {
+            "ids": ["doc-id-1", "doc-id-2", "doc-id-3"],
+            "embeddings": [[0.1], [0.2], [0.3]],
+            "documents": ["doc 1", "doc 2", "doc 3"],
+            "metadatas": [{}, {}, {}]
+        }
+        new_collection = FakeCollection()
+        client.create_collection.return_value = new_collection
+        client.get_max_batch_size.return_value = 2
+
+        assert DatabaseService().compact_collection() == 3
+        assert [add["ids"] for add in new_collection.calls["add"]] == [["doc-id-1", "doc-id-2"], ["doc-id-3"]]
+
+    def test_compact_collection_failure_keeps_data(self, client, collection):
+        """Test that a failed reload drops only the temporary copy and keeps the original collection."""
+        collection.get_ret = {
+            "ids": ["doc-id-1"],
+            "embeddings": [[0.1, 0.2]],
+            "documents": ["Title: Article 1"],
+            "metadatas": [{"title": "Article 1"}]
+        }
+        client.create_collection.return_value = FakeCollection(add_error=Exception("Disk error"))
+
+        service = DatabaseService()
 
-if __name__ == '__main__':
-    unittest.main()
+        with pytest.raises(ValueError):
+            service.compact_collection()
+        client.delete_collection.assert_called_once_with(name=DatabaseService.ARTICLES_COLLECTION + "__rebuild")
+        assert service.articles_collection is collection
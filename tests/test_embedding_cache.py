@@ -0,0 +1,92 @@
+"""
+Unit tests for the embedding cache module.
+
+This module contains tests for the CachedEmbeddings wrapper, covering
+cache hits, batched misses and persistence across instances.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.embedding_cache import CachedEmbeddings
+
+
+class TestCachedEmbeddings:
+    """Test cases for the CachedEmbeddings class."""
+
+    @pytest.fixture
+    def mock_embeddings(self):
+        """Create a mock embeddings model returning one vector per text."""
+        embeddings = MagicMock()
+        embeddings.embed_query.side_effect = lambda text: [float(len(text)), 0.5]
+        embeddings.embed_documents.side_effect = lambda texts: [[float(len(t)), 0.5] for t in texts]
+        return embeddings
+
+    @pytest.fixture
+    def cache(self, mock_embeddings, tmp_path):
+        """Create a CachedEmbeddings instance backed by a temporary directory."""
+        cached = CachedEmbeddings(mock_embeddings, cache_dir=str(tmp_path), namespace="test-model")
+        yield cached
+        cached.close()
+
+    def test_embed_query_cache_hit(self, cache, mock_embeddings):
+        """Test that a repeated query is only embedded once."""
+        first = cache.embed_query("hello")
+        second = cache.embed_query("hello")
+
+        assert first == second == [5.0, 0.5]
+        mock_embeddings.embed_query.assert_called_once_with("hello")
+
+    def test_embed_documents_batches_misses(self, cache, mock_embeddings):
+        """Test that only uncached, deduplicated texts reach the model in one call."""
+        cache.embed_query("cached")
+
+        result = cache.embed_documents(["cached", "new one", "new one"])
+
+        assert result == [[6.0, 0.5], [7.0, 0.5], [7.0, 0.5]]
+        mock_embeddings.embed_documents.assert_called_once_with(["new one"])
+
+    def test_persistence_across_instances(self, mock_embeddings, tmp_path):
+        """Test that vectors survive a new cache instance on the same directory."""
+        first = CachedEmbeddings(mock_embeddings, cache_dir=str(tmp_path))
+        first.embed_documents(["persisted"])
+        first.close()
+
+        fresh_model = MagicMock()
+        second = CachedEmbeddings(fresh_model, cache_dir=str(tmp_path))
+        assert second.embed_query("persisted") == [9.0, 0.5]
+        fresh_model.embed_query.assert_not_called()
+        second.close()
+
+    def test_namespace_isolation(self, mock_embeddings, tmp_path):
+        """Test that different namespaces do not share cached vectors."""
+        first = CachedEmbeddings(mock_embeddings, cache_dir=str(tmp_path), namespace="model-a")
+        first.embed_query("text")
+        first.close()
+
+        second = CachedEmbeddings(mock_embeddings, cache_dir=str(tmp_path), namespace="model-b")
+        second.embed_query("text")
+        second.close()
+
+        assert mock_embeddings.embed_query.call_count == 2
+
+    def test_model_failure_is_not_cached(self, cache, mock_embeddings):
+        """Test that errors from the underlying model propagate and leave no entry."""
+        mock_embeddings.embed_query.side_effect = Exception("API error")
+
+        with pytest.raises(Exception, match="API error"):
+            cache.embed_query("boom")
+
+        mock_embeddings.embed_query.side_effect = None
+        mock_embeddings.embed_query.return_value = [1.0]
+        assert cache.embed_query("boom") == [1.0]
+
+    def test_memory_entries_are_packed(self, cache):
+        """Test that in-memory entries are compact float32 arrays, not float lists."""
+        vector = cache.embed_query("packed")
+
+        stored = next(iter(cache._memory.values()))
+        assert stored.typecode == "f"
+        assert stored.itemsize == 4
+        assert isinstance(vector, list)
+        assert cache.embed_query("packed") == vector
@@ -6,92 +6,253 @@ import pytest
 from unittest.mock import patch, Mock
 import requests
 from bs4 import BeautifulSoup
-import sys
-import os
 
-# Add the parent directory to the path so we can import from src
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.extractor import ArticleExtractor
+from src import lexbor_parser
 from src.models import ArticleContent
 
 
-@pytest.fixture
-def mock_response():
-    """Create a mock HTTP response with sample HTML."""
+def html_response(html: str, content_type: str = "text/html; charset=utf-8") -> Mock:
+    """Build a mock HTTP response carrying the given HTML as raw bytes."""
     mock_resp = Mock()
-    mock_resp.text = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Test Article Title</title>
-        <meta name="author" content="John Doe">
-        <meta property="article:published_time" content="2025-05-04T12:00:00Z">
-    </head>
-    <body>
-        <article>
-            <h1 class="headline">Sample News Article</h1>
-            <div class="article-body">
-                <p>This is the first paragraph of the article.</p>
-                <p>This is the second paragraph with more details.</p>
-                <p>This is the conclusion of the article.</p>
-            </div>
-        </article>
-        <footer>
-            <p>Copyright 2025</p>
-        </footer>
-    </body>
-    </html>
-    """
+    mock_resp.text = html
+    mock_resp.content = html.encode("utf-8")
+    mock_resp.headers = {"Content-Type": content_type}
+    mock_resp.encoding = "utf-8"
     mock_resp.status_code = 200
     return mock_resp
 
 
-def test_extract_success(mock_response):
+@pytest.fixture(
+    params=[False, True] if lexbor_parser.AVAILABLE else [False],
+    ids=lambda flag: "selectolax" if flag else "bs4"
+)
+def use_selectolax(request):
+    """Run parsing tests against every available HTML parser backend."""
+    return request.param
+
+
+# URL requested by the single-article tests
+ARTICLE_URL = "https://example.com/article"
+
+# Sample article page shared by the extraction tests
+SAMPLE_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Test Article Title</title>
+    <meta name="author" content="John Doe">
+    <meta property="article:published_time" content="2025-05-04T12:00:00Z">
+</head>
+<body>
+    <article>
+        <h1 class="headline">Sample News Article</h1>
+        <div class="article-body">
+            <p>This is the first paragraph of the article.</p>
+            <p>This is the second paragraph with more details.</p>
+            <p>This is the conclusion of the article.</p>
+        </div>
+    </article>
+    <footer>
+        <p>Copyright 2025</p>
+    </footer>
+</body>
+</html>
+"""
+
+
+class PageTable(dict):
+    """
+    URL -> response map served by the patched `requests.Session.get`.
+
+    Values that are exceptions are raised instead of returned, and every
+    requested URL is recorded in `requested`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requested = []
+
+    def serve(self, url, **kwargs):
+        self.requested.append(url)
+        page = self[url]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+@pytest.fixture
+def pages():
+    """Serve HTTP requests from a per-test table of canned responses."""
+    table = PageTable()
+    with patch('requests.Session.get', side_effect=table.serve):
+        yield table
+
+
+@pytest.fixture(scope="module")
+def mock_response():
+    """Create a mock HTTP response with sample HTML, built once for the module."""
+    return html_response(SAMPLE_HTML)
+
+
+def test_extract_success(pages, mock_response, use_selectolax):
     """Test successful article extraction."""
-    with patch('requests.get', return_value=mock_response):
-        extractor = ArticleExtractor()
-        result = extractor.extract('https://example.com/article')
-        
-        assert isinstance(result, ArticleContent)
-        assert result.title == "Sample News Article"
-        assert "first paragraph" in result.text
-        assert "second paragraph" in result.text
-        assert "conclusion" in result.text
-        assert "Copyright" not in result.text  # Footer content should be excluded
-        assert result.metadata.get('author') == "John Doe"
-        assert result.metadata.get('date') == "2025-05-04T12:00:00Z"
-
-
-def test_extract_request_error():
+    pages[ARTICLE_URL] = mock_response
+
+    extractor = ArticleExtractor(use_selectolax=use_selectolax)
+    result = extractor.extract(ARTICLE_URL)
+
+    assert isinstance(result, ArticleContent)
+    assert result.title == "Sample News Article"
+    assert "first paragraph" in result.text
+    assert "second paragraph" in result.text
+    assert "conclusion" in result.text
+    assert "Copyright" not in result.text  # Footer content should be excluded
+    assert result.metadata.get('author') == "John Doe"
+    assert result.metadata.get('date') == "2025-05-04T12:00:00Z"
+
+
+def test_extract_request_error(pages):
     """Test error handling when request fails."""
-    with patch('requests.get', side_effect=requests.RequestException("Connection error")):
-        extractor = ArticleExtractor()
-        with pytest.raises(ValueError) as excinfo:
-            extractor.extract('https://example.com/article')
-        assert "Failed to fetch article" in str(excinfo.value)
+    pages[ARTICLE_URL] = requests.RequestException("Connection error")
 
+    extractor = ArticleExtractor()
+    with pytest.raises(ValueError) as excinfo:
+        extractor.extract(ARTICLE_URL)
+    assert "Failed to fetch article" in str(excinfo.value)
 
-def test_extract_no_title():
+
+def test_extract_no_title(pages, use_selectolax):
     """Test error handling when no title can be found."""
-    mock_resp = Mock()
-    mock_resp.text = "<html><body><p>Just some text</p></body></html>"
-    mock_resp.status_code = 200
-    
-    with patch('requests.get', return_value=mock_resp):
-        extractor = ArticleExtractor()
-        with pytest.raises(ValueError) as excinfo:
-            extractor.extract('https://example.com/article')
-        assert "Could not extract article title" in str(excinfo.value)
+    pages[ARTICLE_URL] = html_response("<html><body><p>Just some text</p></body></html>")
+
+    extractor = ArticleExtractor(use_selectolax=use_selectolax)
+    with pytest.raises(ValueError) as excinfo:
+        extractor.extract(ARTICLE_URL)
+    assert "Could not extract article title" in str(excinfo.value)
 
 
-def test_extract_no_content():
+def test_extract_no_content(pages, use_selectolax):
     """Test error handling when no content can be found."""
-    mock_resp = Mock()
-    mock_resp.text = "<html><head><title>Test</title></head><body></body></html>"
-    mock_resp.status_code = 200
-    
-    with patch('requests.get', return_value=mock_resp):
-        extractor = ArticleExtractor()
-        with pytest.raises(ValueError) as excinfo:
-            extractor.extract('https://example.com/article')
-        assert "Could not extract article text" in str(excinfo.value)
+    pages[ARTICLE_URL] = html_response("<html><head><title>Test</title></head><body></body></html>")
+
+    extractor = ArticleExtractor(use_selectolax=use_selectolax)
+    with pytest.raises(ValueError) as excinfo:
+        extractor.extract(ARTICLE_URL)
+    assert "Could not extract article text" in str(excinfo.value)
+
+
+def test_extract_many_preserves_order(pages, mock_response):
+    """Test concurrent extraction returns articles in input order over one session."""
+    urls = ['https://example.com/a', 'https://example.com/b', 'https://example.com/c']
+    pages.update(dict.fromkeys(urls, mock_response))
+
+    extractor = ArticleExtractor()
+    results = extractor.extract_many(urls, max_concurrency=2)
+
+    assert [str(r.url) for r in results] == urls
+    assert sorted(pages.requested) == urls
+
+
+def test_extract_many_empty(pages):
+    """Test that extracting an empty URL list makes no requests."""
+    assert ArticleExtractor().extract_many([]) == []
+    assert pages.requested == []
+
+
+def test_extract_many_failure(pages, mock_response):
+    """Test that a failing URL surfaces as ValueError from extract_many."""
+    pages['https://example.com/ok'] = mock_response
+    pages['https://example.com/bad'] = requests.RequestException("Connection error")
+
+    extractor = ArticleExtractor()
+    with pytest.raises(ValueError) as excinfo:
+        extractor.extract_many(['https://example.com/ok', 'https://example.com/bad'])
+    assert "Failed to fetch article" in str(excinfo.value)
+
+
+def test_extract_selector_priority(pages, use_selectolax):
+    """Test that selector priority wins over document order for title and content."""
+    pages[ARTICLE_URL] = html_response("""
+    <html><head><title>Page Title</title></head><body>
+        <div class="headline">Class Headline</div>
+        <h1>Real Headline</h1>
+        <main><p>Main paragraph.</p></main>
+        <div class="article-body"><p>Body paragraph.</p></div>
+        <span class="byline">By Byline</span>
+        <span class="author">By Author</span>
+    </body></html>
+    """)
+
+    result = ArticleExtractor(use_selectolax=use_selectolax).extract(ARTICLE_URL)
+
+    assert result.title == "Real Headline"
+    assert result.text == "Body paragraph."
+    assert result.metadata.get('author') == "By Author"
+
+
+def test_extract_fallback_excludes_nested_sections(pages, use_selectolax):
+    """Test the paragraph fallback drops nested nav/footer blocks without errors."""
+    pages[ARTICLE_URL] = html_response("""
+    <html><head><title>Fallback</title></head><body>
+        <div class="sidebar"><nav><p>Menu</p></nav><footer><p>Footer</p></footer></div>
+        <p>Visible paragraph.</p>
+    </body></html>
+    """)
+
+    result = ArticleExtractor(use_selectolax=use_selectolax).extract(ARTICLE_URL)
+
+    assert result.text == "Visible paragraph."
+
+
+def test_extract_bytes_charset_detection(pages, use_selectolax):
+    """Test non-UTF-8 bytes are decoded from the meta charset when the header has none."""
+    html = (
+        '<html><head><meta charset="windows-1252"><title>Café</title></head>'
+        '<body><article><h1>Café news</h1><p>Crème brûlée.</p></article></body></html>'
+    )
+    mock_resp = html_response(html, content_type="text/html")
+    mock_resp.content = html.encode("windows-1252")
+    mock_resp.encoding = "ISO-8859-1"
+    pages[ARTICLE_URL] = mock_resp
+
+    result = ArticleExtractor(use_selectolax=use_selectolax).extract(ARTICLE_URL)
+
+    assert result.title == "Café news"
+    assert result.text == "Crème brûlée."
+
+
+@pytest.mark.parametrize("max_chars, expected", [
+    (20, "First paragraph text"),
+    (39, "First paragraph text.\n\nSecond paragraph"),
+    (None, "First paragraph text.\n\nSecond paragraph text.\n\nThird paragraph text."),
+])
+def test_extract_text_max_chars(pages, use_selectolax, max_chars, expected):
+    """Test that the article text is capped at the character budget."""
+    pages[ARTICLE_URL] = html_response("""
+    <html><head><title>Budget</title></head><body><article>
+        <h1>Budget</h1>
+        <p>First paragraph text.</p>
+        <p>Second paragraph text.</p>
+        <p>Third paragraph text.</p>
+    </article></body></html>
+    """)
+
+    extractor = ArticleExtractor(use_selectolax=use_selectolax)
+    result = extractor.extract(ARTICLE_URL, max_chars=max_chars)
+
+    assert result.text == expected
+
+
+def test_extractor_requests_compression():
+    """Test the session advertises compressed transfer encodings."""
+    extractor = ArticleExtractor()
+    assert "gzip" in extractor.session.headers["Accept-Encoding"]
+
+
+def test_extract_selectolax_unavailable():
+    """Test that requesting the selectolax backend without selectolax fails clearly."""
+    with patch.object(lexbor_parser, 'AVAILABLE', False):
+        assert ArticleExtractor().use_selectolax is False
+        with pytest.raises(ImportError):
+            ArticleExtractor(use_selectolax=True)
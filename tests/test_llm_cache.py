@@ -0,0 +1,175 @@
+"""
+Unit tests for the LLM response cache module.
+
+This module contains tests for the SQLiteLLMCache class and for installing
+it as LangChain's global cache.
+"""
+
+import json
+
+import httpx
+import pytest
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, Generation
+from langchain_openai import ChatOpenAI
+
+from src.llm_cache import SQLiteLLMCache, cache_llm_string, enable_llm_cache, stream_with_cache
+
+
+def completion_response(request: httpx.Request) -> httpx.Response:
+    """Answer a chat completion request with "first", as one JSON reply or as two streamed chunks."""
+    if json.loads(request.content).get("stream"):
+        events = "".join(
+            "data: " + json.dumps({
+                "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}]
+            }) + "\n\n"
+            for piece in ("fi", "rst")
+        )
+        return httpx.Response(200, text=events + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+    return httpx.Response(200, json={
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "first"}, "finish_reason": "stop"}]
+    })
+
+
+class TestSQLiteLLMCache:
+    """Test cases for the SQLiteLLMCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Cache stored in a temporary directory."""
+        cache = SQLiteLLMCache(str(tmp_path))
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def global_cache(self):
+        """Restore LangChain's global cache after the test."""
+        previous = get_llm_cache()
+        set_llm_cache(None)
+        yield
+        set_llm_cache(previous)
+
+    def test_round_trip(self, cache):
+        """Test that chat and text generations are restored from the cache."""
+        generations = [
+            ChatGeneration(message=AIMessage(content="cached answer")),
+            Generation(text="plain text")
+        ]
+        cache.update("prompt", "model=gpt", generations)
+
+        restored = cache.lookup("prompt", "model=gpt")
+
+        assert restored[0].message.content == "cached answer"
+        assert restored[1].text == "plain text"
+
+    def test_round_trip_non_string_metadata_keys(self, cache):
+        """Test that metadata with non-string keys is stored with string keys."""
+        message = AIMessage(content="answer", response_metadata={"logprobs": {1: -0.5}})
+        cache.update("prompt", "model=gpt", [ChatGeneration(message=message)])
+
+        restored = cache.lookup("prompt", "model=gpt")
+
+        assert restored[0].message.response_metadata == {"logprobs": {"1": -0.5}}
+
+    def test_miss_for_other_model_or_prompt(self, cache):
+        """Test that the key covers both the prompt and the model parameters."""
+        cache.update("prompt", "model=gpt", [Generation(text="answer")])
+
+        assert cache.lookup("prompt", "model=other") is None
+        assert cache.lookup("other prompt", "model=gpt") is None
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        """Test that cached responses survive a new cache instance (process restart)."""
+        cache.update("prompt", "model=gpt", [Generation(text="answer")])
+
+        reopened = SQLiteLLMCache(str(tmp_path))
+        try:
+            assert reopened.lookup("prompt", "model=gpt")[0].text == "answer"
+        finally:
+            reopened.close()
+
+    def test_clear(self, cache):
+        """Test that clearing removes all entries."""
+        cache.update("prompt", "model=gpt", [Generation(text="answer")])
+        cache.clear()
+
+        assert cache.lookup("prompt", "model=gpt") is None
+
+    def test_global_cache_skips_model_call(self, tmp_path, global_cache):
+        """Test that a repeated prompt is answered without calling the model."""
+        cache = enable_llm_cache(str(tmp_path))
+        model = FakeListChatModel(responses=["first", "second"])
+
+        assert model.invoke("hello").content == "first"
+        assert model.invoke("hello").content == "first"
+        assert model.invoke("other").content == "second"
+        assert enable_llm_cache(str(tmp_path)) is cache
+        cache.close()
+
+    @pytest.fixture
+    def sent_requests(self):
+        """Chat completion requests sent by the `openai_model` fixture."""
+        return []
+
+    @pytest.fixture
+    def openai_model(self, sent_requests):
+        """ChatOpenAI model whose HTTP sent_requests are answered locally."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent_requests.append(request)
+            return completion_response(request)
+
+        return ChatOpenAI(
+            api_key="test_api_key",
+            model="gpt-4o-mini",
+            temperature=0.2,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+
+    def test_cache_llm_string_matches_invoke(self, tmp_path, global_cache, openai_model):
+        """Test that the key built for streaming is the key invoke writes."""
+        cache = enable_llm_cache(str(tmp_path))
+        messages = [HumanMessage(content="hello")]
+
+        openai_model.invoke(messages)
+
+        assert cache.lookup(dumps(messages), cache_llm_string(openai_model))[0].text == "first"
+        assert cache_llm_string(FakeListChatModel(responses=["first"])) is None
+
+    def test_stream_with_cache(self, tmp_path, global_cache, openai_model, sent_requests):
+        """Test that a streamed completion is cached and shared with invoke."""
+        enable_llm_cache(str(tmp_path))
+        messages = [HumanMessage(content="hello")]
+
+        assert "".join(stream_with_cache(openai_model, messages)) == "first"
+        assert list(stream_with_cache(openai_model, messages)) == ["first"]
+        assert openai_model.invoke(messages).content == "first"
+        assert len(sent_requests) == 1
+
+    def test_stream_reuses_invoked_answer(self, tmp_path, global_cache, openai_model, sent_requests):
+        """Test that streaming a prompt answered by invoke makes no model call."""
+        enable_llm_cache(str(tmp_path))
+        messages = [HumanMessage(content="hello")]
+
+        assert openai_model.invoke(messages).content == "first"
+        assert list(stream_with_cache(openai_model, messages)) == ["first"]
+        assert len(sent_requests) == 1
+
+    def test_stream_without_cache(self, global_cache):
+        """Test that streaming works when no global cache is installed."""
+        model = FakeListChatModel(responses=["first"])
+
+        assert "".join(stream_with_cache(model, [HumanMessage(content="hello")])) == "first"
+
+    def test_stream_unserializable_model(self, tmp_path, global_cache):
+        """Test that a model without a serialized form is streamed without the cache."""
+        enable_llm_cache(str(tmp_path))
+        model = FakeListChatModel(responses=["first", "second"])
+        messages = [HumanMessage(content="hello")]
+
+        assert "".join(stream_with_cache(model, messages)) == "first"
+        assert "".join(stream_with_cache(model, messages)) == "second"
@@ -0,0 +1,40 @@
+"""
+Unit tests for the data models module.
+
+This module contains tests for the ArticleContent prompt text and article ID.
+"""
+
+import pytest
+
+from src.models import ArticleContent
+
+
+class TestArticleContent:
+    """Test cases for the ArticleContent model."""
+
+    @pytest.fixture
+    def article(self):
+        """Sample article."""
+        return ArticleContent(url="https://example.com/article", title="Title", text="Body text.")
+
+    def test_prompt_text(self, article):
+        """Test that the prompt text combines the title and text."""
+        assert article.prompt_text == "Title: Title\n\nBody text."
+
+    def test_prompt_text_not_serialized(self, article):
+        """Test that the prompt text is not dumped as a field."""
+        assert "prompt_text" not in article.model_dump()
+
+    def test_prompt_text_follows_field_changes(self, article):
+        """Test that assigned or copied fields are reflected in the prompt text."""
+        copied = article.model_copy(update={"text": "New text."})
+        article.title = "Changed"
+        
+        assert copied.prompt_text == "Title: Title\n\nNew text."
+        assert article.prompt_text == "Title: Changed\n\nBody text."
+
+    def test_article_id_is_stable(self, article):
+        """Test that the article ID does not depend on the per-process hash seed."""
+        assert article.article_id == "e4ff6c7ff81baf99"
+        assert article.model_copy(update={"text": "New text."}).article_id == article.article_id
+        assert article.model_copy(update={"title": "Other"}).article_id != article.article_id
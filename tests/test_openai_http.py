@@ -0,0 +1,44 @@
+"""
+Unit tests for the OpenAI HTTP transport module.
+
+This module contains tests for the shared HTTP clients passed to ChatOpenAI.
+"""
+
+import asyncio
+
+import httpx
+
+from src import openai_http
+
+
+class TestOpenAIHttp:
+    """Test cases for the shared OpenAI HTTP clients."""
+
+    def test_http_client_is_shared(self):
+        """Test that every caller gets the same pooled client."""
+        client = openai_http.get_http_client()
+
+        assert isinstance(client, httpx.Client)
+        assert openai_http.get_http_client() is client
+
+    def test_async_http_client_is_owned_by_caller(self):
+        """Test that every caller gets its own async client to close on its event loop."""
+        async def use_client():
+            client = openai_http.create_async_http_client()
+            await client.aclose()
+            return client
+
+        first = asyncio.run(use_client())
+        second = asyncio.run(use_client())
+
+        assert isinstance(first, httpx.AsyncClient)
+        assert second is not first
+        assert first.is_closed and second.is_closed
+
+    def test_pool_limits(self):
+        """Test that the clients use the configured pool size."""
+        pool = openai_http.get_http_client()._transport._pool
+
+        assert pool._max_connections == openai_http.MAX_CONNECTIONS
+        assert pool._max_keepalive_connections == openai_http.MAX_KEEPALIVE_CONNECTIONS
+        assert pool._http2 is openai_http.HTTP2_AVAILABLE
@@ -0,0 +1,63 @@
+"""
+Unit tests for the semantic query cache module.
+
+This module contains tests for the SemanticQueryCache class, covering
+similarity matching, limits, expiry and invalidation.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.query_cache import SemanticQueryCache
+
+
+class TestSemanticQueryCache:
+    """Test cases for the SemanticQueryCache class."""
+
+    @pytest.fixture
+    def results(self):
+        """Sample formatted search results."""
+        return [{"id": "1", "title": "First"}, {"id": "2", "title": "Second"}]
+
+    def test_hit_for_similar_query(self, results):
+        """Test that a near-identical embedding returns the cached results."""
+        cache = SemanticQueryCache(threshold=0.95)
+        cache.put([1.0, 0.0, 0.0], 5, results)
+
+        assert cache.get([0.99, 0.05, 0.0], 5) == results
+
+    def test_miss_for_dissimilar_query(self, results):
+        """Test that an orthogonal embedding is a miss."""
+        cache = SemanticQueryCache(threshold=0.95)
+        cache.put([1.0, 0.0, 0.0], 5, results)
+
+        assert cache.get([0.0, 1.0, 0.0], 5) is None
+
+    def test_limit_handling(self, results):
+        """Test that smaller limits are truncated and larger limits miss."""
+        cache = SemanticQueryCache()
+        cache.put([1.0, 0.0], 2, results)
+
+        assert cache.get([1.0, 0.0], 1) == results[:1]
+        assert cache.get([1.0, 0.0], 5) is None
+
+    def test_returned_results_are_copies(self, results):
+        """Test that callers mutating results do not corrupt the cache."""
+        cache = SemanticQueryCache()
+        cache.put([1.0, 0.0], 5, results)
+
+        cache.get([1.0, 0.0], 5)[0]["title"] = "Changed"
+
+        assert cache.get([1.0, 0.0], 5)[0]["title"] == "First"
+
+    def test_expiry_and_clear(self, results):
+        """Test that entries expire after the TTL and can be cleared."""
+        cache = SemanticQueryCache(ttl_seconds=10)
+        with patch("src.query_cache.time.monotonic", return_value=100.0):
+            cache.put([1.0, 0.0], 5, results)
+        with patch("src.query_cache.time.monotonic", return_value=111.0):
+            assert cache.get([1.0, 0.0], 5) is None
+
+        cache.put([1.0, 0.0], 5, results)
+        cache.clear()
+        assert cache.get([1.0, 0.0], 5) is None
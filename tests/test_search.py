@@ -5,27 +5,41 @@ This module contains unit tests for the SemanticSearch class,
 testing query expansion, search functionality, and related search suggestions.
 """
 
+import httpx
+import openai
 import pytest
 from unittest.mock import patch, MagicMock, call
 from langchain.schema import AIMessage
 
+from src.database import DatabaseService
 from src.search import SemanticSearch
+from tests.fakes import FakeEmbeddings
+
+# Error raised by the OpenAI client when the API cannot be reached
+API_ERROR = openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
 
 
 class TestSemanticSearch:
     """Test cases for the SemanticSearch class."""
     
+    @pytest.fixture(autouse=True)
+    def no_llm_cache(self):
+        """Keep the persistent LLM cache out of the tests."""
+        with patch('src.search.enable_llm_cache'):
+            yield
+    
     @pytest.fixture
     def mock_db_service(self):
-        """Create a mock DatabaseService."""
+        """Create a mock DatabaseService limited to the real service's methods."""
         with patch('src.search.DatabaseService') as mock_db_service:
-            db_service_instance = MagicMock()
+            db_service_instance = MagicMock(spec=DatabaseService)
+            db_service_instance.embedding_function = FakeEmbeddings(vectors=[[1.0, 0.0, 0.0]])
             mock_db_service.return_value = db_service_instance
             yield db_service_instance
     
-    @pytest.fixture
+    @pytest.fixture(autouse=True)
     def mock_chat_model(self):
-        """Create a mock ChatOpenAI model."""
+        """Create a mock ChatOpenAI model, so no test can build a real OpenAI client."""
         with patch('src.search.ChatOpenAI') as mock_chat:
             chat_instance = MagicMock()
             mock_chat.return_value = chat_instance
@@ -101,7 +115,7 @@ class TestSemanticSearch:
     def test_query_expansion_exception(self, search_service, mock_chat_model, mock_db_service):
         """Test handling of exceptions during query expansion."""
         # Arrange
-        mock_chat_model.invoke.side_effect = Exception("API error")
+        mock_chat_model.invoke.side_effect = API_ERROR
         mock_db_service.search_articles.return_value = []
         
         # Act
@@ -111,6 +125,49 @@ class TestSemanticSearch:
         mock_db_service.search_articles.assert_called_once_with("test query", 5)
         assert results == []
     
+    def test_query_expansion_unexpected_error(self, search_service, mock_chat_model):
+        """Test that errors other than API errors are raised instead of silently skipping expansion."""
+        mock_chat_model.invoke.side_effect = RuntimeError("Bug")
+        
+        with pytest.raises(RuntimeError, match="Bug"):
+            search_service.search("test query")
+    
+    def test_query_expansion_semantic_cache(self, search_service, mock_chat_model, mock_db_service):
+        """Test that a paraphrased query reuses the cached expansion without an LLM call."""
+        embeddings = mock_db_service.embedding_function
+        mock_chat_model.invoke.return_value = AIMessage(content="AI news artificial intelligence")
+        embeddings.vectors = [[1.0, 0.0, 0.0]]
+        assert search_service._expand_query("top AI news") == "AI news artificial intelligence"
+        
+        embeddings.vectors = [[0.99, 0.05, 0.0]]
+        assert search_service._expand_query("latest AI news") == "AI news artificial intelligence"
+        
+        embeddings.vectors = [[0.0, 1.0, 0.0]]
+        mock_chat_model.invoke.return_value = AIMessage(content="football results")
+        assert search_service._expand_query("football scores") == "football results"
+        assert mock_chat_model.invoke.call_count == 2
+    
+    def test_related_searches_semantic_cache(self, search_service, mock_chat_model):
+        """Test that related searches are reused for similar queries, up to the cached count."""
+        mock_chat_model.invoke.return_value = AIMessage(content="one\ntwo\nthree")
+        
+        assert search_service.get_related_searches("tech news", num_suggestions=3) == ["one", "two", "three"]
+        assert search_service.get_related_searches("tech news", num_suggestions=2) == ["one", "two"]
+        assert mock_chat_model.invoke.call_count == 1
+        
+        # More suggestions than cached require a new LLM call
+        search_service.get_related_searches("tech news", num_suggestions=5)
+        assert mock_chat_model.invoke.call_count == 2
+    
+    def test_llm_cache_skipped_when_embedding_fails(self, search_service, mock_chat_model, mock_db_service):
+        """Test that expansion still works when the query cannot be embedded."""
+        mock_db_service.embedding_function.error = API_ERROR
+        mock_chat_model.invoke.return_value = AIMessage(content="expanded")
+        
+        assert search_service._expand_query("query") == "expanded"
+        assert search_service._expand_query("query") == "expanded"
+        assert mock_chat_model.invoke.call_count == 2
+    
     def test_enhance_results(self, search_service):
         """Test enhancement of search results."""
         # Arrange
@@ -126,4 +183,14 @@ class TestSemanticSearch:
         enhanced_results = search_service._enhance_results("query", results)
         
         # Assert
+        assert enhanced_results is results
         assert enhanced_results[0]['relevance_percentage'] == 75
+    
+    def test_shared_db_service(self, mock_chat_model):
+        """Test that a provided database service is reused instead of creating a new one."""
+        shared_db = MagicMock()
+        with patch('src.search.OpenAIConfig'), patch('src.search.DatabaseService') as mock_db_class:
+            service = SemanticSearch(shared_db)
+        
+        assert service.db_service is shared_db
+        mock_db_class.assert_not_called()
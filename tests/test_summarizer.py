@@ -4,32 +4,48 @@ Unit tests for the summarizer module.
 This module contains tests for article summarization and topic identification.
 """
 
-import os
+import httpx
+import openai
 import pytest
 from unittest.mock import patch, MagicMock
 from pydantic import HttpUrl
 
-import sys
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-
 from src.summarizer import ArticleSummarizer
 from src.models import ArticleContent, ArticleSummary, TopicIdentification
+from src.prompts import JSON_OBJECT_FORMAT
+from src.config import OpenAIConfig
+
+# Error raised by the OpenAI client when the API cannot be reached
+API_ERROR = openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+@pytest.fixture(scope="module")
+def sample_article():
+    """Fixture providing a sample article, validated once for the module (tests only copy it)."""
+    return ArticleContent(
+        url=HttpUrl("https://www.example.com/news/article"),
+        title="Test Article Title",
+        text="This is a test article content. It contains information about various topics "
+             "such as technology, science, and politics. The article discusses recent "
+             "advancements in AI technology and its implications for society.",
+        metadata={"author": "Test Author", "published_date": "2025-05-05"}
+    )
 
 
 class TestArticleSummarizer:
     """Test cases for the ArticleSummarizer class."""
 
-    @pytest.fixture
-    def sample_article(self):
-        """Fixture providing a sample article."""
-        return ArticleContent(
-            url=HttpUrl("https://www.example.com/news/article"),
-            title="Test Article Title",
-            text="This is a test article content. It contains information about various topics "
-                 "such as technology, science, and politics. The article discusses recent "
-                 "advancements in AI technology and its implications for society.",
-            metadata={"author": "Test Author", "published_date": "2025-05-05"}
-        )
+    @pytest.fixture(autouse=True)
+    def no_llm_cache(self):
+        """Keep the persistent LLM cache out of the tests."""
+        with patch('src.summarizer.enable_llm_cache'):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def mock_chat(self):
+        """Replace the chat model class, so no test can build a real OpenAI client."""
+        with patch('src.summarizer.ChatOpenAI') as mock_chat:
+            yield mock_chat
 
     @pytest.fixture
     def mock_openai_env(self, monkeypatch):
@@ -39,91 +55,281 @@ class TestArticleSummarizer:
         monkeypatch.setenv("OPENAI_TEMPERATURE", "0.5")
         monkeypatch.setenv("OPENAI_MAX_TOKENS", "300")
 
-    def test_summarize_concise(self, sample_article, mock_openai_env):
+    def test_summarize_concise(self, mock_chat, sample_article, mock_openai_env):
         """Test generating a concise summary."""
-        with patch('src.summarizer.load_summarize_chain') as mock_chain:
-            # Mock the summarize chain
-            mock_chain_instance = MagicMock()
-            mock_chain_instance.run.return_value = "This is a concise test summary."
-            mock_chain.return_value = mock_chain_instance
-            
-            # Create summarizer and run summarization
-            summarizer = ArticleSummarizer()
-            result = summarizer.summarize(sample_article, summary_type="concise")
-              # Verify the result
-            assert isinstance(result, ArticleSummary)
-            assert result.summary == "This is a concise test summary."
-            assert result.summary_type == "concise"
-            expected_id = str(hash(f"{sample_article.url}-{sample_article.title}"))
-            assert result.article_id == expected_id
-
-    def test_summarize_detailed(self, sample_article, mock_openai_env):
+        # Mock the chat model - a concise summary is a single call
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.invoke.return_value = MagicMock(content="This is a concise test summary.")
+        mock_chat.return_value = mock_chat_instance
+        
+        # Create summarizer and run summarization
+        summarizer = ArticleSummarizer()
+        result = summarizer.summarize(sample_article, summary_type="concise")
+        
+        # Verify the result
+        mock_chat_instance.invoke.assert_called_once()
+        mock_chat_instance.batch.assert_not_called()
+        assert isinstance(result, ArticleSummary)
+        assert result.summary == "This is a concise test summary."
+        assert result.summary_type == "concise"
+        assert result.article_id == sample_article.article_id
+
+    def test_summarize_detailed(self, mock_chat, sample_article, mock_openai_env):
         """Test generating a detailed summary."""
-        with patch('src.summarizer.load_summarize_chain') as mock_chain:
-            # Mock the summarize chain
-            mock_chain_instance = MagicMock()
-            mock_chain_instance.run.return_value = "This is a detailed test summary with more information."
-            mock_chain.return_value = mock_chain_instance
-            
-            # Create summarizer and run summarization
+        # Mock the chat model - a short article is a single chunk
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.batch.return_value = [
+            MagicMock(content="This is a detailed test summary with more information.")
+        ]
+        mock_chat.return_value = mock_chat_instance
+        
+        # Create summarizer and run summarization
+        summarizer = ArticleSummarizer()
+        result = summarizer.summarize(sample_article, summary_type="detailed")
+        
+        # Verify the result - one chunk needs no combine call
+        assert isinstance(result, ArticleSummary)
+        assert result.summary == "This is a detailed test summary with more information."
+        assert result.summary_type == "detailed"
+        mock_chat_instance.invoke.assert_not_called()
+        # A short article is sent whole, without building the splitter
+        assert "text_splitter" not in vars(summarizer)
+        
+    def test_summarize_detailed_long_article_single_call(self, mock_chat, sample_article, mock_openai_env):
+        """Test that an article within the context budget is summarized in one call."""
+        long_article = sample_article.model_copy(update={"text": "Paragraph about AI. " * 600})
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.batch.return_value = [MagicMock(content="Detailed summary.")]
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        result = summarizer.summarize(long_article, summary_type="detailed")
+        
+        assert result.summary == "Detailed summary."
+        assert len(mock_chat_instance.batch.call_args[0][0]) == 1
+        mock_chat_instance.invoke.assert_not_called()
+        assert "text_splitter" not in vars(summarizer)
+    
+    def test_text_splitter(self, mock_openai_env):
+        """Test that long articles are split by tokens with the configured budget."""
+        with patch('langchain_text_splitters.TokenTextSplitter') as mock_splitter:
             summarizer = ArticleSummarizer()
-            result = summarizer.summarize(sample_article, summary_type="detailed")
             
-            # Verify the result            assert isinstance(result, ArticleSummary)
-            assert result.summary == "This is a detailed test summary with more information."
-            assert result.summary_type == "detailed"
+            assert summarizer.text_splitter is mock_splitter.return_value
+            assert summarizer.text_splitter is mock_splitter.return_value
+            mock_splitter.assert_called_once_with(
+                encoding_name="cl100k_base",
+                chunk_size=summarizer.context_budget,
+                chunk_overlap=ArticleSummarizer.CHUNK_OVERLAP,
+            )
             
-    def test_identify_topics(self, sample_article, mock_openai_env):
+    @pytest.mark.parametrize("model, expected", [
+        ("gpt-3.5-turbo", 16_385 - 500 - 1_000),
+        ("gpt-4", 8_192 - 500 - 1_000),
+        ("gpt-4o-mini", 100_000),
+        ("some-future-model", 16_385 - 500 - 1_000),
+    ])
+    def test_model_context_budget(self, model, expected):
+        """Test that the per-call budget fits the model's context window, capped for large windows."""
+        assert ArticleSummarizer.model_context_budget(model, max_tokens=500) == expected
+        
+    def test_summarize_detailed_map_reduce(self, mock_chat, sample_article, mock_openai_env):
+        """Test that chunks are summarized in one concurrent batch and combined once."""
+        long_article = sample_article.model_copy(update={"text": "Paragraph about AI. " * 6000})
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.batch.side_effect = lambda prompts: [
+            MagicMock(content=f"Part {i}") for i in range(len(prompts))
+        ]
+        mock_chat_instance.invoke.return_value = MagicMock(content="Combined summary.")
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        summarizer.text_splitter = MagicMock()
+        summarizer.text_splitter.split_text.return_value = ["Chunk 1", "Chunk 2", "Chunk 3"]
+        result = summarizer.summarize(long_article, summary_type="detailed")
+        
+        assert result.summary == "Combined summary."
+        summarizer.text_splitter.split_text.assert_called_once_with(long_article.prompt_text)
+        mock_chat_instance.batch.assert_called_once()
+        assert len(mock_chat_instance.batch.call_args[0][0]) == 3
+        combine_prompt = mock_chat_instance.invoke.call_args[0][0][1].content
+        assert "Part 0\n\nPart 1" in combine_prompt
+        
+    def test_stream_summary(self, mock_chat, sample_article, mock_openai_env):
+        """Test streaming a concise summary chunk by chunk."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.stream.return_value = iter([
+            MagicMock(content="Classification: technology - "),
+            MagicMock(content="AI is advancing."),
+        ])
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        chunks = list(summarizer.stream_summary(sample_article))
+        
+        assert chunks == ["Classification: technology - ", "AI is advancing."]
+        mock_chat_instance.invoke.assert_not_called()
+        result = summarizer.build_summary(sample_article, "".join(chunks), "concise")
+        assert result.summary == "Classification: technology - AI is advancing."
+        
+    def test_stream_summary_detailed_streams_combine(self, mock_chat, sample_article, mock_openai_env):
+        """Test that a detailed summary streams only the combine call."""
+        long_article = sample_article.model_copy(update={"text": "Paragraph about AI. " * 6000})
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.batch.side_effect = lambda prompts: [
+            MagicMock(content=f"Part {i}") for i in range(len(prompts))
+        ]
+        mock_chat_instance.stream.return_value = iter([MagicMock(content="Combined.")])
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        summarizer.text_splitter = MagicMock()
+        summarizer.text_splitter.split_text.return_value = ["Chunk 1", "Chunk 2"]
+        chunks = list(summarizer.stream_summary(long_article, summary_type="detailed"))
+        
+        assert chunks == ["Combined."]
+        combine_prompt = mock_chat_instance.stream.call_args[0][0][1].content
+        assert "Part 0\n\nPart 1" in combine_prompt
+        
+    def test_stream_summary_error_handling(self, mock_chat, sample_article, mock_openai_env):
+        """Test that streaming errors are raised as ValueError."""
+        mock_chat.return_value.stream.side_effect = API_ERROR
+        
+        summarizer = ArticleSummarizer()
+        with pytest.raises(ValueError, match="Failed to summarize article"):
+            list(summarizer.stream_summary(sample_article))
+        
+    def test_identify_topics(self, mock_chat, sample_article, mock_openai_env):
         """Test identifying topics from an article."""
-        with patch('src.summarizer.ChatOpenAI') as mock_chat:
-            # Mock the chat model response
-            mock_chat_instance = MagicMock()
-            mock_message = MagicMock()
-            mock_message.content = """```json
-            {
-                "topics": ["technology: Technology", "technology: Artificial Intelligence", "society: Society"],
-                "keywords": ["technology: AI", "technology: advancements", "technology: technology", "society: society", "society: implications"]
-            }
-            ```"""
-            mock_chat_instance.invoke.return_value = mock_message
-            mock_chat.return_value = mock_chat_instance
-            
-            # Create summarizer and identify topics
-            summarizer = ArticleSummarizer()
-            result = summarizer.identify_topics(sample_article)
-            
-            # Verify the result
-            assert isinstance(result, TopicIdentification)
-            assert "technology: Technology" in result.topics
-            assert "technology: Artificial Intelligence" in result.topics
-            assert "technology: AI" in result.keywords
-            assert "technology: technology" in result.keywords
-
-    def test_summarize_error_handling(self, sample_article, mock_openai_env):
+        # Mock the chat model response
+        mock_chat_instance = MagicMock()
+        mock_message = MagicMock()
+        mock_message.content = """{
+            "topics": ["technology: Technology", "technology: Artificial Intelligence", "society: Society"],
+            "keywords": ["technology: AI", "technology: advancements", "technology: technology", "society: society", "society: implications"]
+        }"""
+        mock_chat_instance.bind.return_value.invoke.return_value = mock_message
+        mock_chat.return_value = mock_chat_instance
+        
+        # Create summarizer and identify topics
+        summarizer = ArticleSummarizer()
+        result = summarizer.identify_topics(sample_article)
+        
+        # Verify the result
+        assert isinstance(result, TopicIdentification)
+        assert "technology: Technology" in result.topics
+        assert "technology: Artificial Intelligence" in result.topics
+        assert "technology: AI" in result.keywords
+        assert "technology: technology" in result.keywords
+        mock_chat_instance.bind.assert_any_call(
+            response_format=JSON_OBJECT_FORMAT,
+            max_tokens=ArticleSummarizer.TOPICS_MAX_TOKENS
+        )
+        assert mock_chat.call_args.kwargs["max_tokens"] == OpenAIConfig.instance().max_tokens
+        mock_chat_instance.invoke.assert_not_called()
+
+    def test_summarize_error_handling(self, mock_chat, sample_article, mock_openai_env):
         """Test error handling during summarization."""
-        with patch('src.summarizer.load_summarize_chain') as mock_chain:
-            # Mock the summarize chain to raise an exception
-            mock_chain.side_effect = Exception("Test error")
-            
-            # Create summarizer and expect error
-            summarizer = ArticleSummarizer()
-            with pytest.raises(ValueError) as excinfo:
-                summarizer.summarize(sample_article)
-                
-            assert "Failed to summarize article" in str(excinfo.value)
+        # Mock the chat model to raise an exception
+        mock_chat.return_value.invoke.side_effect = API_ERROR
+        
+        # Create summarizer and expect error
+        summarizer = ArticleSummarizer()
+        with pytest.raises(ValueError) as excinfo:
+            summarizer.summarize(sample_article)
             
+        assert "Failed to summarize article" in str(excinfo.value)
+        
+    def test_summarize_unexpected_error_propagates(self, mock_chat, sample_article, mock_openai_env):
+        """Test that errors other than API and parsing errors are not wrapped."""
+        mock_chat.return_value.invoke.side_effect = RuntimeError("Bug")
+        
+        summarizer = ArticleSummarizer()
+        with pytest.raises(RuntimeError, match="Bug"):
+            summarizer.summarize(sample_article)
+        
+    def test_analyze(self, mock_chat, sample_article, mock_openai_env):
+        """Test generating the summary and topics with one JSON-mode call."""
+        mock_chat_instance = MagicMock()
+        json_model = MagicMock()
+        json_model.invoke.return_value = MagicMock(content=(
+            '{"summary": "AI advances are reshaping society.", "classification": "technology", '
+            '"topics": ["AI", "society"], "keywords": ["technology", "AI", "advancements"]}'
+        ))
+        mock_chat_instance.bind.return_value = json_model
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        summary, topics = summarizer.analyze(sample_article)
+        
+        mock_chat_instance.bind.assert_any_call(response_format=JSON_OBJECT_FORMAT)
+        json_model.invoke.assert_called_once()
+        mock_chat_instance.invoke.assert_not_called()
+        assert isinstance(summary, ArticleSummary)
+        assert summary.summary == "Classification: technology - AI advances are reshaping society."
+        assert summary.summary_type == "concise"
+        assert isinstance(topics, TopicIdentification)
+        assert topics.topics == ["technology", "AI", "society"]
+        assert topics.keywords == ["technology", "AI", "advancements"]
+
+    def test_prompts_share_prefix(self, mock_chat, sample_article, mock_openai_env):
+        """Test that every article prompt starts with the same cacheable messages."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.invoke.return_value = MagicMock(content="Summary.")
+        mock_chat_instance.bind.return_value.invoke.return_value = MagicMock(
+            content='{"summary": "Summary.", "classification": "technology", "topics": [], "keywords": []}'
+        )
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        summarizer.summarize(sample_article)
+        summarizer.identify_topics(sample_article)
+        summarizer.analyze(sample_article)
+        
+        prompts = [call[0][0] for call in mock_chat_instance.invoke.call_args_list]
+        prompts += [call[0][0] for call in mock_chat_instance.bind.return_value.invoke.call_args_list]
+        prefixes = [[message.content for message in prompt[:2]] for prompt in prompts]
+        assert prefixes[0][1].startswith(f"Title: {sample_article.title}")
+        assert all(prefix == prefixes[0] for prefix in prefixes)
+        assert len({prompt[-1].content for prompt in prompts}) == 3
+
+    @pytest.mark.parametrize("content", [
+        '{"topics": ["a"], "keywords": ["b"]}',
+        '{"summary": " ", "topics": ["a"], "keywords": ["b"]}',
+        '{"summary": "Summary."}',
+        "not json",
+    ])
+    def test_analyze_invalid_response(self, mock_chat, sample_article, mock_openai_env, content):
+        """Test that a response without a summary or valid JSON raises ValueError."""
+        mock_chat_instance = MagicMock()
+        mock_chat_instance.bind.return_value.invoke.return_value = MagicMock(content=content)
+        mock_chat.return_value = mock_chat_instance
+        
+        summarizer = ArticleSummarizer()
+        with pytest.raises(ValueError, match="Failed to analyze article"):
+            summarizer.analyze(sample_article)
+
     def test_parse_topics_response_valid_json(self, mock_openai_env):
         """Test parsing a valid JSON response for topics."""
         summarizer = ArticleSummarizer()
-        response = """```json
-        {
+        response = """{
             "topics": ["politics: Politics", "economics: Economy", "politics: International Relations"],
             "keywords": ["politics: policy", "economics: finance", "international: global", "politics: treaty", "economics: trade"]
-        }
-        ```"""
+        }"""
         result = summarizer._parse_topics_response(response)
         
         assert "topics" in result
         assert "keywords" in result
         assert "politics: Politics" in result["topics"]
-        assert "economics: finance" in result["keywords"]
\ No newline at end of file
+        assert "economics: finance" in result["keywords"]
+
+    @pytest.mark.parametrize("response", ["not json", '["a", "b"]'])
+    def test_parse_topics_response_invalid(self, mock_openai_env, response):
+        """Test that a response that is not a JSON object falls back to the defaults."""
+        summarizer = ArticleSummarizer()
+        result = summarizer._parse_topics_response(response)
+        
+        assert result == {
+            "topics": ["general", "General News"],
+            "keywords": ["general", "news", "article"]
+        }
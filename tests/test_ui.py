@@ -5,42 +5,124 @@ This module contains unit tests for the Streamlit UI functionality,
 including URL validation, article processing, and search.
 """
 
-# Make sure pytest imports work correctly
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from unittest.mock import patch, DEFAULT, MagicMock, Mock
 
-from unittest.mock import patch, MagicMock
-import streamlit as st
+from src.database import DatabaseService
+from src.extractor import ArticleExtractor
+from src.summarizer import ArticleSummarizer
+from src import ui
+from src.ui import (
+    validate_url, init_session_state, process_article_url, display_article_card,
+    display_all_articles, render_article_card, clear_article_cache
+)
 
-from src.ui import validate_url, init_session_state, process_article_url, display_article_card
+
+class FakeSessionState(dict):
+    """Session state stand-in with key and attribute access, like st.session_state."""
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture(scope="module")
+def card_article():
+    """Search result shown by the card display tests, built once for the module (only read)."""
+    return {
+        'title': 'Test Article',
+        'summary': 'This is a test summary',
+        'url': 'https://www.example.com',
+        'topics': ('technology', 'news'),
+        'keywords': ('test', 'keyword'),
+        'relevance_percentage': 85
+    }
 
 
 class TestUI:
     """Test cases for the UI module functions."""
     
-    def test_validate_url_valid(self):
-        """Test URL validation with valid URLs."""
-        # Test with valid URLs
-        assert validate_url("https://www.example.com") is True
-        assert validate_url("http://example.com/path") is True
-        assert validate_url("https://www.bbc.com/news/articles/c3r807j7xrwo") is True
+    @pytest.fixture(autouse=True)
+    def empty_article_cache(self):
+        """Start every test without cached article pages."""
+        clear_article_cache()
+        yield
+        clear_article_cache()
+    
+    @pytest.fixture
+    def ui_mocks(self):
+        """Patch Streamlit and the services used by the UI module in one context."""
+        with patch.multiple(
+            ui,
+            st=DEFAULT,
+            ArticleExtractor=DEFAULT,
+            ArticleSummarizer=DEFAULT,
+            BatchSummarizer=DEFAULT,
+            SemanticSearch=DEFAULT,
+            get_db_service=DEFAULT
+        ) as mocks:
+            # Reason: specced instances fail on methods the real classes lack
+            mocks['ArticleExtractor'].return_value = Mock(spec=ArticleExtractor)
+            yield mocks
+    
+    @pytest.fixture
+    def mock_st(self, ui_mocks):
+        """Mocked Streamlit module whose session services are limited to the real classes' methods."""
+        mock_st = ui_mocks['st']
+        mock_st.session_state.db_service = Mock(spec=DatabaseService)
+        mock_st.session_state.summarizer = Mock(spec=ArticleSummarizer)
+        return mock_st
     
-    def test_validate_url_invalid(self):
-        """Test URL validation with invalid URLs."""
-        # Test with invalid URLs
-        assert validate_url("example.com") is False  # missing scheme
-        assert validate_url("https://") is False  # missing netloc
-        assert validate_url("not a url") is False  # completely invalid
+    @pytest.fixture
+    def mock_extractor_class(self, ui_mocks):
+        """Mocked ArticleExtractor class used by the UI functions."""
+        return ui_mocks['ArticleExtractor']
+    
+    def test_init_session_state(self, mock_st, ui_mocks):
+        """Test that missing session state is created once and existing values are kept."""
+        mock_st.session_state = FakeSessionState()
+        db_service = ui_mocks['get_db_service'].return_value
+        summarizer = ui_mocks['ArticleSummarizer'].return_value
+        
+        init_session_state()
+        state = dict(mock_st.session_state)
+        init_session_state()
+        
+        assert state == {
+            "search_results": [],
+            "processed_urls": [],
+            "related_searches": [],
+            "db_service": db_service,
+            "search_service": ui_mocks['SemanticSearch'].return_value,
+            "summarizer": summarizer,
+            "batch_summarizer": ui_mocks['BatchSummarizer'].return_value
+        }
+        assert mock_st.session_state == state
+        ui_mocks['get_db_service'].assert_called_once_with()
+        ui_mocks['SemanticSearch'].assert_called_once_with(db_service)
+        ui_mocks['ArticleSummarizer'].assert_called_once_with()
+        ui_mocks['BatchSummarizer'].assert_called_once_with(summarizer)
+    
+    @pytest.mark.parametrize("url, valid", [
+        ("https://www.example.com", True),
+        ("http://example.com/path", True),
+        ("https://www.bbc.com/news/articles/c3r807j7xrwo", True),
+        ("example.com", False),  # missing scheme
+        ("https://", False),  # missing netloc
+        ("not a url", False),  # completely invalid
+        ("ftp://example.com/file", False),  # scheme the extractor cannot fetch
+        ("https://exa mple.com", False),  # host rejected by pydantic's HttpUrl
+        ("http://example.com:99999", False),  # port out of range
+        (None, False),  # not a string
+    ])
+    def test_validate_url(self, url, valid):
+        """Test URL validation with valid and invalid URLs."""
+        assert validate_url(url) is valid
 
-    @patch('src.ui.st')
-    @patch('src.ui.ArticleExtractor')
-    def test_process_article_url_failure(self, mock_extractor_class, mock_st):
+    def test_process_article_url_failure(self, mock_st, mock_extractor_class):
         """Test article processing with exception handling."""
         # Setup mocks to raise exception
-        mock_extractor = MagicMock()
-        mock_extractor_class.return_value = mock_extractor
+        mock_extractor = mock_extractor_class.return_value
         mock_extractor.extract.side_effect = ValueError("Test error")
+        mock_st.session_state.db_service.url_exists.return_value = False
         
         # Call the function
         result = process_article_url("https://www.example.com")
@@ -50,32 +132,125 @@ class TestUI:
         mock_extractor.extract.assert_called_once_with("https://www.example.com")
         mock_st.error.assert_called_once()
     
-    @patch('src.ui.st')
-    def test_display_article_card(self, mock_st):
-        """Test article card display."""
-        # Setup test article
-        article = {
-            'title': 'Test Article',
-            'summary': 'This is a test summary',
-            'url': 'https://www.example.com',
+    def test_process_article_url_streams_summary(self, mock_st, mock_extractor_class):
+        """Test that the summary is streamed to the page and stored."""
+        mock_summarizer = mock_st.session_state.summarizer
+        mock_st.write_stream.return_value = "Streamed summary"
+        mock_st.session_state.processed_urls = []
+        mock_st.session_state.db_service.url_exists.return_value = False
+        
+        result = process_article_url("https://www.example.com")
+        
+        assert result is True
+        article = mock_extractor_class.return_value.extract.return_value
+        mock_st.write_stream.assert_called_once_with(mock_summarizer.stream_summary.return_value)
+        mock_summarizer.build_summary.assert_called_once_with(article, "Streamed summary", "concise")
+        # Both requests get the prompt text built once for the article
+        mock_summarizer.stream_summary.assert_called_once_with(article, prompt_text=article.prompt_text)
+        mock_summarizer.identify_topics.assert_called_once_with(article, article.prompt_text)
+        mock_st.session_state.db_service.store_article.assert_called_once_with(
+            article, mock_summarizer.build_summary.return_value, mock_summarizer.identify_topics.return_value
+        )
+        assert mock_st.session_state.processed_urls == ["https://www.example.com"]
+    
+    @pytest.mark.parametrize("processed_urls, stored", [(["https://www.example.com"], False), ([], True)])
+    def test_process_article_url_skips_known_url(self, mock_st, mock_extractor_class, processed_urls, stored):
+        """Test that a URL processed in this session or already stored is not fetched again."""
+        mock_st.session_state.processed_urls = processed_urls
+        mock_st.session_state.db_service.url_exists.return_value = stored
+        
+        result = process_article_url("https://www.example.com")
+        
+        # Not reported as newly processed, so no success message follows the info
+        assert result is False
+        mock_extractor_class.return_value.extract.assert_not_called()
+        mock_st.session_state.summarizer.stream_summary.assert_not_called()
+        mock_st.info.assert_called_once()
+    
+    def test_render_article_card_escapes_fields(self):
+        """Test that scraped article fields are escaped in the rendered card."""
+        card = render_article_card({
+            'title': '<script>alert(1)</script>',
+            'summary': 'Tom & Jerry',
+            'url': 'https://www.example.com/?a=1&b="2"',
             'topics': ['technology', 'news'],
-            'keywords': ['test', 'keyword'],
-            'relevance_percentage': 85
-        }
+            'keywords': ['a', 'b', 'c', 'd', 'e', 'f']
+        })
         
-        # Mock st.container context manager
-        mock_container = MagicMock()
-        mock_st.container.return_value.__enter__.return_value = mock_container
+        assert '<script>' not in card
+        assert '&lt;script&gt;' in card
+        assert 'Tom &amp; Jerry' in card
+        assert 'href="https://www.example.com/?a=1&amp;b=&quot;2&quot;"' in card
+        assert 'technology, news' in card
+        assert 'f' not in card.split('<em>')[1].split('</em>')[0]
+    
+    def test_display_all_articles_renders_one_page(self, mock_st):
+        """Test that only the selected page is fetched and rendered in one markdown call."""
+        db_service = mock_st.session_state.db_service
+        db_service.count_articles.return_value = 45
+        db_service.list_articles.return_value = [{'title': 'First'}, {'title': 'Second'}]
+        mock_st.number_input.return_value = 3
         
-        # Mock columns
-        mock_col1 = MagicMock()
-        mock_col2 = MagicMock()
-        mock_st.columns.return_value = [mock_col1, mock_col2]
+        display_all_articles()
         
-        # Call the function
-        display_article_card(article)
+        mock_st.number_input.assert_called_once_with("Page", min_value=1, max_value=3, value=1, step=1)
+        db_service.list_articles.assert_called_once_with(limit=20, offset=40)
+        mock_st.markdown.assert_called_once()
+        rendered = mock_st.markdown.call_args[0][0]
+        assert 'First' in rendered and 'Second' in rendered
+        assert mock_st.markdown.call_args.kwargs == {"unsafe_allow_html": True}
+    
+    def test_display_all_articles_reuses_cached_page(self, mock_st):
+        """Test that reruns reuse the fetched page until the cache is cleared."""
+        db_service = mock_st.session_state.db_service
+        db_service.count_articles.return_value = 1
+        db_service.list_articles.return_value = [{'title': 'First'}]
+        mock_st.number_input.return_value = 1
+        
+        display_all_articles()
+        display_all_articles()
+        assert db_service.count_articles.call_count == 1
+        assert db_service.list_articles.call_count == 1
+        
+        clear_article_cache()
+        display_all_articles()
+        assert db_service.list_articles.call_count == 2
+    
+    def test_display_all_articles_empty(self, mock_st):
+        """Test that an empty database shows a notice without listing articles."""
+        mock_st.session_state.db_service.count_articles.return_value = 0
+        
+        display_all_articles()
+        
+        mock_st.info.assert_called_once()
+        mock_st.session_state.db_service.list_articles.assert_not_called()
+    
+    @pytest.fixture
+    def card_columns(self, mock_st):
+        """Lay out the two card columns on the mocked Streamlit module."""
+        mock_st.columns.return_value = (MagicMock(), MagicMock())
+        return mock_st.columns.return_value
+    
+    def test_display_article_card(self, mock_st, card_columns, card_article):
+        """Test article card display."""
+        display_article_card(card_article)
         
         # Verify article components are displayed
         mock_st.subheader.assert_called_with('Test Article')
-        assert mock_st.markdown.call_count > 0
-        assert mock_st.write.call_count > 0
+        mock_st.columns.assert_called_once_with([3, 1])
+        mock_st.write.assert_called_once_with('This is a test summary')
+        rendered = [c.args[0] for c in mock_st.markdown.call_args_list]
+        assert "[Read original article](https://www.example.com)" in rendered
+        assert "- technology" in rendered and "- news" in rendered
+        assert "_test, keyword_" in rendered
+        assert "**Relevance:** 85%" in rendered
+        mock_st.divider.assert_called_once()
+    
+    def test_display_article_card_defaults(self, mock_st, card_columns):
+        """Test that a card without optional fields falls back to placeholders."""
+        display_article_card({})
+        
+        mock_st.subheader.assert_called_with('Untitled Article')
+        mock_st.write.assert_called_once_with('No summary available')
+        rendered = [c.args[0] for c in mock_st.markdown.call_args_list]
+        assert rendered == ["**Summary:**", "**Topics:**"]